@@ -0,0 +1,76 @@
+"""
+Stress benchmark: hammer one ToolMonkey from many threads and check that
+exactly the scheduled calls fail.
+
+Usage:
+    python -m benchmarks.bench_concurrency --threads 32 --calls 20000
+"""
+
+import argparse
+import sys
+import threading
+import time
+
+from tool_monkey import ToolMonkey, FailureScenario, ToolFailure
+
+
+def run(n_threads: int, calls_per_thread: int, fail_every: int) -> dict:
+    total = n_threads * calls_per_thread
+    scheduled = set(range(fail_every, total + 1, fail_every))
+    scenario = FailureScenario(
+        name="stress",
+        failures=[ToolFailure(on_call_count=n, error_type="rate_limit") for n in sorted(scheduled)],
+    )
+    monkey = ToolMonkey(scenario, "stress_tool")
+    failures = [0] * n_threads
+    barrier = threading.Barrier(n_threads)
+
+    def worker(i):
+        barrier.wait()
+        count = 0
+        for _ in range(calls_per_thread):
+            if monkey.should_fail() is not None:
+                count += 1
+        failures[i] = count
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_threads)]
+    # switch threads as often as possible to provoke interleavings
+    previous_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    start = time.perf_counter()
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(previous_interval)
+    elapsed = time.perf_counter() - start
+    return {
+        "threads": n_threads,
+        "calls": total,
+        "expected_failures": len(scheduled),
+        "observed_failures": sum(failures),
+        "final_call_count": monkey.call_count,
+        "ns_per_call": elapsed / total * 1e9,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--calls", type=int, default=20000, help="calls per thread")
+    parser.add_argument("--fail-every", type=int, default=7)
+    args = parser.parse_args()
+
+    result = run(args.threads, args.calls, args.fail_every)
+    for key, value in result.items():
+        print(f"{key:>18}: {value:,.1f}" if isinstance(value, float) else f"{key:>18}: {value:,}")
+    ok = (result["observed_failures"] == result["expected_failures"]
+          and result["final_call_count"] == result["calls"])
+    print("OK" if ok else "MISMATCH")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
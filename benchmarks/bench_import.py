@@ -0,0 +1,83 @@
+"""
+Import-time benchmark: what a cold start pays for `import tool_monkey`.
+
+Each statement runs in a fresh interpreter; the time reported is the median
+wall time of the statement itself, not interpreter startup. Peak memory is
+traced separately with tracemalloc. --breakdown shows where the time goes,
+from `-X importtime`.
+
+Usage:
+    python -m benchmarks.bench_import --runs 20 --output import.json
+    python -m benchmarks.bench_import --max-ms 20     # exit 1 if `import tool_monkey` gets slower
+    python -m benchmarks.bench_import --breakdown "from tool_monkey import with_monkey"
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import List, Tuple
+
+from benchmarks.harness import print_results, save_results
+
+STATEMENTS = {
+    "import/tool_monkey": "import tool_monkey",
+    "import/with_monkey": "from tool_monkey import with_monkey, FailureScenario",
+    "import/everything": "from tool_monkey import *",
+}
+
+
+def import_time_ns(statement: str) -> int:
+    """Wall time of `statement` in a fresh interpreter, after interpreter startup."""
+    code = f"import time; start = time.perf_counter_ns(); {statement}; print(time.perf_counter_ns() - start)"
+    return int(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+
+
+def slowest_imports(statement: str, top: int = 15) -> List[Tuple[int, str]]:
+    """(cumulative microseconds, module) for the slowest imports under `-X importtime`."""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def peak_bytes(statement: str) -> int:
+    code = f"import tracemalloc; tracemalloc.start(); {statement}; print(tracemalloc.get_traced_memory()[1])"
+    return int(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+
+
+def run(runs: int) -> dict:
+    results = {}
+    for name, statement in STATEMENTS.items():
+        times = [import_time_ns(statement) for _ in range(runs)]
+        results[name] = {"ns_per_call": statistics.median(times), "peak_bytes": peak_bytes(statement)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--max-ms", type=float, help="fail if `import tool_monkey` takes longer than this")
+    parser.add_argument("--breakdown", metavar="STATEMENT", help="show the slowest imports for a statement instead")
+    args = parser.parse_args()
+    if args.breakdown:
+        for cumulative_us, module in slowest_imports(args.breakdown):
+            print(f"{cumulative_us / 1000:8.1f} ms  {module}")
+        return
+    results = run(args.runs)
+    print_results(results)
+    if args.output:
+        save_results(results, args.output)
+    if args.max_ms is not None and results["import/tool_monkey"]["ns_per_call"] / 1e6 > args.max_ms:
+        print(f"import tool_monkey took longer than {args.max_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
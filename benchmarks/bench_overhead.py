@@ -0,0 +1,138 @@
+"""
+Overhead benchmark: what with_monkey, large schedules and the observer cost.
+
+- raw: calling the undecorated function
+- with_monkey: the wrapper on the scheduled path (a scenario that never runs out), with no observer, then with one
+- passthrough: the wrapper once its scenario has run out, per recording mode, and with chaos disabled
+- schedule/N: with_monkey over a scenario with N scheduled failures (every call passes or fails per schedule)
+- get_metrics/N: get_metrics on an observer that has recorded N calls
+- snapshot/...: pickling one observer snapshot, and merging 500 of them
+
+Usage:
+    python -m benchmarks.bench_overhead --output before.json
+    python -m benchmarks.bench_overhead --output after.json
+    python -m benchmarks.compare before.json after.json
+"""
+
+import argparse
+import logging
+import pickle
+
+from tool_monkey import (FailureScenario, MonkeyObserver, ObserverSnapshot, ToolFailure, VirtualClock, with_monkey,
+                         chaos_disabled)
+from tool_monkey.config.logger import logger
+from benchmarks.harness import measure, print_results, save_results
+
+
+def tool(query: str, limit: int = 10) -> str:
+    return query
+
+
+def _call_tolerating(func):
+    def call():
+        try:
+            func("weather in paris", limit=5)
+        except Exception:
+            pass
+    return call
+
+
+def bench_wrapper(calls: int) -> dict:
+    results = {}
+    results["raw"] = measure(lambda: tool("weather in paris", limit=5), calls)
+    # a failure no benchmark reaches keeps the scenario from running out, so every call takes
+    # the scheduled path; an empty scenario would be passed through from the second call on
+    passing = FailureScenario(name="pass", failures=[ToolFailure(on_call_count=10 ** 12, error_type="timeout")])
+    results["with_monkey/no_observer"] = measure(_call_tolerating(with_monkey(passing)(tool)), calls)
+    observer = MonkeyObserver(clock=VirtualClock())
+    results["with_monkey/observer"] = measure(_call_tolerating(with_monkey(passing, observer=observer)(tool)), calls)
+    events = MonkeyObserver(clock=VirtualClock(), keep_events=True)
+    results["with_monkey/observer_keep_events"] = measure(
+        _call_tolerating(with_monkey(passing, observer=events)(tool)), calls)
+    return results
+
+
+def bench_passthrough(calls: int) -> dict:
+    results = {}
+    finished = FailureScenario(name="finished", failures=[ToolFailure(on_call_count=1, error_type="timeout",
+                                                                      config={"timeout": {"n_seconds": 0}})])
+    for mode in ("full", "sampled", "off"):
+        observer = MonkeyObserver(clock=VirtualClock())
+        call = _call_tolerating(with_monkey(finished, observer=observer, record_passthrough=mode)(tool))
+        call()  # the only scheduled failure
+        results[f"passthrough/{mode}"] = measure(call, calls)
+    call = _call_tolerating(with_monkey(FailureScenario(name="pass", failures=[]), observer=MonkeyObserver())(tool))
+    with chaos_disabled():
+        results["passthrough/chaos_disabled"] = measure(call, calls)
+    return results
+
+
+def bench_schedules(calls: int, sizes) -> dict:
+    results = {}
+    for size in sizes:
+        scenario = FailureScenario(name="large", failures=[
+            ToolFailure(on_call_count=n, error_type="rate_limit") for n in range(2, 2 * size + 1, 2)
+        ])
+        observer = MonkeyObserver(clock=VirtualClock())
+        # each measured call alternates pass / fail until the schedule runs out
+        results[f"schedule/{size}"] = measure(
+            _call_tolerating(with_monkey(scenario, observer=observer)(tool)), min(calls, size), repeat=1)
+    return results
+
+
+def bench_get_metrics(event_counts) -> dict:
+    results = {}
+    for count in event_counts:
+        observer = MonkeyObserver(clock=VirtualClock())
+        for i in range(count):
+            call_id = f"tool_{i}"
+            observer.start_call(call_id)
+            observer.end_call("tool", call_id, success=bool(i % 10), error=None if i % 10 else TimeoutError(),
+                              injected=not i % 10, scenario="bench")
+        results[f"get_metrics/{count}"] = measure(observer.get_metrics, 100)
+    return results
+
+
+def bench_snapshots(workers: int = 500) -> dict:
+    snapshots = []
+    for worker in range(workers):
+        observer = MonkeyObserver(clock=VirtualClock())
+        for i in range(200):
+            call_id = f"tool_{i}"
+            observer.start_call(call_id)
+            observer.clock.advance(0.001 * (i % 50 + worker % 7))
+            observer.end_call(f"tool_{worker % 10}", call_id, success=bool(i % 10),
+                              error=None if i % 10 else TimeoutError(), injected=not i % 10, scenario="bench")
+        snapshots.append(observer.snapshot())
+    payloads = [pickle.dumps(snapshot) for snapshot in snapshots]
+    return {
+        "snapshot/pickle_round_trip": measure(lambda: pickle.loads(pickle.dumps(snapshots[0])), 1000),
+        f"snapshot/unpickle_and_merge_{workers}": measure(
+            lambda: ObserverSnapshot.combine(pickle.loads(payload) for payload in payloads), 5),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100000)
+    parser.add_argument("--max-events", type=int, default=10 ** 6,
+                        help="largest observer size for get_metrics (10**7 takes a while)")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    # the wrapper logs on every call; benchmark the cost with logging filtered out
+    logger.setLevel(logging.WARNING)
+    sizes = [10 ** k for k in range(3, 8) if 10 ** k <= args.max_events]
+    results = {}
+    results.update(bench_wrapper(args.calls))
+    results.update(bench_passthrough(args.calls))
+    results.update(bench_schedules(args.calls, [size for size in sizes if size <= 10 ** 5]))
+    results.update(bench_get_metrics(sizes))
+    results.update(bench_snapshots())
+    print_results(results)
+    if args.output:
+        save_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
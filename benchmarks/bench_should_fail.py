@@ -0,0 +1,57 @@
+"""
+Microbenchmark: per-call cost of ToolMonkey.should_fail on the passing and
+failing paths.
+
+Usage:
+    python -m benchmarks.bench_should_fail --calls 1000000
+"""
+
+import argparse
+import time
+
+from tool_monkey import ToolMonkey, FailureScenario, ToolFailure
+
+ERROR_TYPES = ["rate_limit", "auth_failure", "content_moderation", "timeout"]
+CONFIGS = {
+    "rate_limit": {"rate_limit": {"retry_after_seconds": 5.0, "limit_type": "burst"}},
+    "auth_failure": {"auth_failure": {"failure_type": "unauthorized", "error_message": "Access token expired"}},
+    "content_moderation": {"content_moderation": {"content_categories": {"nsfw": True}, "reason": "nsfw"}},
+    # 0s timeout: measures the dispatch, not the sleep
+    "timeout": {"timeout": {"n_seconds": 0}},
+}
+
+
+def bench(monkey: ToolMonkey, calls: int) -> float:
+    should_fail = monkey.should_fail
+    start = time.perf_counter()
+    for _ in range(calls):
+        should_fail()
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def run(calls: int) -> dict:
+    results = {}
+    passing = ToolMonkey(FailureScenario(name="pass", failures=[]), "bench_tool")
+    results["passing"] = bench(passing, calls)
+    for error_type in ERROR_TYPES:
+        failing = ToolMonkey(
+            FailureScenario(name="fail", failures=[
+                ToolFailure(on_call_count=n, error_type=error_type, config=CONFIGS[error_type])
+                for n in range(1, calls + 1)
+            ]),
+            "bench_tool",
+        )
+        results[f"failing/{error_type}"] = bench(failing, calls)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+    for name, ns in run(args.calls).items():
+        print(f"{name:>30}: {ns:8.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Compare two benchmark result files.
+
+Usage:
+    python -m benchmarks.compare before.json after.json [--threshold 0.1]
+
+Exits 1 if any benchmark's ns/call got worse by more than the threshold.
+"""
+
+import argparse
+import sys
+
+from benchmarks.harness import load_results
+
+
+def compare(before: dict, after: dict, threshold: float) -> bool:
+    regressed = False
+    print(f"before: {before['meta'].get('commit')}  after: {after['meta'].get('commit')}")
+    for name, new in after["results"].items():
+        old = before["results"].get(name)
+        if old is None:
+            print(f"{name:>40}: {new['ns_per_call']:12.1f} ns/call  (new)")
+            continue
+        ratio = new["ns_per_call"] / old["ns_per_call"] if old["ns_per_call"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"{name:>40}: {old['ns_per_call']:12.1f} -> {new['ns_per_call']:12.1f} ns/call ({ratio:5.2f}x)  "
+              f"peak {old['peak_bytes'] / 1024:.1f} -> {new['peak_bytes'] / 1024:.1f} KiB{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown before flagging (0.1 = 10%%)")
+    args = parser.parse_args()
+    regressed = compare(load_results(args.before), load_results(args.after), args.threshold)
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Shared measurement and result files for the benchmarks.
+
+Each benchmark is a zero-argument callable run `iterations` times. Timing
+runs happen without tracemalloc (it slows allocation-heavy code several
+times over); a separate traced run reports peak traced memory and the
+memory still held afterwards, per iteration.
+
+Results are saved as JSON so runs from different commits can be compared
+with `python -m benchmarks.compare`.
+"""
+
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Optional
+
+
+def measure(fn: Callable[[], object], iterations: int, repeat: int = 5) -> Dict[str, float]:
+    """ns/call (best of `repeat`), peak traced bytes, and bytes / blocks retained per call."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            fn()
+        best = min(best, time.perf_counter_ns() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    for _ in range(iterations):
+        fn()
+    _, peak = tracemalloc.get_traced_memory()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    # leave out the memory held by the `before` snapshot itself
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "filename")
+    return {
+        "ns_per_call": best / iterations,
+        "peak_bytes": peak - base,
+        "retained_bytes_per_call": sum(stat.size_diff for stat in diff) / iterations,
+        "retained_blocks_per_call": sum(stat.count_diff for stat in diff) / iterations,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(results: Dict[str, Dict[str, float]], path: str) -> None:
+    payload = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def print_results(results: Dict[str, Dict[str, float]]) -> None:
+    for name, stats in results.items():
+        line = f"{name:>40}: {stats['ns_per_call']:12.1f} ns/call  peak {stats['peak_bytes'] / 1024:10.1f} KiB"
+        if "retained_bytes_per_call" in stats:
+            line += (f"  retained {stats['retained_bytes_per_call']:8.1f} B/call "
+                     f"({stats['retained_blocks_per_call']:.2f} blocks)")
+        print(line)
@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+from tool_monkey import (with_monkey_batch, FailureScenario, FailureRule, ToolFailure, MonkeyObserver, VirtualClock,
+                         ToolMonkey, RateLimitError, chaos_disabled)
+from tool_monkey.schedule import CompiledSchedule
+
+
+def _every_third():
+    return FailureScenario(name="every_third", rules=[FailureRule(error_type="timeout", every=3)])
+
+
+def test_items_count_as_separate_calls():
+    seen = []
+
+    @with_monkey_batch(_every_third())
+    def embed(texts):
+        seen.append(list(texts))
+        return [f"emb-{t}" for t in texts]
+
+    result = embed(["a", "b", "c", "d"])
+    assert result.values == ["emb-a", "emb-b", None, "emb-d"]
+    assert result.failed_indices == [2]
+    assert isinstance(result[2].error, TimeoutError) and result[2].injected
+    assert [item.call_number for item in result] == [1, 2, 3, 4]
+    assert seen == [["a", "b", "d"]]
+
+    # the count carries on across batches
+    assert embed(["e", "f"]).failed_indices == [1]
+
+
+def test_retrying_only_failed_items():
+    scenario = FailureScenario(name="once", failures=[ToolFailure(on_call_count=n, error_type="rate_limit")
+                                                      for n in (2, 4)])
+
+    @with_monkey_batch(scenario)
+    def lookup(skus):
+        return [sku.upper() for sku in skus]
+
+    skus = ["a", "b", "c", "d"]
+    result = lookup(skus)
+    retry = lookup([skus[i] for i in result.failed_indices])
+    assert result.failed_indices == [1, 3]
+    assert retry.all_ok and retry.values == ["B", "D"]
+
+
+def test_real_error_fails_passing_items_only():
+    @with_monkey_batch(_every_third())
+    def broken(items):
+        raise KeyError("backend down")
+
+    result = broken([1, 2, 3])
+    assert [type(e).__name__ for e in result.errors] == ["KeyError", "KeyError", "TimeoutError"]
+    assert [item.injected for item in result] == [False, False, True]
+
+
+def test_wrong_result_count_is_an_error():
+    @with_monkey_batch(FailureScenario(name="none"))
+    def short(items):
+        return items[:-1]
+
+    assert all(isinstance(e, ValueError) for e in short([1, 2]).errors)
+
+
+def test_batch_waits_once_for_slowest_item():
+    clock = VirtualClock()
+    scenario = FailureScenario(name="slow", failures=[
+        ToolFailure(on_call_count=1, error_type="timeout", config={"timeout": {"n_seconds": 2}}),
+        ToolFailure(on_call_count=2, error_type="latency", config={"latency": {"seconds": 5}}),
+    ])
+
+    @with_monkey_batch(scenario, clock=clock)
+    def tool(items):
+        return items
+
+    start = clock.now()
+    result = tool([1, 2, 3])
+    assert clock.now() - start == pytest.approx(5, abs=0.05)
+    assert result.values == [None, 2, 3]
+
+
+def test_observer_records_each_item():
+    observer = MonkeyObserver(clock=VirtualClock())
+
+    @with_monkey_batch(_every_third(), observer=observer)
+    def tool(items):
+        return items
+
+    tool(list(range(6)))
+    metrics = observer.get_metrics()
+    assert metrics["total_calls"] == 6
+    assert metrics["failures"] == 2
+    assert metrics["error_types"] == {"TimeoutError": 2}
+
+
+def test_async_batch():
+    @with_monkey_batch(_every_third())
+    async def tool(items):
+        return [i * 10 for i in items]
+
+    result = asyncio.run(tool([1, 2, 3, 4]))
+    assert result.values == [10, 20, None, 40]
+
+
+def test_rate_limiter_sees_each_item():
+    scenario = FailureScenario(name="quota", rate_limiter={"limit_type": "per_minute", "limit": 3})
+
+    @with_monkey_batch(scenario, clock=VirtualClock())
+    def tool(items):
+        return items
+
+    result = tool(list(range(5)))
+    assert result.failed_indices == [3, 4]
+    assert isinstance(result[3].error, RateLimitError)
+
+
+def test_disabled_chaos_passes_batch_through():
+    @with_monkey_batch(_every_third())
+    def tool(items):
+        return items
+
+    with chaos_disabled():
+        assert tool([1, 2, 3]).all_ok
+
+
+def test_next_failures_matches_one_at_a_time():
+    scenario = FailureScenario(
+        name="mixed",
+        failures=[ToolFailure(on_call_count=4, error_type="auth_failure")],
+        rules=[FailureRule(error_type="timeout", modulo=5, residues=[1, 2], stop=40),
+               FailureRule(error_type="rate_limit", every=7)],
+        probabilistic={"seed": 9, "rates": {"content_moderation": 0.1}, "block_size": 16},
+    )
+    schedule = CompiledSchedule(scenario)
+    single = ToolMonkey(scenario, "tool", schedule=schedule)
+    batched = ToolMonkey(scenario, "tool", schedule=schedule)
+    expected = [single.next_failure() for _ in range(100)]
+    got = []
+    for size in (1, 7, 30, 62):
+        got.extend(batched.next_failures(size)[1])
+    assert got == expected
@@ -0,0 +1,101 @@
+import asyncio
+import time
+import pytest
+from tool_monkey import (with_monkey, single_timeout, progressive_timeout, MonkeyObserver, ToolMonkey,
+                         ScaledClock, VirtualClock, SystemClock, get_default_clock, use_clock)
+
+
+def test_virtual_clock_sleep_advances_without_blocking():
+    clock = VirtualClock()
+    before = clock.now()
+    start = time.time()
+    clock.sleep(3600)
+    assert time.time() - start < 0.1
+    assert clock.now() - before >= 3600
+
+
+def test_scaled_clock_compresses_real_sleep():
+    clock = ScaledClock(factor=0.1)
+    before = clock.now()
+    start = time.time()
+    clock.sleep(0.5)
+    real = time.time() - start
+    assert 0.05 <= real < 0.3
+    assert clock.now() - before >= 0.5
+
+
+def test_scaled_clock_rejects_negative_factor():
+    with pytest.raises(ValueError):
+        ScaledClock(factor=-1)
+
+
+def test_monkey_uses_virtual_clock_for_timeouts():
+    monkey = ToolMonkey(single_timeout(seconds=10.0), "my_tool", clock=VirtualClock())
+    start = time.time()
+    error = monkey.should_fail()
+    assert isinstance(error, TimeoutError)
+    assert time.time() - start < 0.1
+
+
+def test_observer_reports_simulated_latency():
+    """Test that latencies reflect simulated delays, not the compressed real time."""
+    clock = VirtualClock()
+    observer = MonkeyObserver(clock=clock, keep_events=True)
+
+    @with_monkey(progressive_timeout([1.0, 2.0, 5.0, 10.0]), observer)
+    def my_func():
+        return "success"
+
+    start = time.time()
+    for _ in range(4):
+        with pytest.raises(TimeoutError):
+            my_func()
+    assert my_func() == "success"
+    assert time.time() - start < 0.5
+
+    latencies = [e.latency_ms for e in observer.tool_call_events]
+    assert latencies[:4] == pytest.approx([1000, 2000, 5000, 10000], abs=50)
+
+
+def test_observer_reports_simulated_latency_with_clock_on_wrapper():
+    """A clock passed to with_monkey times the call even when the observer has none."""
+    observer = MonkeyObserver()
+
+    @with_monkey(single_timeout(seconds=5.0), observer, clock=VirtualClock())
+    def my_func():
+        return "success"
+
+    start = time.time()
+    with pytest.raises(TimeoutError):
+        my_func()
+    assert time.time() - start < 0.5
+    timed_out = observer.get_metrics()["latency_by_tool"]["my_func"]["chaos_failure"]
+    assert timed_out["max"] == pytest.approx(5000, abs=50)
+
+
+def test_async_wrapper_uses_virtual_clock():
+    clock = VirtualClock()
+    observer = MonkeyObserver(clock=clock)
+
+    @with_monkey(single_timeout(seconds=30.0), observer)
+    async def my_func():
+        return "success"
+
+    async def run():
+        with pytest.raises(TimeoutError):
+            await my_func()
+        return await my_func()
+
+    assert asyncio.run(run()) == "success"
+    assert observer.get_metrics()["avg_latency_ms"] >= 15000
+
+
+def test_use_clock_sets_and_restores_default():
+    clock = VirtualClock()
+    with use_clock(clock):
+        assert get_default_clock() is clock
+        monkey = ToolMonkey(single_timeout(seconds=60.0), "my_tool")
+        start = time.time()
+        monkey.should_fail()
+        assert time.time() - start < 0.1
+    assert isinstance(get_default_clock(), SystemClock)
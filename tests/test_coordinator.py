@@ -0,0 +1,81 @@
+import pytest
+from tool_monkey import (ChaosCoordinator, FailureScenario, ToolFailure, MonkeyObserver, VirtualClock,
+                         AuthenticationError, RateLimitError, expired_token)
+
+
+def _tool(name):
+    def tool():
+        return name
+    tool.__name__ = name
+    return tool
+
+
+def _call(tool):
+    try:
+        return tool()
+    except Exception as e:
+        return type(e).__name__
+
+
+def test_call_numbers_count_across_tools():
+    coordinator = ChaosCoordinator(expired_token(on_call=3))
+    search, weather = coordinator.wrap(_tool("search")), coordinator.wrap(_tool("weather"))
+
+    results = [_call(search), _call(weather), _call(weather), _call(search)]
+    assert results == ["search", "weather", "AuthenticationError", "search"]
+    assert coordinator.call_count == 4
+
+
+def test_tool_filter_limits_the_shared_scenario():
+    coordinator = ChaosCoordinator(expired_token(on_call=2), tools={"search"})
+    weather = _tool("weather")
+    assert coordinator.wrap(weather) is weather
+    search = coordinator.wrap(_tool("search"))
+
+    assert [weather(), weather(), _call(search), _call(search)] == ["weather", "weather", "search",
+                                                                   "AuthenticationError"]
+
+
+def test_override_has_its_own_count():
+    coordinator = ChaosCoordinator(
+        expired_token(on_call=2),
+        overrides={"image_gen": FailureScenario(name="quota", failures=[
+            ToolFailure(on_call_count=1, error_type="rate_limit")])})
+    search, image_gen = coordinator.wrap(_tool("search")), coordinator.wrap(_tool("image_gen"))
+
+    assert _call(image_gen) == "RateLimitError"
+    assert _call(search) == "search"
+    assert _call(image_gen) == "image_gen"
+    assert _call(search) == "AuthenticationError"
+
+
+def test_shared_rate_limiter_spans_tools():
+    clock = VirtualClock()
+    coordinator = ChaosCoordinator(
+        FailureScenario(name="quota", rate_limiter={"limit_type": "per_minute", "limit": 2}), clock=clock)
+    search, weather = coordinator.wrap(_tool("search")), coordinator.wrap(_tool("weather"))
+
+    search()
+    weather()
+    with pytest.raises(RateLimitError):
+        search()
+    assert coordinator.rate_limiter.stats()["rejected"] == 1
+
+
+def test_observer_sees_every_tool_under_the_scenario_name():
+    observer = MonkeyObserver(clock=VirtualClock())
+    coordinator = ChaosCoordinator(expired_token(on_call=2), observer=observer)
+    search, weather = coordinator.wrap(_tool("search")), coordinator.wrap(_tool("weather"))
+    search()
+    with pytest.raises(AuthenticationError):
+        weather()
+
+    metrics = observer.get_metrics()
+    assert metrics["breakdown"]["search"]["call_count"] == 1
+    assert metrics["breakdown"]["weather"]["failures"] == 1
+
+
+def test_same_tool_name_reuses_monkey():
+    coordinator = ChaosCoordinator(expired_token(on_call=1))
+    assert coordinator.monkey_for("search") is coordinator.monkey_for("search")
+    assert coordinator.monkey_for("search").schedule is coordinator.monkey_for("weather").schedule
@@ -1,3 +1,7 @@
+import asyncio
+import inspect
+import threading
+import time
 import pytest
 from tool_monkey import with_monkey, FailureScenario, ToolFailure, MonkeyObserver
 
@@ -150,3 +154,163 @@ def test_decorator_with_function_args():
     metrics = observer.get_metrics()
     assert metrics["total_calls"] == 1
     assert metrics["successes"] == 1
+
+
+def test_decorator_async_function_applies_chaos():
+    """Test that async tools get an async wrapper with the same schedule."""
+    scenario = FailureScenario(
+        name="test",
+        failures=[ToolFailure(on_call_count=1, error_type="timeout")]
+    )
+    observer = MonkeyObserver()
+
+    @with_monkey(scenario, observer=observer)
+    async def my_func(x):
+        return x * 2
+
+    assert inspect.iscoroutinefunction(my_func)
+
+    async def run():
+        with pytest.raises(TimeoutError):
+            await my_func(1)
+        return await my_func(2)
+
+    assert asyncio.run(run()) == 4
+    metrics = observer.get_metrics()
+    assert metrics["total_calls"] == 2
+    assert metrics["failures"] == 1
+    assert metrics["total_retries"] == 1
+
+
+def test_decorator_async_timeout_does_not_block_event_loop():
+    """Test that simulated timeouts in async tools run concurrently."""
+    scenario = FailureScenario(
+        name="test",
+        failures=[
+            ToolFailure(error_type="timeout", config={"timeout": {"n_seconds": 0.2}}),
+            ToolFailure(error_type="timeout", config={"timeout": {"n_seconds": 0.2}}),
+            ToolFailure(error_type="timeout", config={"timeout": {"n_seconds": 0.2}}),
+        ]
+    )
+
+    @with_monkey(scenario)
+    async def my_func():
+        return "success"
+
+    async def run():
+        return await asyncio.gather(*(my_func() for _ in range(3)), return_exceptions=True)
+
+    start = time.time()
+    results = asyncio.run(run())
+    elapsed = time.time() - start
+    assert all(isinstance(r, TimeoutError) for r in results)
+    assert elapsed < 0.5
+
+
+def _deadline_scenario(seconds):
+    return FailureScenario(
+        name="test",
+        failures=[ToolFailure(on_call_count=1, error_type="timeout",
+                              config={"timeout": {"n_seconds": seconds, "mode": "deadline"}})]
+    )
+
+
+def test_deadline_mode_abandons_slow_sync_tool():
+    """Test that a slow sync tool is cut off at the deadline and its thread reported as leaked."""
+    observer = MonkeyObserver()
+    release = threading.Event()
+
+    @with_monkey(_deadline_scenario(0.05), observer=observer)
+    def slow_tool():
+        release.wait(5)
+        return "done"
+
+    with pytest.raises(TimeoutError):
+        slow_tool()
+
+    metrics = observer.get_metrics()
+    assert metrics["abandoned_calls"] == 1
+    assert metrics["leaked_threads"] == 1
+    assert metrics["breakdown"]["slow_tool"]["abandoned"] == 1
+
+    release.set()
+    time.sleep(0.1)
+    assert observer.leaked_threads() == 0
+
+
+def test_deadline_mode_lets_fast_tool_finish():
+    """Test that a tool finishing inside the deadline returns its real result."""
+    observer = MonkeyObserver()
+
+    @with_monkey(_deadline_scenario(1.0), observer=observer)
+    def fast_tool(x):
+        return x + 1
+
+    assert fast_tool(1) == 2
+    metrics = observer.get_metrics()
+    assert metrics["successes"] == 1
+    assert metrics["abandoned_calls"] == 0
+
+
+def test_deadline_mode_cancels_slow_async_tool():
+    """Test that a slow async tool is cancelled at the deadline."""
+    observer = MonkeyObserver()
+    cancelled = []
+
+    @with_monkey(_deadline_scenario(0.05), observer=observer)
+    async def slow_tool():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(slow_tool())
+
+    assert cancelled == [True]
+    metrics = observer.get_metrics()
+    assert metrics["abandoned_calls"] == 1
+    assert metrics["leaked_threads"] == 0
+
+
+def test_deadline_mode_keeps_async_tools_own_timeout_error():
+    """A TimeoutError the tool raises before the deadline is the tool's, not an abandoned call."""
+    observer = MonkeyObserver()
+    own_error = TimeoutError("upstream timed out")
+
+    @with_monkey(_deadline_scenario(5.0), observer=observer)
+    async def flaky_tool():
+        raise own_error
+
+    with pytest.raises(TimeoutError) as raised:
+        asyncio.run(flaky_tool())
+
+    assert raised.value is own_error
+    metrics = observer.get_metrics()
+    assert metrics["abandoned_calls"] == 0
+    assert metrics["latency_by_tool"]["flaky_tool"].keys() == {"real_failure"}
+
+
+def test_decorator_separates_chaos_and_real_failure_latencies():
+    scenario = FailureScenario(
+        name="test",
+        failures=[ToolFailure(on_call_count=1, error_type="timeout")]
+    )
+    observer = MonkeyObserver()
+
+    @with_monkey(scenario, observer=observer)
+    def my_func(fail):
+        if fail:
+            raise ValueError("real error")
+        return "success"
+
+    with pytest.raises(TimeoutError):
+        my_func(False)
+    with pytest.raises(ValueError):
+        my_func(True)
+    my_func(False)
+
+    latency = observer.get_metrics()["latency_by_tool"]["my_func"]
+    assert {outcome: stats["count"] for outcome, stats in latency.items()} == {
+        "chaos_failure": 1, "real_failure": 1, "success": 1}
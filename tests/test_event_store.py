@@ -0,0 +1,88 @@
+import pytest
+from datetime import datetime
+from tool_monkey import (MonkeyObserver, ColumnarEventStore, ToolFailure, FailureScenario, with_monkey,
+                         RateLimitError)
+from tool_monkey.models import ToolCallEvent
+
+
+def _fill(store, n):
+    for i in range(n):
+        store.record(f"tool_{i % 3}", 1_700_000_000.0 + i, i % 2 == 0, float(i),
+                     retry_attempt=i % 4, error=None if i % 2 == 0 else TimeoutError("timeout"))
+
+
+def test_columnar_store_materializes_events_lazily():
+    store = ColumnarEventStore(chunk_size=4)
+    _fill(store, 10)
+
+    assert len(store) == 10
+    event = store[3]
+    assert isinstance(event, ToolCallEvent)
+    assert event.tool_name == "tool_0"
+    assert event.timestamp == datetime.fromtimestamp(1_700_000_003.0)
+    assert event.success is False
+    assert event.latency_ms == 3.0
+    assert event.retry_attempt == 3
+    assert event.error == "timeout"
+    assert store[-1].latency_ms == 9.0
+    assert [e.latency_ms for e in store[8:]] == [8.0, 9.0]
+    assert len(list(store)) == 10
+    with pytest.raises(IndexError):
+        store[10]
+
+
+def test_columnar_store_interns_names_and_errors():
+    store = ColumnarEventStore(chunk_size=4)
+    _fill(store, 10)
+
+    assert store.tool_names == ["tool_0", "tool_1", "tool_2"]
+    assert store.error_types == [None, "TimeoutError"]
+    assert store.messages == [None, "timeout"]
+    # 10 events in chunks of 4 -> 3 chunks allocated up front
+    assert store.nbytes() == 3 * 4 * (4 + 8 + 1 + 8 + 4 + 4 + 4)
+
+
+def test_columnar_store_message_table_is_bounded():
+    store = ColumnarEventStore(chunk_size=64, max_messages=3)
+    for i in range(5000):
+        store.record("tool", 1_700_000_000.0 + i, False, 1.0,
+                     error=RateLimitError(f"Retry after {i * 0.001:.3f} seconds"))
+
+    assert store.error_types == [None, "RateLimitError"]
+    assert store.messages == [None, "Retry after 0.000 seconds", "Retry after 0.001 seconds",
+                              "Retry after 0.002 seconds"]
+    assert store[2].error == "Retry after 0.002 seconds"
+    # past the limit, events keep their error type but not the message
+    assert store[3].error == "RateLimitError"
+    assert store[4999].success is False
+
+
+def test_columnar_store_numpy_columns():
+    np = pytest.importorskip("numpy")
+    store = ColumnarEventStore(chunk_size=4)
+    _fill(store, 10)
+
+    columns = store.as_numpy()
+    assert columns["latency_ms"].tolist() == [float(i) for i in range(10)]
+    assert columns["success"].dtype == np.bool_
+    assert int(columns["success"].sum()) == 5
+    assert columns["timestamps_ns"][1] == 1_700_000_001_000_000_000
+
+
+def test_observer_with_columnar_store():
+    """Test that the observer records into a columnar store when given one."""
+    observer = MonkeyObserver(event_store=ColumnarEventStore())
+    scenario = FailureScenario(name="test", failures=[ToolFailure(on_call_count=1, error_type="timeout")])
+
+    @with_monkey(scenario, observer)
+    def my_func():
+        return "success"
+
+    with pytest.raises(TimeoutError):
+        my_func()
+    my_func()
+
+    assert len(observer.tool_call_events) == 2
+    assert observer.tool_call_events[0].success is False
+    assert observer.tool_call_events[1].retry_attempt == 1
+    assert observer.get_metrics()["total_calls"] == 2
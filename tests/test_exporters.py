@@ -0,0 +1,150 @@
+import json
+import time
+import pytest
+from tool_monkey import (MonkeyObserver, JSONLExporter, ParquetExporter, FailureScenario, ToolFailure,
+                         with_monkey)
+from tool_monkey.exporters import EventExporter
+from tool_monkey.models import ToolCallEvent
+
+
+def _record(observer, n):
+    for i in range(n):
+        observer.start_call(f"call_{i}")
+        observer.end_call("my_tool", f"call_{i}", success=i % 2 == 0,
+                          error=None if i % 2 == 0 else TimeoutError("timeout"))
+
+
+def test_jsonl_exporter_writes_events(tmp_path):
+    path = tmp_path / "events.jsonl"
+    with JSONLExporter(path, batch_size=10) as exporter:
+        observer = MonkeyObserver(exporter=exporter)
+        _record(observer, 25)
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 25
+    event = ToolCallEvent.model_validate_json(lines[1])
+    assert event.tool_name == "my_tool"
+    assert event.success is False
+    assert event.error == "timeout"
+    assert json.loads(lines[1])["error_type"] == "TimeoutError"
+    assert exporter.exported == 25
+    # events are streamed out, not kept in memory
+    assert len(observer.tool_call_events) == 0
+
+
+def test_jsonl_exporter_flushes_in_background(tmp_path):
+    path = tmp_path / "events.jsonl"
+    exporter = JSONLExporter(path, batch_size=1000, flush_interval=0.05)
+    observer = MonkeyObserver(exporter=exporter)
+    _record(observer, 3)
+
+    deadline = time.time() + 2
+    while exporter.exported < 3 and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(path.read_text().splitlines()) == 3
+    exporter.close()
+
+
+def test_jsonl_exporter_rotates_files(tmp_path):
+    path = tmp_path / "events.jsonl"
+    with JSONLExporter(path, batch_size=10, max_file_bytes=1000) as exporter:
+        observer = MonkeyObserver(exporter=exporter)
+        for _ in range(10):
+            _record(observer, 10)
+            exporter.flush()
+
+    assert len(exporter.files) > 1
+    assert exporter.files[0].name == "events-00001.jsonl"
+    total = sum(len(f.read_text().splitlines()) for f in exporter.files)
+    assert total == 100
+
+
+def test_jsonl_exporter_appends_on_restart(tmp_path):
+    path = tmp_path / "events.jsonl"
+    with JSONLExporter(path) as exporter:
+        _record(MonkeyObserver(exporter=exporter), 3)
+    with JSONLExporter(path) as exporter:
+        _record(MonkeyObserver(exporter=exporter), 2)
+
+    assert len(path.read_text().splitlines()) == 5
+
+
+def test_rotation_continues_after_existing_segments(tmp_path):
+    path = tmp_path / "events.jsonl"
+    with JSONLExporter(path, max_file_bytes=1000) as first:
+        for _ in range(5):
+            _record(MonkeyObserver(exporter=first), 10)
+            first.flush()
+    earlier = {f: f.read_text() for f in first.files}
+    with JSONLExporter(path, max_file_bytes=1000) as second:
+        _record(MonkeyObserver(exporter=second), 10)
+
+    assert second.files[0].name == f"events-{len(first.files) + 1:05d}.jsonl"
+    assert {f: f.read_text() for f in first.files} == earlier
+    total = sum(len(f.read_text().splitlines()) for f in tmp_path.glob("events-*.jsonl"))
+    assert total == 60
+
+
+def test_exporter_drops_events_after_close(tmp_path):
+    exporter = JSONLExporter(tmp_path / "events.jsonl")
+    exporter.close()
+    exporter.record("my_tool", time.time(), True, 1.0)
+    assert exporter.dropped == 1
+    assert exporter.exported == 0
+
+
+TIMEOUT_ON_3 = FailureScenario(name="timeout_on_3", failures=[
+    ToolFailure(error_type="timeout", on_call_count=3, config={"timeout": {"n_seconds": 0.01}})])
+
+
+# the calm scenario is passed through after call 1; the other keeps call 2 on the scheduled path
+@pytest.mark.parametrize("scenario, expected", [(FailureScenario(name="calm"), ["result", "result"]),
+                                                (TIMEOUT_ON_3, ["result", "timeout"])])
+def test_wrapped_tool_keeps_working_after_close(tmp_path, scenario, expected):
+    exporter = JSONLExporter(tmp_path / "events.jsonl")
+    observer = MonkeyObserver(exporter=exporter)
+    tool = with_monkey(scenario, observer)(lambda: "result")
+    assert tool() == "result"
+    exporter.close()
+
+    outcomes = []
+    for _ in range(2):
+        try:
+            outcomes.append(tool())
+        except TimeoutError:
+            outcomes.append("timeout")
+    assert outcomes == expected
+    # each call recorded once, however it ended
+    assert observer.get_metrics()["total_calls"] == 3
+    assert exporter.dropped == 2
+    assert len((tmp_path / "events.jsonl").read_text().splitlines()) == 1
+
+
+def test_exporter_is_abstract(tmp_path):
+    class Incomplete(EventExporter):
+        def _open_file(self, path):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete(tmp_path / "events.jsonl")
+
+
+def test_parquet_exporter_writes_row_groups(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "events.parquet"
+    with ParquetExporter(path, batch_size=10) as exporter:
+        observer = MonkeyObserver(exporter=exporter)
+        _record(observer, 25)
+
+    table = pq.read_table(path)
+    assert table.num_rows == 25
+    assert table.column("error_type").to_pylist()[1] == "TimeoutError"
+
+
+def test_parquet_exporter_refuses_to_overwrite(tmp_path):
+    pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "events.parquet"
+    path.write_bytes(b"earlier run")
+    with pytest.raises(FileExistsError):
+        ParquetExporter(path)
+    assert path.read_bytes() == b"earlier run"
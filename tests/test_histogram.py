@@ -0,0 +1,58 @@
+import random
+import pytest
+from tool_monkey.histogram import LatencyHistogram
+
+
+def test_histogram_percentiles_within_relative_accuracy():
+    rng = random.Random(42)
+    values = [rng.lognormvariate(3, 1) for _ in range(20000)]
+    histogram = LatencyHistogram(relative_accuracy=0.01)
+    for v in values:
+        histogram.record(v)
+
+    values.sort()
+    for q in (0.5, 0.9, 0.99, 0.999):
+        exact = values[int(q * (len(values) - 1))]
+        assert histogram.quantile(q) == pytest.approx(exact, rel=0.02)
+    assert histogram.stats()["max"] == values[-1]
+
+
+def test_histogram_memory_is_bounded():
+    histogram = LatencyHistogram(relative_accuracy=0.01)
+    for i in range(100000):
+        histogram.record(1 + (i % 1000))
+    # 1..1000 spans ~350 buckets at 1% accuracy, however many values are recorded
+    assert len(histogram.buckets) < 400
+    assert histogram.count == 100000
+
+
+def test_histogram_zero_values():
+    histogram = LatencyHistogram()
+    for _ in range(10):
+        histogram.record(0.0)
+    histogram.record(100.0)
+    assert histogram.quantile(0.5) == 0.0
+    assert histogram.quantile(1.0) == 100.0
+
+
+def test_histogram_merge_matches_single_histogram():
+    a, b, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for i in range(1, 1001):
+        (a if i % 2 else b).record(float(i))
+        combined.record(float(i))
+
+    merged = a.copy().merge(b)
+    assert merged.buckets == combined.buckets
+    assert merged.count == combined.count
+    assert merged.stats() == combined.stats()
+    assert a.count == 500
+
+
+def test_histogram_merge_rejects_different_accuracy():
+    with pytest.raises(ValueError):
+        LatencyHistogram(0.01).merge(LatencyHistogram(0.05))
+
+
+def test_histogram_empty_stats():
+    assert LatencyHistogram().stats() == {"count": 0}
+    assert LatencyHistogram().quantile(0.5) is None
@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+import pytest
+import tool_monkey
+
+
+def _run(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip()
+
+
+def test_import_does_not_load_submodules():
+    loaded = _run("import sys, tool_monkey; "
+                  "print(sorted(m for m in sys.modules if m.startswith(('tool_monkey.', 'pydantic', 'asyncio'))))")
+    assert loaded == "[]"
+
+
+def test_attribute_access_loads_only_what_it_needs():
+    loaded = _run("import sys, tool_monkey; tool_monkey.VirtualClock; "
+                  "print('tool_monkey.clock' in sys.modules, 'pydantic' in sys.modules)")
+    assert loaded == "True False"
+
+
+@pytest.mark.parametrize("name", tool_monkey.__all__)
+def test_every_public_name_resolves(name):
+    assert getattr(tool_monkey, name) is not None
+    assert name in dir(tool_monkey)
+
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError):
+        tool_monkey.no_such_thing
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+from tool_monkey import ToolMonkey, FailureScenario, MonkeyObserver, VirtualClock, with_monkey
+from tool_monkey.latency import LatencySampler
+from tool_monkey.models import LatencyConfig
+
+
+@pytest.mark.parametrize("config, low, high", [
+    ({"distribution": "constant", "seconds": 0.2}, 0.2, 0.2),
+    ({"distribution": "uniform", "low": 0.1, "high": 0.3}, 0.1, 0.3),
+    ({"distribution": "lognormal", "median": 0.1, "sigma": 0.5, "max_seconds": 5}, 0, 5),
+    ({"distribution": "pareto", "seconds": 0.05, "alpha": 1.5, "max_seconds": 2}, 0.05, 2),
+])
+def test_samples_stay_in_range(config, low, high):
+    sampler = LatencySampler(LatencyConfig(seed=1, **config))
+    samples = [sampler.sample() for _ in range(1000)]
+    assert all(low <= s <= high for s in samples)
+
+
+def test_lognormal_median_is_close_to_configured():
+    sampler = LatencySampler(LatencyConfig(distribution="lognormal", median=0.1, sigma=0.5, seed=3))
+    samples = sorted(sampler.sample() for _ in range(5001))
+    assert samples[2500] == pytest.approx(0.1, rel=0.1)
+
+
+def test_seeded_latency_is_reproducible_per_tool():
+    scenario = FailureScenario(name="slow", latency={"distribution": "uniform", "low": 0, "high": 1, "seed": 7})
+    clock = VirtualClock()
+
+    def delays(tool_name):
+        monkey = ToolMonkey(scenario, tool_name, clock=clock)
+        return [monkey.latency_for(monkey.next_failure()) for _ in range(5)]
+
+    assert delays("search") == delays("search")
+    assert delays("search") != delays("weather")
+
+
+def test_latency_entry_in_schedule_delays_only_that_call():
+    scenario = FailureScenario(name="one_slow_call", failures=[
+        {"error_type": "latency", "on_call_count": 2, "config": {"latency": {"seconds": 3}}},
+    ])
+    clock = VirtualClock()
+    monkey = ToolMonkey(scenario, "my_tool", clock=clock)
+    start = clock.now()
+
+    assert monkey.should_fail() is None
+    assert clock.now() - start < 0.1
+    assert monkey.should_fail() is None
+    assert clock.now() - start == pytest.approx(3, abs=0.05)
+
+
+def test_latency_entry_requires_config():
+    with pytest.raises(ValueError):
+        ToolMonkey(FailureScenario(name="bad", failures=[{"error_type": "latency"}]), "my_tool")
+
+
+def test_decorator_injects_latency_and_observer_records_it_separately():
+    clock = VirtualClock()
+    observer = MonkeyObserver(clock=clock)
+    scenario = FailureScenario(name="slow", latency={"seconds": 0.5})
+
+    @with_monkey(scenario, observer=observer)
+    def my_tool():
+        clock.advance(0.1)
+        return "ok"
+
+    start = clock.now()
+    assert my_tool() == "ok"
+    assert clock.now() - start == pytest.approx(0.6, abs=0.05)
+    metrics = observer.get_metrics()
+    assert metrics["latency_ms"]["max"] == pytest.approx(600, abs=50)
+    assert metrics["injected_latency_ms"]["count"] == 1
+    assert metrics["injected_latency_ms"]["max"] == pytest.approx(500, abs=0.05)
+    assert metrics["injected_latency_by_tool"]["my_tool"]["count"] == 1
+
+
+def test_async_decorator_injects_latency():
+    clock = VirtualClock()
+    observer = MonkeyObserver(clock=clock)
+    scenario = FailureScenario(name="slow", latency={"seconds": 2})
+
+    @with_monkey(scenario, observer=observer)
+    async def my_tool():
+        return "ok"
+
+    start = clock.now()
+    assert asyncio.run(my_tool()) == "ok"
+    assert clock.now() - start == pytest.approx(2, abs=0.05)
+    assert observer.get_metrics()["injected_latency_ms"]["max"] == pytest.approx(2000, abs=0.05)
+
+
+def test_failing_calls_get_no_scenario_latency():
+    clock = VirtualClock()
+    scenario = FailureScenario(name="slow", latency={"seconds": 1}, failures=[{"error_type": "auth_failure"}])
+    monkey = ToolMonkey(scenario, "my_tool", clock=clock)
+    start = clock.now()
+
+    assert monkey.should_fail() is not None
+    assert clock.now() - start < 0.1
+    assert monkey.should_fail() is None
+    assert clock.now() - start == pytest.approx(1, abs=0.05)
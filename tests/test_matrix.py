@@ -0,0 +1,106 @@
+import csv
+
+import pytest
+from tool_monkey import (run_matrix, FailureScenario, ProbabilisticFailures, ObserverSnapshot, expired_token,
+                         single_timeout)
+from tool_monkey.matrix import seeded
+
+
+def search(query):
+    return f"results for {query}"
+
+
+def weather(city):
+    return f"sunny in {city}"
+
+
+def retrying_harness(tools, seed):
+    """Calls every tool twice, retrying each call up to three times."""
+    outputs = []
+    for tool in tools:
+        for _ in range(2):
+            for _attempt in range(3):
+                try:
+                    outputs.append(tool("x"))
+                    break
+                except Exception:
+                    continue
+    return outputs
+
+
+def failing_harness(tools, seed):
+    tools[0]("x")
+
+
+def _random(seed=0):
+    return FailureScenario(name="random", probabilistic=ProbabilisticFailures(seed=seed, rates={"timeout": 0.5}))
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_one_cell_per_scenario_and_seed(executor):
+    scenarios = [FailureScenario(name="calm"), expired_token(on_call=2)]
+    result = run_matrix(retrying_harness, [search, weather], scenarios, seeds=[1, 2], executor=executor,
+                        max_workers=2)
+
+    assert [(cell.scenario, cell.seed) for cell in result] == [
+        ("calm", 1), ("calm", 2), ("expired_token", 1), ("expired_token", 2)]
+    calm, _, expired, _ = result.rows
+    assert calm["total_calls"] == 4 and calm["success_rate"] == 1.0
+    # the failed second call is retried, once per cell: cells don't share counts
+    assert expired["total_calls"] == 5 and expired["failures"] == 1
+    assert all(row["error"] is None and row["wall_time_s"] >= 0 for row in result.rows)
+
+
+def test_seed_replaces_scenario_seeds():
+    scenario = _random(seed=0)
+    assert seeded(scenario, None) is scenario
+    assert seeded(scenario, 7).probabilistic.seed == 7
+    assert scenario.probabilistic.seed == 0
+
+    first = run_matrix(retrying_harness, [search], [scenario], seeds=[1, 2, 3])
+    again = run_matrix(retrying_harness, [search], [scenario], seeds=[1, 2, 3])
+    assert [row["total_calls"] for row in first.rows] == [row["total_calls"] for row in again.rows]
+
+
+def test_harness_errors_are_recorded():
+    result = run_matrix(failing_harness, [search], [single_timeout()], virtual_time=True)
+    assert "TimeoutError" in result[0].error
+    assert result.rows[0]["failures"] == 1
+    assert "TimeoutError" in result.format_table().splitlines()[1]
+
+
+def test_keep_output():
+    assert run_matrix(retrying_harness, [search], [FailureScenario(name="calm")])[0].output is None
+    result = run_matrix(retrying_harness, [search], [FailureScenario(name="calm")], keep_output=True)
+    assert result[0].output == ["results for x", "results for x"]
+
+
+def test_by_scenario_merges_seeds():
+    result = run_matrix(retrying_harness, [search], [FailureScenario(name="calm"), _random()], seeds=[1, 2])
+    merged = result.by_scenario()
+    assert set(merged) == {"calm", "random"}
+    assert merged["calm"].total_calls == 4
+    assert isinstance(merged["random"], ObserverSnapshot)
+    assert merged["random"].total_calls == sum(cell.snapshot.total_calls for cell in result[2:])
+
+
+def test_table_and_csv(tmp_path):
+    result = run_matrix(retrying_harness, [search], [FailureScenario(name="calm"), expired_token(on_call=1)])
+    lines = result.format_table().splitlines()
+    assert lines[0].split()[:3] == ["scenario", "seed", "total_calls"]
+    assert len(lines) == 3
+
+    path = tmp_path / "matrix.csv"
+    result.to_csv(str(path))
+    with open(path) as f:
+        rows = list(csv.DictReader(f))
+    assert [row["scenario"] for row in rows] == ["calm", "expired_token"]
+
+
+def test_virtual_time_skips_simulated_delays():
+    result = run_matrix(retrying_harness, [search], [single_timeout(seconds=30)], seeds=[1, 2],
+                        virtual_time=True)
+    assert all(row["wall_time_s"] < 5 for row in result.rows)
+    # latencies are in simulated time
+    timed_out = result[0].snapshot.get_metrics()["latency_by_tool"]["search"]["chaos_failure"]
+    assert timed_out["max"] == pytest.approx(30_000, abs=50)
@@ -1,6 +1,9 @@
+import functools
+import sys
+import threading
 import time
 import pytest
-from tool_monkey import ToolMonkey, FailureScenario, ToolFailure, ToolFailureConfigDict
+from tool_monkey import ToolMonkey, FailureScenario, ToolFailure, ToolFailureConfigDict, CompiledSchedule, register_error_type, RateLimitError, AuthenticationError
 
 
 def test_fails_on_specified_call_count():
@@ -59,3 +62,132 @@ def test_timeout_config():
     assert elapsed >= 0.1
     assert isinstance(error, TimeoutError)
     assert "after 0.1" in str(error)
+
+
+def test_scheduled_failures_fire_exactly_once_under_threads():
+    """Test that concurrent callers get distinct call numbers, so each scheduled failure fires once."""
+    n_threads, calls_per_thread = 8, 500
+    total = n_threads * calls_per_thread
+    scheduled = list(range(3, total + 1, 3))
+    fail_scenario = FailureScenario(
+        name="test",
+        failures=[ToolFailure(on_call_count=n, error_type="rate_limit") for n in scheduled]
+    )
+    monkey = ToolMonkey(failure_scenario=fail_scenario, tool_name="my_tool")
+    failures = []
+
+    def worker():
+        count = sum(1 for _ in range(calls_per_thread) if monkey.should_fail() is not None)
+        failures.append(count)
+
+    previous_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(previous_interval)
+
+    assert sum(failures) == len(scheduled)
+    assert monkey.call_count == total
+
+
+def test_unknown_error_type_rejected_at_init():
+    fail_scenario = FailureScenario(
+        name="test",
+        failures=[ToolFailure(on_call_count=1, error_type="not_a_real_error")]
+    )
+    with pytest.raises(ValueError, match="Unknown error_type 'not_a_real_error'"):
+        ToolMonkey(failure_scenario=fail_scenario, tool_name="my_tool")
+
+
+def test_each_failure_gets_a_fresh_exception():
+    fail_scenario = FailureScenario(
+        name="test",
+        failures=[ToolFailure(error_type="rate_limit", config={"rate_limit": {
+            "retry_after_seconds": 5, "limit_type": "burst"}})] * 2
+    )
+    monkey = ToolMonkey(failure_scenario=fail_scenario, tool_name="my_tool")
+    first, second = monkey.should_fail(), monkey.should_fail()
+    assert isinstance(first, RateLimitError)
+    assert first is not second
+    assert first.retry_after == 5 and first.limit_type == "burst"
+    assert str(first) == str(second)
+
+
+def test_register_custom_error_type():
+    class QuotaError(Exception):
+        pass
+
+    @register_error_type("quota_exceeded")
+    def quota_exceeded(preamble, config):
+        return functools.partial(QuotaError, f"{preamble}: Quota exceeded")
+
+    fail_scenario = FailureScenario(
+        name="test",
+        failures=[ToolFailure(on_call_count=1, error_type="quota_exceeded")]
+    )
+    monkey = ToolMonkey(failure_scenario=fail_scenario, tool_name="my_tool")
+    assert isinstance(monkey.should_fail(), QuotaError)
+
+
+def test_compiled_schedule_shared_between_monkeys():
+    fail_scenario = FailureScenario(
+        name="test",
+        failures=[ToolFailure(on_call_count=1, error_type="timeout")]
+    )
+    schedule = CompiledSchedule(fail_scenario)
+    a = ToolMonkey(fail_scenario, "tool_a", schedule=schedule)
+    b = ToolMonkey(fail_scenario, "tool_b", schedule=schedule)
+    assert isinstance(a.should_fail(), TimeoutError)
+    assert isinstance(b.should_fail(), TimeoutError)
+
+
+def _probabilistic_scenario(seed):
+    return FailureScenario(
+        name="random",
+        probabilistic={"seed": seed, "rates": {"rate_limit": 0.02, "timeout": 0.005}, "block_size": 1000},
+    )
+
+
+def _failure_types(monkey, calls):
+    return [type(monkey.should_fail()).__name__ for _ in range(calls)]
+
+
+def test_probabilistic_failures_match_rates_and_reproduce_from_seed():
+    first = _failure_types(ToolMonkey(_probabilistic_scenario(7), "my_tool"), 100000)
+    second = _failure_types(ToolMonkey(_probabilistic_scenario(7), "my_tool"), 100000)
+    other_seed = _failure_types(ToolMonkey(_probabilistic_scenario(8), "my_tool"), 100000)
+
+    assert first == second
+    assert first != other_seed
+    assert first.count("RateLimitError") == pytest.approx(2000, rel=0.1)
+    assert first.count("TimeoutError") == pytest.approx(500, rel=0.2)
+
+
+def test_probabilistic_failures_keep_constant_memory():
+    monkey = ToolMonkey(_probabilistic_scenario(7), "my_tool")
+    for _ in range(20000):
+        monkey.should_fail()
+    assert len(monkey.schedule.random._blocks) <= 4
+
+
+def test_explicit_failures_take_precedence_over_probabilistic():
+    fail_scenario = FailureScenario(
+        name="test",
+        failures=[ToolFailure(on_call_count=1, error_type="auth_failure")],
+        probabilistic={"seed": 1, "rates": {"rate_limit": 1.0}},
+    )
+    monkey = ToolMonkey(fail_scenario, "my_tool")
+    assert isinstance(monkey.should_fail(), AuthenticationError)
+    assert isinstance(monkey.should_fail(), RateLimitError)
+
+
+def test_probabilistic_rates_validated():
+    with pytest.raises(ValueError):
+        FailureScenario(name="bad", probabilistic={"seed": 1, "rates": {"rate_limit": 0.7, "timeout": 0.5}})
+    with pytest.raises(ValueError, match="Unknown error_type"):
+        ToolMonkey(FailureScenario(name="bad", probabilistic={"seed": 1, "rates": {"nope": 0.1}}), "my_tool")
@@ -115,3 +115,59 @@ def test_observer_summary_format():
     assert "Total Calls: 1" in summary
     assert "Success Rate:" in summary
     assert "Failures: 0" in summary
+
+
+def test_observer_does_not_keep_events_by_default():
+    """Test that metrics come from running totals and events are only kept on request."""
+    observer = MonkeyObserver()
+    for i in range(1000):
+        observer.start_call(f"call_{i}")
+        observer.end_call("my_tool", f"call_{i}", success=i % 4 != 0, retry_attempt=1 if i % 4 == 1 else 0)
+
+    assert observer.tool_call_events == []
+    metrics = observer.get_metrics()
+    assert metrics["total_calls"] == 1000
+    assert metrics["failures"] == 250
+    assert metrics["total_retries"] == 250
+    assert metrics["breakdown"]["my_tool"] == {
+        "call_count": 1000, "failures": 250, "retries": 250, "abandoned": 0}
+
+
+def test_observer_keeps_events_when_asked():
+    observer = MonkeyObserver(keep_events=True)
+
+    observer.start_call("call_1")
+    observer.end_call("my_tool", "call_1", success=False, error=TimeoutError("timeout"))
+
+    assert len(observer.tool_call_events) == 1
+    event = observer.tool_call_events[0]
+    assert event.tool_name == "my_tool"
+    assert event.error == "timeout"
+
+
+def test_observer_metrics_breakdown_is_a_copy():
+    observer = MonkeyObserver()
+    observer.start_call("call_1")
+    observer.end_call("my_tool", "call_1", success=True)
+
+    observer.get_metrics()["breakdown"]["my_tool"]["call_count"] = 99
+    assert observer.get_metrics()["breakdown"]["my_tool"]["call_count"] == 1
+
+
+def test_observer_latency_percentiles_by_outcome():
+    """Test that latency histograms are split by tool and by success / chaos / real failure."""
+    observer = MonkeyObserver()
+
+    observer.start_call("call_1")
+    observer.end_call("tool_a", "call_1", success=True)
+    observer.start_call("call_2")
+    observer.end_call("tool_a", "call_2", success=False, error=TimeoutError("timeout"), injected=True)
+    observer.start_call("call_3")
+    observer.end_call("tool_b", "call_3", success=False, error=RuntimeError("error"))
+
+    metrics = observer.get_metrics()
+    assert metrics["latency_ms"]["count"] == 3
+    assert set(metrics["latency_ms"]) >= {"p50", "p90", "p99", "p99.9", "max"}
+    assert set(metrics["latency_by_tool"]["tool_a"]) == {"success", "chaos_failure"}
+    assert set(metrics["latency_by_tool"]["tool_b"]) == {"real_failure"}
+    assert "p50/p90/p99/p99.9/max" in observer.summary()
@@ -0,0 +1,70 @@
+import urllib.request
+import pytest
+from tool_monkey import (MonkeyObserver, with_monkey, FailureScenario, ToolFailure,
+                         render_openmetrics, serve_metrics)
+
+
+def _run_calls(observer):
+    scenario = FailureScenario(
+        name="flaky",
+        failures=[ToolFailure(on_call_count=1, error_type="rate_limit")]
+    )
+
+    @with_monkey(scenario, observer)
+    def my_tool(fail=False):
+        if fail:
+            raise ValueError("bad \"input\"")
+        return "ok"
+
+    with pytest.raises(Exception):
+        my_tool()
+    my_tool()
+    with pytest.raises(ValueError):
+        my_tool(fail=True)
+
+
+def test_render_openmetrics_counters_and_labels():
+    observer = MonkeyObserver()
+    _run_calls(observer)
+
+    text = render_openmetrics(observer)
+    assert text.endswith("# EOF\n")
+    assert 'tool_monkey_calls_total{tool="my_tool",scenario="flaky",outcome="chaos_failure",error_type="RateLimitError"} 1' in text
+    assert 'tool_monkey_calls_total{tool="my_tool",scenario="flaky",outcome="success",error_type=""} 1' in text
+    assert 'tool_monkey_calls_total{tool="my_tool",scenario="flaky",outcome="real_failure",error_type="ValueError"} 1' in text
+    assert 'tool_monkey_retried_calls_total{tool="my_tool"} 1' in text
+
+
+def test_render_openmetrics_histogram_is_cumulative():
+    observer = MonkeyObserver()
+    _run_calls(observer)
+
+    text = render_openmetrics(observer)
+    buckets = [line for line in text.splitlines()
+               if line.startswith('tool_monkey_call_latency_seconds_bucket{tool="my_tool",outcome="success"')]
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert counts == sorted(counts)
+    assert buckets[-1].endswith('le="+Inf"} 1')
+    assert 'tool_monkey_call_latency_seconds_count{tool="my_tool",outcome="success"} 1' in text
+
+
+def test_render_openmetrics_escapes_label_values():
+    observer = MonkeyObserver()
+    observer.start_call("call_1")
+    observer.end_call('tool "quoted"', "call_1", success=True)
+    assert 'tool="tool \\"quoted\\""' in render_openmetrics(observer)
+
+
+def test_serve_metrics_endpoint():
+    observer = MonkeyObserver()
+    _run_calls(observer)
+    server = serve_metrics(observer, port=0)
+    try:
+        host, port = server.server_address
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("application/openmetrics-text")
+            body = response.read().decode()
+        assert "tool_monkey_calls_total" in body
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+from tool_monkey import (with_monkey, FailureScenario, ToolFailure, FailureRule, MonkeyObserver, ToolMonkey,
+                         VirtualClock, chaos_disabled, chaos_enabled, set_chaos_enabled)
+from tool_monkey.schedule import CompiledSchedule
+
+
+def _one_failure():
+    return FailureScenario(name="once", failures=[ToolFailure(on_call_count=2, error_type="auth_failure")])
+
+
+def test_last_call_of_finite_and_infinite_schedules():
+    assert CompiledSchedule(_one_failure()).last_call == 2
+    assert CompiledSchedule(FailureScenario(name="empty")).last_call == 0
+    assert CompiledSchedule(FailureScenario(name="ranged", rules=[
+        FailureRule(error_type="timeout", start=3, stop=10)])).last_call == 9
+    assert CompiledSchedule(FailureScenario(name="forever", rules=[
+        FailureRule(error_type="timeout", every=3)])).last_call is None
+
+
+def test_monkey_is_exhausted_after_last_scheduled_call():
+    monkey = ToolMonkey(_one_failure(), "my_tool")
+    monkey.should_fail()
+    assert not monkey.exhausted
+    assert monkey.should_fail() is not None
+    assert monkey.exhausted
+
+
+def test_rate_limited_scenario_never_exhausts():
+    monkey = ToolMonkey(FailureScenario(name="quota", rate_limiter={"limit_type": "per_minute", "limit": 5}), "my_tool")
+    monkey.should_fail()
+    assert not monkey.exhausted
+
+
+def test_exhausted_wrapper_skips_schedule():
+    @with_monkey(_one_failure(), record_passthrough="off")
+    def my_tool():
+        return "ok"
+
+    assert my_tool() == "ok"
+    with pytest.raises(Exception):
+        my_tool()
+    for _ in range(5):
+        assert my_tool() == "ok"
+    assert my_tool.__wrapped__ is not None
+
+
+@pytest.mark.parametrize("mode, recorded", [("full", 12), ("sampled", 6), ("off", 2)])
+def test_passthrough_recording_modes(mode, recorded):
+    observer = MonkeyObserver(clock=VirtualClock())
+
+    @with_monkey(_one_failure(), observer=observer, record_passthrough=mode, sample_every=3)
+    def my_tool():
+        return "ok"
+
+    my_tool()
+    with pytest.raises(Exception):
+        my_tool()
+    for _ in range(10):
+        my_tool()
+    assert observer.get_metrics()["total_calls"] == recorded
+
+
+def test_passthrough_still_records_real_failures():
+    observer = MonkeyObserver(clock=VirtualClock())
+
+    @with_monkey(FailureScenario(name="empty"), observer=observer)
+    def my_tool():
+        raise KeyError("boom")
+
+    for _ in range(3):
+        with pytest.raises(KeyError):
+            my_tool()
+    metrics = observer.get_metrics()
+    assert metrics["failures"] == 3
+    assert metrics["error_types"] == {"KeyError": 3}
+
+
+def test_async_passthrough():
+    observer = MonkeyObserver(clock=VirtualClock())
+
+    @with_monkey(_one_failure(), observer=observer, record_passthrough="off")
+    async def my_tool():
+        return "ok"
+
+    async def run():
+        results = []
+        for _ in range(5):
+            try:
+                results.append(await my_tool())
+            except Exception:
+                results.append("failed")
+        return results
+
+    assert asyncio.run(run()) == ["ok", "failed", "ok", "ok", "ok"]
+    assert observer.get_metrics()["total_calls"] == 2
+
+
+def test_chaos_switch_bypasses_wrapper():
+    observer = MonkeyObserver(clock=VirtualClock())
+
+    @with_monkey(FailureScenario(name="always", rules=[FailureRule(error_type="timeout", every=1)]),
+                 observer=observer)
+    def my_tool():
+        return "ok"
+
+    with chaos_disabled():
+        assert not chaos_enabled()
+        assert my_tool() == "ok"
+    assert chaos_enabled()
+    with pytest.raises(TimeoutError):
+        my_tool()
+    assert observer.get_metrics()["total_calls"] == 1
+
+
+def test_set_chaos_enabled_returns_previous():
+    assert set_chaos_enabled(False) is True
+    try:
+        assert set_chaos_enabled(False) is False
+    finally:
+        set_chaos_enabled(True)
+
+
+def test_invalid_recording_mode():
+    with pytest.raises(ValueError):
+        with_monkey(_one_failure(), record_passthrough="some")
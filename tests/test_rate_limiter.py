@@ -0,0 +1,124 @@
+import pytest
+from tool_monkey import ToolMonkey, FailureScenario, VirtualClock, RateLimitError, with_monkey, chaos_session
+from tool_monkey.models import RateLimitConfig
+from tool_monkey.rate_limiter import make_rate_limiter, RateLimiter, SlidingWindowLimiter, TokenBucketLimiter
+
+
+def _scenario(**rate_limiter):
+    return FailureScenario(name="quota", rate_limiter=rate_limiter)
+
+
+def test_sliding_window_rejects_until_oldest_call_expires():
+    clock = VirtualClock()
+    monkey = ToolMonkey(_scenario(limit_type="per_minute", limit=5), "my_tool", clock=clock)
+
+    for _ in range(5):
+        assert monkey.should_fail() is None
+        clock.advance(1)
+    error = monkey.should_fail()
+    assert isinstance(error, RateLimitError)
+    assert error.retry_after == pytest.approx(55, abs=0.01)
+    assert error.limit_type == "per_minute"
+
+    clock.advance(error.retry_after)
+    assert monkey.should_fail() is None
+
+
+def test_token_bucket_allows_burst_then_refills():
+    clock = VirtualClock()
+    monkey = ToolMonkey(_scenario(limit_type="burst", limit=3, window_seconds=1), "my_tool", clock=clock)
+
+    assert [monkey.should_fail() for _ in range(3)] == [None, None, None]
+    error = monkey.should_fail()
+    assert isinstance(error, RateLimitError)
+    assert error.retry_after == pytest.approx(1 / 3, abs=0.01)
+
+    clock.advance(error.retry_after)
+    assert monkey.should_fail() is None
+
+
+def test_backoff_achieves_configured_throughput():
+    """An agent honouring retry_after should run at (close to) the configured limit."""
+    clock = VirtualClock()
+    monkey = ToolMonkey(_scenario(limit_type="per_minute", limit=10), "my_tool", clock=clock)
+
+    for _ in range(200):
+        error = monkey.should_fail()
+        clock.sleep(error.retry_after if error else 0.1)
+
+    stats = monkey.rate_limiter.stats()
+    assert stats["limit_per_second"] == pytest.approx(10 / 60)
+    assert stats["throughput_per_second"] == pytest.approx(stats["limit_per_second"], rel=0.2)
+    assert stats["allowed"] + stats["rejected"] == 200
+
+
+def test_make_rate_limiter_picks_algorithm():
+    assert isinstance(make_rate_limiter(RateLimitConfig(limit_type="burst", limit=1)), TokenBucketLimiter)
+    assert isinstance(make_rate_limiter(RateLimitConfig(limit_type="per_hour", limit=1)), SlidingWindowLimiter)
+
+
+def test_rate_limiter_requires_limit():
+    with pytest.raises(ValueError):
+        _scenario(limit_type="per_minute")
+
+
+def test_wrapped_tool_exposes_rate_limiter():
+    clock = VirtualClock()
+    tool = with_monkey(_scenario(limit_type="per_minute", limit=2), clock=clock)(lambda: 1)
+    assert tool.rate_limiter is tool.monkey.rate_limiter
+
+    results = []
+    for _ in range(3):
+        try:
+            results.append(tool())
+        except RateLimitError:
+            results.append("RL")
+    assert results == [1, 1, "RL"]
+    assert tool.rate_limiter.stats()["allowed"] == 2
+    assert with_monkey(FailureScenario(name="calm"))(lambda: 1).rate_limiter is None
+
+
+def test_per_session_rate_limits_are_independent():
+    tool = with_monkey(_scenario(limit_type="per_minute", limit=2), per_session=True, clock=VirtualClock())(lambda: 1)
+
+    def run(session):
+        results = []
+        with chaos_session(session):
+            for _ in range(2):
+                try:
+                    results.append(tool())
+                except RateLimitError:
+                    results.append("RL")
+        return results
+
+    assert run("a") == [1, 1]
+    assert run("b") == [1, 1]
+    assert run("a") == ["RL", "RL"]
+    with chaos_session("b"):
+        assert tool.rate_limiter.stats()["allowed"] == 2
+
+
+def test_rate_limiter_is_abstract():
+    class Incomplete(RateLimiter):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(RateLimitConfig(limit_type="burst", limit=1))
+
+
+@pytest.mark.parametrize("limit_type", ["per_minute", "burst"])
+def test_remaining_sets_starting_quota(limit_type):
+    clock = VirtualClock()
+    exhausted = ToolMonkey(_scenario(limit_type=limit_type, limit=3, window_seconds=60, remaining=0), "my_tool",
+                           clock=clock)
+    error = exhausted.should_fail()
+    assert isinstance(error, RateLimitError)
+    assert error.retry_after == pytest.approx(60 if limit_type == "per_minute" else 20, abs=0.01)
+
+    partial = ToolMonkey(_scenario(limit_type=limit_type, limit=3, window_seconds=60, remaining=1), "my_tool",
+                         clock=clock)
+    assert partial.should_fail() is None
+    assert isinstance(partial.should_fail(), RateLimitError)
+
+    full = ToolMonkey(_scenario(limit_type=limit_type, limit=3, window_seconds=60), "my_tool", clock=clock)
+    assert [full.should_fail() for _ in range(3)] == [None, None, None]
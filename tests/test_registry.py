@@ -0,0 +1,118 @@
+import json
+
+import pytest
+from tool_monkey import FailureScenario, ScenarioRegistry, load_scenarios, with_monkey, ToolMonkey
+from tool_monkey import registry as registry_module
+from tool_monkey.registry import set_default_registry, get_default_registry
+
+SCENARIO = {"name": "flaky", "failures": [{"error_type": "rate_limit", "on_call_count": 1}]}
+
+
+@pytest.fixture
+def default_registry():
+    registry = ScenarioRegistry()
+    previous = set_default_registry(registry)
+    yield registry
+    set_default_registry(previous)
+
+
+def test_load_json_and_toml(tmp_path):
+    (tmp_path / "a.json").write_text(json.dumps(SCENARIO))
+    (tmp_path / "b.toml").write_text(
+        'name = "slow"\n[latency]\ndistribution = "uniform"\nlow = 0.1\nhigh = 0.2\n')
+    (tmp_path / "notes.txt").write_text("not a scenario")
+
+    assert load_scenarios(tmp_path / "a.json")[0].failures[0].error_type == "rate_limit"
+    assert load_scenarios(tmp_path / "b.toml")[0].latency.high == 0.2
+
+    registry = ScenarioRegistry()
+    registry.load_dir(tmp_path)
+    assert registry.names() == ["flaky", "slow"]
+
+
+def test_load_yaml_with_several_scenarios(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "c.yaml"
+    path.write_text("scenarios:\n  - name: one\n    rules: [{error_type: timeout, every: 3}]\n  - name: two\n")
+    assert [s.name for s in load_scenarios(path)] == ["one", "two"]
+
+
+def test_invalid_file_is_rejected(tmp_path):
+    path = tmp_path / "bad.json"
+    path.write_text(json.dumps({"name": "bad", "failures": [{"error_type": "nope"}]}))
+    with pytest.raises(ValueError):
+        ScenarioRegistry().load(path)
+    (tmp_path / "bad.txt").write_text("name: bad")
+    with pytest.raises(ValueError):
+        load_scenarios(tmp_path / "bad.txt")
+
+
+def test_same_content_is_compiled_once(tmp_path):
+    (tmp_path / "a.json").write_text(json.dumps(SCENARIO))
+    (tmp_path / "b.json").write_text(json.dumps(SCENARIO))
+    registry = ScenarioRegistry()
+    registry.load(tmp_path / "a.json")
+    schedule = registry.schedule("flaky")
+    registry.load(tmp_path / "b.json")
+    assert registry.schedule("flaky") is schedule
+
+
+def test_changed_file_is_reloaded(tmp_path):
+    path = tmp_path / "a.json"
+    path.write_text(json.dumps(SCENARIO))
+    registry = ScenarioRegistry()
+    registry.load(path)
+    path.write_text(json.dumps({**SCENARIO, "failures": []}))
+    registry.load(path)
+    assert registry.get("flaky").failures == []
+
+
+def test_disk_cache_skips_validation(tmp_path, monkeypatch):
+    path = tmp_path / "a.json"
+    path.write_text(json.dumps({**SCENARIO, "probabilistic": {"seed": 3, "rates": {"timeout": 0.5}}}))
+    first = ScenarioRegistry(cache_dir=tmp_path / "cache")
+    first.load(path)
+    assert len(list((tmp_path / "cache").glob("*.pickle"))) == 1
+
+    def fail(*args):
+        raise AssertionError("should have been read from the disk cache")
+
+    monkeypatch.setattr(registry_module, "parse_scenarios", fail)
+    second = ScenarioRegistry(cache_dir=tmp_path / "cache")
+    second.load(path)
+    expected = [first.schedule("flaky").failure_for(n) is None for n in range(2, 200)]
+    assert [second.schedule("flaky").failure_for(n) is None for n in range(2, 200)] == expected
+
+
+def test_unknown_name_lists_registered(default_registry):
+    default_registry.register(FailureScenario(name="known"))
+    with pytest.raises(KeyError, match="known"):
+        default_registry.get("unknown")
+
+
+def test_with_monkey_by_name_uses_registered_schedule(default_registry):
+    default_registry.register(FailureScenario.model_validate(SCENARIO))
+
+    @with_monkey("flaky")
+    def my_tool():
+        return "ok"
+
+    with pytest.raises(Exception):
+        my_tool()
+    assert my_tool() == "ok"
+
+
+def test_monkey_shares_registry_schedule(default_registry):
+    default_registry.register(FailureScenario.model_validate(SCENARIO))
+    monkey = ToolMonkey(default_registry.get("flaky"), "my_tool", schedule=default_registry.schedule("flaky"))
+    assert monkey.schedule is default_registry.schedule("flaky")
+
+
+def test_default_registry_loads_environment(tmp_path, monkeypatch):
+    (tmp_path / "a.json").write_text(json.dumps(SCENARIO))
+    monkeypatch.setenv("TOOL_MONKEY_SCENARIOS", str(tmp_path))
+    previous = set_default_registry(None)
+    try:
+        assert get_default_registry().names() == ["flaky"]
+    finally:
+        set_default_registry(previous)
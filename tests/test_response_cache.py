@@ -0,0 +1,214 @@
+import asyncio
+import pickle
+from dataclasses import dataclass
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+
+import pytest
+from pydantic import BaseModel
+from tool_monkey import (with_monkey, run_matrix, ChaosCoordinator, FailureScenario, ResponseCache,
+                         ResponseNotRecordedError, expired_token, chaos_disabled)
+from tool_monkey.response_cache import call_key
+
+
+class Query(BaseModel):
+    text: str
+    limit: int = 10
+
+
+class Color(Enum):
+    RED = "red"
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+def _first_arg_key(args, kwargs):
+    return args[0]
+
+
+def _counting_tool():
+    calls = []
+
+    def search(query, limit=10):
+        calls.append((query, limit))
+        return {"query": query, "hits": [f"doc-{i}" for i in range(limit)]}
+    return search, calls
+
+
+def test_call_key_is_stable():
+    assert call_key(("a",), {"x": 1, "y": 2}) == call_key(("a",), {"y": 2, "x": 1})
+    assert call_key(("a",), {}) != call_key(("b",), {})
+    assert call_key((Query(text="a"),), {}) == call_key((Query(text="a"),), {})
+    assert call_key(({1, 2},), {}) == call_key(({2, 1},), {})
+    assert call_key((Path("a") / "b", Color.RED, Point(1, 2)), {}) == \
+        call_key((Path("a/b"), Color.RED, Point(1, 2)), {})
+
+
+def test_call_key_tells_types_apart():
+    # same encoded text, different types: replaying one for the other would be wrong
+    assert call_key((b"\xab",), {}) != call_key(("ab",), {})
+    assert call_key((Path("a"),), {}) != call_key(("a",), {})
+    assert call_key((Decimal("1.5"),), {}) != call_key(("1.5",), {})
+    assert call_key((Color.RED,), {}) != call_key(("red",), {})
+    assert call_key(({1, 2},), {}) != call_key(([1, 2],), {})
+
+
+def test_call_key_rejects_arguments_without_a_stable_encoding():
+    # the default repr() embeds a memory address, so it can't key a call across runs
+    with pytest.raises(TypeError, match="key="):
+        call_key((object(),), {})
+    with pytest.raises(TypeError):
+        ResponseCache(mode="auto").wrap(lambda client: "ok", tool_name="search")(object())
+
+
+def test_custom_key_function():
+    cache = ResponseCache(mode="auto", key=_first_arg_key)
+    calls = []
+
+    def search(query, client):
+        calls.append(query)
+        return query.upper()
+
+    tool = cache.wrap(search)
+    assert [tool("a", object()), tool("a", object())] == ["A", "A"]
+    assert calls == ["a"]
+    assert pickle.loads(pickle.dumps(cache)).key is _first_arg_key
+
+
+def test_record_then_replay_from_disk(tmp_path):
+    path = tmp_path / "responses.sqlite"
+    search, calls = _counting_tool()
+    with ResponseCache(path, mode="record") as cache:
+        recorder = with_monkey(FailureScenario(name="calm"), response_cache=cache)(search)
+        assert recorder("paris", limit=2) == {"query": "paris", "hits": ["doc-0", "doc-1"]}
+        assert len(cache) == 1
+
+    with ResponseCache(path, mode="replay") as cache:
+        replayer = with_monkey(FailureScenario(name="calm"), response_cache=cache)(search)
+        assert replayer("paris", limit=2) == {"query": "paris", "hits": ["doc-0", "doc-1"]}
+        with pytest.raises(ResponseNotRecordedError):
+            replayer("london", limit=2)
+        assert (cache.hits, cache.misses) == (1, 1)
+    assert calls == [("paris", 2)]
+
+
+def test_injected_failures_still_happen_on_replay():
+    search, calls = _counting_tool()
+    cache = ResponseCache(mode="auto")
+    tool = with_monkey(expired_token(on_call=2), response_cache=cache)(search)
+
+    assert tool("q", limit=1)["hits"] == ["doc-0"]
+    with pytest.raises(Exception, match="token"):
+        tool("q", limit=1)
+    assert tool("q", limit=1)["hits"] == ["doc-0"]
+    # auto mode recorded the first call and replayed the third
+    assert calls == [("q", 1)]
+
+
+def test_replayed_responses_are_copies():
+    search, _ = _counting_tool()
+    tool = ResponseCache(mode="auto").wrap(search)
+    tool("q", limit=1)["hits"].append("mutated")
+    assert tool("q", limit=1)["hits"] == ["doc-0"]
+
+
+def test_record_mode_always_calls_the_tool():
+    search, calls = _counting_tool()
+    tool = ResponseCache(mode="record").wrap(search)
+    tool("q")
+    tool("q")
+    assert len(calls) == 2
+
+
+def test_errors_are_not_recorded():
+    cache = ResponseCache(mode="auto")
+
+    def flaky(query):
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        cache.wrap(flaky)("q")
+    assert len(cache) == 0
+
+
+def test_lru_falls_back_to_disk(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite", mode="record", max_entries=2)
+    for i in range(5):
+        cache.put("search", (i,), {}, i * 10)
+    assert len(cache._memory) == 2
+    assert cache.get("search", (0,)) == 0
+    assert len(cache) == 5
+
+
+def test_memory_only_cache_evicts():
+    cache = ResponseCache(mode="auto", max_entries=2)
+    for i in range(3):
+        cache.put("search", (i,), {}, i)
+    with pytest.raises(ResponseNotRecordedError):
+        cache.get("search", (0,))
+    assert cache.get("search", (2,)) == 2
+
+
+def test_async_tool(tmp_path):
+    calls = []
+
+    async def search(query):
+        calls.append(query)
+        return query.upper()
+
+    cache = ResponseCache(tmp_path / "responses.sqlite", mode="auto")
+    tool = with_monkey(FailureScenario(name="calm"), response_cache=cache)(search)
+
+    async def run():
+        return [await tool("a"), await tool("a")]
+
+    assert asyncio.run(run()) == ["A", "A"]
+    assert calls == ["a"]
+
+
+def test_disabled_chaos_bypasses_the_cache():
+    search, calls = _counting_tool()
+    cache = ResponseCache(mode="replay")
+    tool = with_monkey(FailureScenario(name="calm"), response_cache=cache)(search)
+    with chaos_disabled():
+        tool("q")
+    assert calls == [("q", 10)]
+
+
+def test_pickles_by_path(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite", mode="record")
+    cache.put("search", ("q",), {}, "answer")
+    copy = pickle.loads(pickle.dumps(cache))
+    assert (copy.path, copy.mode) == (cache.path, "record")
+    assert copy.get("search", ("q",)) == "answer"
+
+
+def test_bad_arguments():
+    with pytest.raises(ValueError):
+        ResponseCache(mode="playback")
+    with pytest.raises(ValueError):
+        ResponseCache(max_entries=0)
+
+
+def search_tool(query):
+    return f"results for {query}"
+
+
+def _harness(tools, seed):
+    return tools[0]("x")
+
+
+def test_coordinator_and_matrix_share_the_cache(tmp_path):
+    path = tmp_path / "responses.sqlite"
+    with ResponseCache(path, mode="record") as cache:
+        assert ChaosCoordinator(FailureScenario(name="calm"), response_cache=cache).wrap(search_tool)("x") \
+            == "results for x"
+
+    result = run_matrix(_harness, [search_tool], [FailureScenario(name="calm")], seeds=[1, 2],
+                        executor="process", keep_output=True, response_cache=ResponseCache(path, mode="replay"))
+    assert [cell.output for cell in result] == ["results for x", "results for x"]
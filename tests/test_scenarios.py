@@ -0,0 +1,63 @@
+from tool_monkey import ToolMonkey, FailureScenario, FailureRule, VirtualClock, RateLimitError
+from tool_monkey import progressive_rate_limit, intermittent_timeout
+
+
+def _failing_calls(scenario, calls):
+    monkey = ToolMonkey(scenario, "my_tool", clock=VirtualClock())
+    return [n for n in range(1, calls + 1) if monkey.should_fail() is not None]
+
+
+def test_every_nth_rule():
+    scenario = FailureScenario(name="test", rules=[FailureRule(error_type="timeout", every=10)])
+    assert _failing_calls(scenario, 35) == [10, 20, 30]
+
+
+def test_range_rule():
+    scenario = FailureScenario(name="test", rules=[FailureRule(error_type="timeout", start=5, stop=8)])
+    assert _failing_calls(scenario, 20) == [5, 6, 7]
+
+
+def test_after_rule_never_stops():
+    scenario = FailureScenario(name="test", rules=[FailureRule(error_type="rate_limit", after=3)])
+    monkey = ToolMonkey(scenario, "my_tool")
+    for _ in range(3):
+        assert monkey.should_fail() is None
+    for _ in range(10000):
+        assert isinstance(monkey.should_fail(), RateLimitError)
+    # nothing materialized per call
+    assert monkey.schedule.index == {}
+
+
+def test_modulo_rule_combined_with_bounds():
+    scenario = FailureScenario(name="test", rules=[
+        FailureRule(error_type="timeout", modulo=4, residues=[1, 2], start=3, stop=12)])
+    assert _failing_calls(scenario, 20) == [5, 6, 9, 10]
+
+
+def test_explicit_failures_take_precedence_over_rules():
+    scenario = FailureScenario(
+        name="test",
+        failures=[{"on_call_count": 2, "error_type": "auth_failure"}],
+        rules=[FailureRule(error_type="timeout", every=2)],
+    )
+    monkey = ToolMonkey(scenario, "my_tool", clock=VirtualClock())
+    errors = [type(monkey.should_fail()).__name__ for _ in range(4)]
+    assert errors == ["NoneType", "AuthenticationError", "NoneType", "TimeoutError"]
+
+
+def test_progressive_rate_limit_keeps_failing_after_quota():
+    calls = _failing_calls(progressive_rate_limit(quota=5, retry_after=30), 100)
+    assert calls == list(range(6, 101))
+    error = ToolMonkey(progressive_rate_limit(quota=0, retry_after=30), "my_tool").should_fail()
+    assert error.retry_after == 30
+    assert error.limit_type == "per_minute"
+
+
+def test_intermittent_timeout_alternates_for_num_cycles():
+    assert _failing_calls(intermittent_timeout(num_cycles=3, seconds=2.0), 10) == [1, 3, 5]
+
+
+def test_intermittent_timeout_with_no_cycles_never_fails():
+    scenario = intermittent_timeout(num_cycles=0)
+    assert scenario.rules == []
+    assert _failing_calls(scenario, 10) == []
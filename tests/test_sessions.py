@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from tool_monkey import with_monkey, chaos_session, current_session, FailureScenario, ToolFailure, MonkeyObserver
+from tool_monkey.sessions import SessionCounter
+
+
+def _fail_on(call):
+    return FailureScenario(name="test", failures=[ToolFailure(on_call_count=call, error_type="timeout")])
+
+
+def test_chaos_session_sets_and_restores_key():
+    assert current_session() is None
+    with chaos_session("a"):
+        assert current_session() == "a"
+        with chaos_session("b"):
+            assert current_session() == "b"
+        assert current_session() == "a"
+    assert current_session() is None
+
+
+def test_per_session_schedules_are_independent():
+    """Test that one session's calls don't advance another session's schedule."""
+    @with_monkey(_fail_on(2), per_session=True)
+    def my_func():
+        return "success"
+
+    with chaos_session("a"):
+        my_func()
+    with chaos_session("b"):
+        my_func()
+    with chaos_session("a"):
+        with pytest.raises(TimeoutError):
+            my_func()
+    with chaos_session("b"):
+        with pytest.raises(TimeoutError):
+            my_func()
+
+
+def test_shared_schedule_without_per_session():
+    @with_monkey(_fail_on(2))
+    def my_func():
+        return "success"
+
+    with chaos_session("a"):
+        my_func()
+    with chaos_session("b"):
+        with pytest.raises(TimeoutError):
+            my_func()
+
+
+def test_per_session_follows_asyncio_tasks():
+    """Test that concurrent tasks each see their own session's schedule."""
+    observer = MonkeyObserver()
+
+    @with_monkey(_fail_on(2), observer=observer, per_session=True)
+    async def my_func():
+        await asyncio.sleep(0)
+        return "success"
+
+    async def session(key):
+        with chaos_session(key):
+            results = []
+            for _ in range(3):
+                try:
+                    results.append(await my_func())
+                except TimeoutError:
+                    results.append("timeout")
+            return results
+
+    async def run():
+        return await asyncio.gather(*(session(i) for i in range(10)))
+
+    for results in asyncio.run(run()):
+        assert results == ["success", "timeout", "success"]
+    assert observer.get_metrics()["failures"] == 10
+
+
+def test_session_counter_evicts_least_recently_used():
+    counter = SessionCounter(max_sessions=2)
+    for key in ["a", "b", "a", "c"]:
+        with chaos_session(key):
+            counter.increment()
+    assert len(counter) == 2
+    with chaos_session("a"):
+        assert counter.value == 2
+    with chaos_session("b"):
+        # evicted, starts again from zero
+        assert counter.value == 0
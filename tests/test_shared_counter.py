@@ -0,0 +1,103 @@
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+pytest.importorskip("fcntl")
+
+from tool_monkey import FailureScenario, ToolFailure, with_monkey, ToolMonkey  # noqa: E402
+from tool_monkey.shared_counter import FileCounter  # noqa: E402
+
+
+def test_counters_on_same_file_share_a_count(tmp_path):
+    path = tmp_path / "calls.counter"
+    with FileCounter(path) as a, FileCounter(path) as b:
+        assert a.increment() == 1
+        assert b.increment() == 2
+        assert a.increment(3) == 5
+        assert b.value == 5
+        b.reset()
+        assert a.value == 0
+
+
+def test_threads_get_distinct_numbers(tmp_path):
+    counter = FileCounter(tmp_path / "calls.counter")
+    seen = []
+
+    def work():
+        seen.extend(counter.increment() for _ in range(500))
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(seen) == list(range(1, 4001))
+
+
+def test_pickled_counter_reopens_same_file(tmp_path):
+    counter = FileCounter(tmp_path / "calls.counter")
+    counter.increment()
+    copy = pickle.loads(pickle.dumps(counter))
+    assert copy.increment() == 2
+    assert counter.value == 2
+
+
+def _call_tool(counter, calls):
+    scenario = FailureScenario(name="fleet", failures=[ToolFailure(on_call_count=3, error_type="timeout")])
+
+    @with_monkey(scenario, counter=counter)
+    def my_tool():
+        return "ok"
+
+    failures = 0
+    for _ in range(calls):
+        try:
+            my_tool()
+        except TimeoutError:
+            failures += 1
+    return failures
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_schedule_is_global_across_processes(tmp_path, start_method):
+    if start_method not in multiprocessing.get_all_start_methods():
+        pytest.skip(f"{start_method} not available")
+    counter = FileCounter(tmp_path / "calls.counter")
+    with ProcessPoolExecutor(4, mp_context=multiprocessing.get_context(start_method)) as pool:
+        failures = sum(pool.map(_call_tool, [counter] * 4, [25] * 4))
+    assert failures == 1
+    # once call 3 is behind every worker, they stop counting and pass calls straight through
+    assert 3 <= counter.value < 100
+
+
+def test_forked_child_reopens_counter(tmp_path):
+    if not hasattr(os, "fork"):
+        pytest.skip("fork not available")
+    counter = FileCounter(tmp_path / "calls.counter")
+    counter.increment()
+    pid = os.fork()
+    if pid == 0:
+        counter.increment()
+        os._exit(0 if counter._pid == os.getpid() else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert counter.value == 2
+
+
+def test_monkey_accepts_file_counter(tmp_path):
+    scenario = FailureScenario(name="once", failures=[ToolFailure(on_call_count=2, error_type="timeout")])
+    counter = FileCounter(tmp_path / "calls.counter")
+    first = ToolMonkey(scenario, "tool", counter=counter)
+    second = ToolMonkey(scenario, "tool", counter=FileCounter(tmp_path / "calls.counter"))
+    assert first.should_fail() is None
+    assert isinstance(second.should_fail(), TimeoutError)
+    assert first.call_count == 2
+
+
+def test_counter_and_per_session_are_exclusive(tmp_path):
+    with pytest.raises(ValueError):
+        with_monkey(FailureScenario(name="x"), counter=FileCounter(tmp_path / "c"), per_session=True)
@@ -0,0 +1,89 @@
+import json
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from tool_monkey import MonkeyObserver, ObserverSnapshot, VirtualClock, RateLimitError
+
+
+def _record(observer, tool, calls, fail_every=3, latency=0.01):
+    clock = observer.clock
+    for i in range(calls):
+        call_id = f"{tool}_{i}"
+        observer.start_call(call_id)
+        clock.advance(latency * (i % 7 + 1))
+        failed = i % fail_every == 0
+        observer.end_call(tool, call_id, success=not failed, error=RateLimitError("slow down") if failed else None,
+                          retry_attempt=1 if i % 5 == 0 else 0, injected=failed, scenario="load")
+
+
+def _flatten(metrics, prefix=""):
+    flat = {}
+    for key, value in metrics.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[prefix + key] = value
+    return flat
+
+
+def _observer(tool, calls, **kwargs):
+    observer = MonkeyObserver(clock=VirtualClock())
+    _record(observer, tool, calls, **kwargs)
+    return observer
+
+
+def test_snapshot_reports_same_metrics_as_observer():
+    observer = _observer("search", 50)
+    observer.record_abandoned("search")
+    assert observer.snapshot().get_metrics() == observer.get_metrics()
+    assert observer.snapshot().summary() == observer.summary()
+
+
+def test_merged_snapshots_match_one_observer_seeing_everything():
+    combined = MonkeyObserver(clock=VirtualClock())
+    _record(combined, "search", 40)
+    _record(combined, "weather", 25, fail_every=2)
+    _record(combined, "search", 10, latency=0.5)
+
+    parts = [_observer("search", 40).snapshot(), _observer("weather", 25, fail_every=2).snapshot(),
+             _observer("search", 10, latency=0.5).snapshot()]
+    merged = _flatten(ObserverSnapshot.combine(parts).get_metrics())
+    expected = _flatten(combined.get_metrics())
+    # VirtualClock still moves with real time, so latencies differ by microseconds
+    assert merged == pytest.approx(expected, rel=0.02)
+
+
+def test_merge_is_associative_and_leaves_inputs_alone():
+    a, b, c = (_observer(tool, n).snapshot() for tool, n in [("x", 5), ("y", 9), ("x", 13)])
+    before = a.get_metrics()
+    left = ObserverSnapshot.combine([ObserverSnapshot.combine([a, b]), c])
+    right = ObserverSnapshot.combine([a, ObserverSnapshot.combine([b, c])])
+    assert left.get_metrics() == right.get_metrics()
+    assert a.get_metrics() == before
+    assert ObserverSnapshot.combine([a, ObserverSnapshot()]).get_metrics() == before
+
+
+def test_empty_snapshot():
+    assert ObserverSnapshot().get_metrics() == {}
+    assert "Total Calls: 0" in ObserverSnapshot().summary()
+
+
+def test_json_and_pickle_round_trip():
+    snapshot = _observer("search", 30).snapshot()
+    assert ObserverSnapshot.from_dict(json.loads(json.dumps(snapshot.to_dict()))).get_metrics() == \
+        snapshot.get_metrics()
+    assert pickle.loads(pickle.dumps(snapshot)).get_metrics() == snapshot.get_metrics()
+
+
+def _worker(shard):
+    return _observer(f"tool_{shard % 3}", 100).snapshot()
+
+
+def test_aggregate_snapshots_from_process_pool():
+    with ProcessPoolExecutor(2) as pool:
+        total = ObserverSnapshot.combine(pool.map(_worker, range(6)))
+    metrics = total.get_metrics()
+    assert metrics["total_calls"] == 600
+    assert metrics["breakdown"]["tool_0"]["call_count"] == 200
+    assert metrics["error_types"] == {"RateLimitError": 6 * 34}
@@ -4,27 +4,130 @@ Inspired by Netflix's Chaos Monkey, Tool Monkey helps you test agent resilience
 by injecting deterministic failures at the tool boundary.
 """
 
-from tool_monkey.models import FailureScenario, ToolFailure, ToolFailureConfigDict
-from tool_monkey.monkey import ToolMonkey
-from tool_monkey.decorators import with_monkey
-from tool_monkey.observer import MonkeyObserver
-from tool_monkey.exceptions import ToolMonkeyError, RateLimitError, AuthenticationError, ContentModerationError
-from tool_monkey.config.logger import setup_default_logging, logger
-from tool_monkey.scenarios.timeouts import single_timeout, retry_exhaustion, progressive_timeout, intermittent_timeout
-from tool_monkey.scenarios.rate_limits import burst_rate_limit, progressive_rate_limit
-from tool_monkey.scenarios.auth_failures import forbidden_access, expired_token, invalid_api_key
-from tool_monkey.scenarios.content_moderation import content_policy_violation
-from tool_monkey.langchain_helpers import create_tool_with_monkey, create_agent_with_monkey
+import importlib
+
+# spelled out rather than imported from typing, which would cost more than the rest of this module
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from tool_monkey.models import FailureScenario, ToolFailure, ToolFailureConfigDict, ProbabilisticFailures, FailureRule, LatencyConfig
+    from tool_monkey.monkey import ToolMonkey
+    from tool_monkey.schedule import CompiledSchedule, register_error_type
+    from tool_monkey.decorators import with_monkey
+    from tool_monkey.batch import with_monkey_batch, BatchResult, BatchItem
+    from tool_monkey.observer import MonkeyObserver
+    from tool_monkey.snapshot import ObserverSnapshot
+    from tool_monkey.event_store import ListEventStore, ColumnarEventStore
+    from tool_monkey.exporters import JSONLExporter, ParquetExporter
+    from tool_monkey.openmetrics import render_openmetrics, serve_metrics
+    from tool_monkey.sessions import chaos_session, current_session
+    from tool_monkey.counters import LocalCounter
+    from tool_monkey.shared_counter import FileCounter
+    from tool_monkey.registry import ScenarioRegistry, load_scenarios, register_scenario, get_scenario
+    from tool_monkey.switch import chaos_enabled, set_chaos_enabled, chaos_disabled
+    from tool_monkey.clock import SystemClock, ScaledClock, VirtualClock, get_default_clock, set_default_clock, use_clock
+    from tool_monkey.exceptions import ToolMonkeyError, RateLimitError, AuthenticationError, ContentModerationError
+    from tool_monkey.config.logger import setup_default_logging, logger
+    from tool_monkey.scenarios.timeouts import single_timeout, retry_exhaustion, progressive_timeout, intermittent_timeout
+    from tool_monkey.scenarios.rate_limits import burst_rate_limit, progressive_rate_limit
+    from tool_monkey.scenarios.auth_failures import forbidden_access, expired_token, invalid_api_key
+    from tool_monkey.scenarios.content_moderation import content_policy_violation
+    from tool_monkey.coordinator import ChaosCoordinator
+    from tool_monkey.matrix import run_matrix, MatrixResult, CellResult
+    from tool_monkey.response_cache import ResponseCache, ResponseNotRecordedError
+    from tool_monkey.langchain_helpers import create_tool_with_monkey, create_agent_with_monkey
+
+# Public names are imported on first use, so `import tool_monkey` doesn't pay
+# for pydantic, the observer machinery or the scenarios until they're needed.
+_LAZY_IMPORTS = {
+    "tool_monkey.models": ["FailureScenario", "ToolFailure", "ToolFailureConfigDict", "ProbabilisticFailures",
+                           "FailureRule", "LatencyConfig"],
+    "tool_monkey.monkey": ["ToolMonkey"],
+    "tool_monkey.schedule": ["CompiledSchedule", "register_error_type"],
+    "tool_monkey.decorators": ["with_monkey"],
+    "tool_monkey.batch": ["with_monkey_batch", "BatchResult", "BatchItem"],
+    "tool_monkey.observer": ["MonkeyObserver"],
+    "tool_monkey.snapshot": ["ObserverSnapshot"],
+    "tool_monkey.event_store": ["ListEventStore", "ColumnarEventStore"],
+    "tool_monkey.exporters": ["JSONLExporter", "ParquetExporter"],
+    "tool_monkey.openmetrics": ["render_openmetrics", "serve_metrics"],
+    "tool_monkey.sessions": ["chaos_session", "current_session"],
+    "tool_monkey.counters": ["LocalCounter"],
+    "tool_monkey.shared_counter": ["FileCounter"],
+    "tool_monkey.registry": ["ScenarioRegistry", "load_scenarios", "register_scenario", "get_scenario"],
+    "tool_monkey.switch": ["chaos_enabled", "set_chaos_enabled", "chaos_disabled"],
+    "tool_monkey.clock": ["SystemClock", "ScaledClock", "VirtualClock", "get_default_clock", "set_default_clock",
+                          "use_clock"],
+    "tool_monkey.exceptions": ["ToolMonkeyError", "RateLimitError", "AuthenticationError", "ContentModerationError"],
+    "tool_monkey.config.logger": ["setup_default_logging", "logger"],
+    "tool_monkey.scenarios.timeouts": ["single_timeout", "retry_exhaustion", "progressive_timeout",
+                                       "intermittent_timeout"],
+    "tool_monkey.scenarios.rate_limits": ["burst_rate_limit", "progressive_rate_limit"],
+    "tool_monkey.scenarios.auth_failures": ["forbidden_access", "expired_token", "invalid_api_key"],
+    "tool_monkey.scenarios.content_moderation": ["content_policy_violation"],
+    "tool_monkey.coordinator": ["ChaosCoordinator"],
+    "tool_monkey.matrix": ["run_matrix", "MatrixResult", "CellResult"],
+    "tool_monkey.response_cache": ["ResponseCache", "ResponseNotRecordedError"],
+    "tool_monkey.langchain_helpers": ["create_tool_with_monkey", "create_agent_with_monkey"],
+}
+_MODULE_FOR = {name: module for module, names in _LAZY_IMPORTS.items() for name in names}
+
+
+def __getattr__(name: str):
+    module = _MODULE_FOR.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    # cache it, so the next lookup doesn't come back here
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULE_FOR))
+
 
 __version__ = "0.1.0"
 
 __all__ = [
     "FailureScenario",
     "ToolFailure",
+    "ProbabilisticFailures",
+    "FailureRule",
+    "LatencyConfig",
     "ToolMonkey",
+    "CompiledSchedule",
+    "register_error_type",
     "MonkeyObserver",
+    "ObserverSnapshot",
+    "ListEventStore",
+    "ColumnarEventStore",
+    "JSONLExporter",
+    "ParquetExporter",
+    "render_openmetrics",
+    "serve_metrics",
     "ToolFailureConfigDict",
     "with_monkey",
+    "with_monkey_batch",
+    "BatchResult",
+    "BatchItem",
+    "SystemClock",
+    "ScaledClock",
+    "VirtualClock",
+    "get_default_clock",
+    "set_default_clock",
+    "use_clock",
+    "chaos_session",
+    "chaos_enabled",
+    "set_chaos_enabled",
+    "chaos_disabled",
+    "current_session",
+    "LocalCounter",
+    "FileCounter",
+    "ScenarioRegistry",
+    "load_scenarios",
+    "register_scenario",
+    "get_scenario",
     "ToolMonkeyError",
     "RateLimitError",
     "AuthenticationError",
@@ -41,6 +144,12 @@ __all__ = [
     "expired_token",
     "content_policy_violation",
     "logger",
+    "ChaosCoordinator",
+    "run_matrix",
+    "MatrixResult",
+    "CellResult",
+    "ResponseCache",
+    "ResponseNotRecordedError",
     "create_tool_with_monkey",
     "create_agent_with_monkey",
 ]
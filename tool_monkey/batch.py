@@ -0,0 +1,194 @@
+"""
+Chaos for tools that take a batch of inputs.
+
+with_monkey sees a batch tool as one call, so it can only fail the whole
+batch. with_monkey_batch counts every item as a call of its own: the
+schedule is evaluated for the whole batch at once, items scheduled to fail
+are held back, the real tool runs on the rest, and the caller gets one
+result per item:
+
+    every_third = FailureScenario(name="every_third", rules=[FailureRule(error_type="timeout", every=3)])
+
+    @with_monkey_batch(every_third)
+    def embed(texts: list) -> list:
+        ...
+
+    result = embed(["a", "b", "c", "d"])
+    result.values           # ["emb-a", "emb-b", None, "emb-d"]
+    result.failed_indices   # [2]
+    retry = embed([texts[i] for i in result.failed_indices])
+
+The wrapped function must take the batch as its first argument and return
+one result per item, in order. Items run together, so the batch waits once
+for the longest simulated delay or injected latency among its items rather
+than for their sum. Deadline-mode timeouts can't cut off part of a batch
+and simply fail their items.
+"""
+
+import inspect
+import itertools
+from functools import wraps
+from typing import Any, List, Optional, Sequence
+
+import tool_monkey.switch as switch
+from tool_monkey.clock import Clock
+from tool_monkey.config.logger import logger
+from tool_monkey.counters import LocalCounter
+from tool_monkey.models import FailureScenario
+from tool_monkey.monkey import ToolMonkey
+from tool_monkey.observer import MonkeyObserver
+
+
+class BatchItem:
+    """Outcome for one item of a batch: its value, or the exception it failed with."""
+
+    __slots__ = ("index", "call_number", "value", "error", "injected")
+
+    def __init__(self, index: int, call_number: Optional[int], value: Any = None,
+                 error: Optional[Exception] = None, injected: bool = False):
+        self.index = index
+        self.call_number = call_number
+        self.value = value
+        self.error = error
+        # True when the failure came from Tool Monkey rather than the tool
+        self.injected = injected
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        outcome = f"value={self.value!r}" if self.ok else f"error={self.error!r}"
+        return f"BatchItem(index={self.index}, call_number={self.call_number}, {outcome})"
+
+
+class BatchResult(list):
+    """A list of BatchItems, one per input, in input order."""
+
+    @property
+    def values(self) -> List[Any]:
+        """Per-item values, None where the item failed."""
+        return [item.value for item in self]
+
+    @property
+    def errors(self) -> List[Optional[Exception]]:
+        return [item.error for item in self]
+
+    @property
+    def failed_indices(self) -> List[int]:
+        return [item.index for item in self if item.error is not None]
+
+    @property
+    def all_ok(self) -> bool:
+        return all(item.error is None for item in self)
+
+
+def with_monkey_batch(failure_scenario: FailureScenario, observer: Optional[MonkeyObserver] = None,
+                      clock: Optional[Clock] = None):
+    """
+    Wrap a batch tool so each item of each batch is a separate call in `failure_scenario`.
+
+    Args:
+        failure_scenario: Which calls (items) fail and how
+        observer: Optional MonkeyObserver; every item is recorded as a call
+        clock: Clock used for simulated delays (defaults to the observer's, then the global default)
+
+    The wrapped tool returns a BatchResult instead of a plain list.
+    """
+
+    def decorator(func):
+        tool_name = func.__name__
+        monkey = ToolMonkey(failure_scenario, tool_name,
+                            clock=clock or (observer._clock if observer else None), counter=LocalCounter())
+        batch_ids = itertools.count()
+
+        def plan(items: Sequence):
+            """Decide every item's fate up front: (first call number, per-item errors, seconds to wait)."""
+            first, failures = monkey.next_failures(len(items))
+            errors: List[Optional[Exception]] = []
+            wait = 0.0
+            for fail in failures:
+                # latency entries and scenario-wide latency delay an item without failing it
+                wait = max(wait, monkey.latency_for(fail), fail.delay if fail else 0)
+                errors.append(fail.make_error() if fail else None)
+            return first, errors, wait
+
+        def begin(items: Sequence):
+            ids = []
+            if observer:
+                batch_id = next(batch_ids)
+                ids = [f"{tool_name}_batch{batch_id}_{i}" for i in range(len(items))]
+                now = monkey.clock.now()
+                for call_id in ids:
+                    observer.start_call(call_id, now=now)
+            return ids
+
+        def finish(items: Sequence, first: int, errors, outputs, real_error, ids) -> BatchResult:
+            result = BatchResult()
+            passing = iter(outputs) if outputs is not None else None
+            now = monkey.clock.now()
+            for index, error in enumerate(errors):
+                if error is not None:
+                    item = BatchItem(index, first + index, error=error, injected=True)
+                elif real_error is not None:
+                    item = BatchItem(index, first + index, error=real_error)
+                else:
+                    item = BatchItem(index, first + index, value=next(passing))
+                result.append(item)
+                if observer:
+                    observer.end_call(tool_name, ids[index], success=item.ok, error=item.error,
+                                      injected=item.injected, scenario=failure_scenario.name, now=now)
+            failed = len(result.failed_indices)
+            if failed:
+                logger.info("Batch of %d for %s: %d items failed", len(items), tool_name, failed)
+            return result
+
+        def passing_items(items: Sequence, errors) -> list:
+            return [item for item, error in zip(items, errors) if error is None]
+
+        def check_outputs(outputs, expected: int):
+            if len(outputs) != expected:
+                raise ValueError(f"{tool_name} returned {len(outputs)} results for {expected} items")
+
+        def passthrough(outputs) -> BatchResult:
+            return BatchResult(BatchItem(index, None, value=value) for index, value in enumerate(outputs))
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(items, *args, **kwargs):
+                if not switch._enabled:
+                    return passthrough(await func(items, *args, **kwargs))
+                ids = begin(items)
+                first, errors, wait = plan(items)
+                if wait:
+                    await monkey.clock.sleep_async(wait)
+                todo = passing_items(items, errors)
+                outputs, real_error = None, None
+                if todo:
+                    try:
+                        outputs = await func(todo, *args, **kwargs)
+                        check_outputs(outputs, len(todo))
+                    except Exception as e:
+                        real_error = e
+                return finish(items, first, errors, outputs, real_error, ids)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(items, *args, **kwargs):
+            if not switch._enabled:
+                return passthrough(func(items, *args, **kwargs))
+            ids = begin(items)
+            first, errors, wait = plan(items)
+            if wait:
+                monkey.clock.sleep(wait)
+            todo = passing_items(items, errors)
+            outputs, real_error = None, None
+            if todo:
+                try:
+                    outputs = func(todo, *args, **kwargs)
+                    check_outputs(outputs, len(todo))
+                except Exception as e:
+                    real_error = e
+            return finish(items, first, errors, outputs, real_error, ids)
+        return wrapper
+    return decorator
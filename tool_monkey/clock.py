@@ -0,0 +1,109 @@
+"""Clocks used by Tool Monkey to measure latency and simulate delays.
+
+Everything that reads or spends time (ToolMonkey, MonkeyObserver, with_monkey)
+goes through a clock, so a test suite can swap real sleeps for simulated ones
+without touching scenario definitions.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Protocol
+
+
+class Clock(Protocol):
+    def now(self) -> float:
+        """Current time in seconds since the epoch."""
+        ...
+
+    def sleep(self, seconds: float) -> None:
+        ...
+
+    async def sleep_async(self, seconds: float) -> None:
+        ...
+
+
+class SystemClock:
+    """Real wall clock: simulated delays really block for their full duration."""
+
+    def now(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+    async def sleep_async(self, seconds: float) -> None:
+        # asyncio is imported where it's used: it's already loaded in any running event loop,
+        # and sync-only users shouldn't pay for it at import time
+        import asyncio
+        await asyncio.sleep(seconds)
+
+
+class ScaledClock:
+    """
+    Compresses simulated delays by a constant factor.
+
+    A sleep of N seconds blocks for N * factor seconds of real time, and the
+    rest is added to the clock's offset, so now() still moves forward by the
+    full N seconds and observer latencies report the simulated duration.
+
+    The offset is shared by every caller of the clock: a thread reading now()
+    while another thread sleeps will see the jump too.
+    """
+
+    def __init__(self, factor: float):
+        if factor < 0:
+            raise ValueError(f"Clock factor must be >= 0, got {factor}")
+        self.factor = factor
+        self._offset = 0.0
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return time.time() + self._offset
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward without blocking."""
+        with self._lock:
+            self._offset += seconds
+
+    def sleep(self, seconds: float) -> None:
+        self.advance(seconds * (1 - self.factor))
+        if self.factor:
+            time.sleep(seconds * self.factor)
+
+    async def sleep_async(self, seconds: float) -> None:
+        import asyncio
+        self.advance(seconds * (1 - self.factor))
+        # always yield so a virtual sleep is still a scheduling point
+        await asyncio.sleep(seconds * self.factor)
+
+
+class VirtualClock(ScaledClock):
+    """Simulated delays advance the clock instantly and never block."""
+
+    def __init__(self):
+        super().__init__(factor=0)
+
+
+_default_clock: Clock = SystemClock()
+
+
+def get_default_clock() -> Clock:
+    return _default_clock
+
+
+def set_default_clock(clock: Clock) -> Clock:
+    """Set the clock used by components created without one. Returns the previous clock."""
+    global _default_clock
+    previous, _default_clock = _default_clock, clock
+    return previous
+
+
+@contextmanager
+def use_clock(clock: Clock):
+    """Temporarily make `clock` the default, e.g. for the duration of a test."""
+    previous = set_default_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_default_clock(previous)
@@ -0,0 +1,105 @@
+"""
+One failure schedule for a whole agent.
+
+with_monkey gives each tool its own call count, so "fail on call 5" means
+each tool's 5th call. A ChaosCoordinator shares one count (and one rate
+limiter) between every tool it wraps, so call 5 is the agent's 5th tool
+call, whichever tool that is:
+
+    coordinator = ChaosCoordinator(expired_token(on_call=5), observer=observer,
+                                   tools={"search", "weather"},
+                                   overrides={"image_gen": burst_rate_limit()})
+    search = coordinator.wrap(search)
+
+`tools` limits the shared scenario to some tools: only their calls are
+counted and failed, and other tools are left unwrapped. `overrides` gives
+individual tools a scenario of their own, with its own count, taking them
+out of the shared sequence.
+
+Each tool still gets its own ToolMonkey (for its latency sampling), but
+they all point at the same counter, compiled schedule and rate limiter, so
+a wrapped call costs the same as with with_monkey.
+"""
+
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+from tool_monkey.clock import Clock
+from tool_monkey.counters import Counter, LocalCounter
+from tool_monkey.decorators import with_monkey
+from tool_monkey.models import FailureScenario
+from tool_monkey.monkey import ToolMonkey
+from tool_monkey.observer import MonkeyObserver
+from tool_monkey.rate_limiter import RateLimiter, make_rate_limiter
+from tool_monkey.response_cache import ResponseCache
+from tool_monkey.schedule import CompiledSchedule
+
+
+class ChaosCoordinator:
+    """
+    Shares one call sequence, schedule and rate limiter between an agent's tools.
+
+    Args:
+        scenario: Failure scenario for the agent as a whole
+        observer: Optional MonkeyObserver every wrapped tool reports to
+        clock: Clock used for simulated delays (defaults to the observer's, then the global default)
+        tools: Names of the tools the shared scenario applies to (default: all of them)
+        overrides: Tool name -> scenario that tool follows instead, on its own count
+        counter: Counter for the shared sequence, e.g. a FileCounter to share it between processes
+        response_cache: ResponseCache every wrapped tool records into or replays from
+    """
+
+    def __init__(self, scenario: FailureScenario, observer: Optional[MonkeyObserver] = None,
+                 clock: Optional[Clock] = None, tools: Optional[Iterable[str]] = None,
+                 overrides: Optional[Dict[str, FailureScenario]] = None, counter: Optional[Counter] = None,
+                 response_cache: Optional[ResponseCache] = None):
+        self.scenario = scenario
+        self.observer = observer
+        self.clock = clock or (observer._clock if observer else None)
+        self.tools = frozenset(tools) if tools is not None else None
+        self.overrides = dict(overrides or {})
+        self.counter = counter if counter is not None else LocalCounter()
+        self.response_cache = response_cache
+        self.schedule = CompiledSchedule(scenario)
+        self.rate_limiter: Optional[RateLimiter] = None
+        if scenario.rate_limiter is not None:
+            self.rate_limiter = make_rate_limiter(scenario.rate_limiter)
+        self._monkeys: Dict[str, ToolMonkey] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def call_count(self) -> int:
+        """Calls made so far in the shared sequence."""
+        return self.counter.value
+
+    def applies_to(self, tool_name: str) -> bool:
+        """Whether calls to `tool_name` are chaos-tested at all."""
+        return tool_name in self.overrides or self.tools is None or tool_name in self.tools
+
+    def monkey_for(self, tool_name: str) -> Optional[ToolMonkey]:
+        """The ToolMonkey for `tool_name`, or None if the coordinator leaves that tool alone."""
+        monkey = self._monkeys.get(tool_name)
+        if monkey is not None or not self.applies_to(tool_name):
+            return monkey
+        with self._lock:
+            monkey = self._monkeys.get(tool_name)
+            if monkey is None:
+                override = self.overrides.get(tool_name)
+                if override is not None:
+                    monkey = ToolMonkey(override, tool_name, clock=self.clock)
+                else:
+                    monkey = ToolMonkey(self.scenario, tool_name, clock=self.clock, counter=self.counter,
+                                        schedule=self.schedule, rate_limiter=self.rate_limiter)
+                self._monkeys[tool_name] = monkey
+        return monkey
+
+    def wrap(self, func: Callable, tool_name: Optional[str] = None) -> Callable:
+        """
+        with_monkey for `func` under this coordinator. Tools the coordinator
+        doesn't apply to are returned unwrapped.
+        """
+        monkey = self.monkey_for(tool_name or func.__name__)
+        if monkey is None:
+            return func
+        return with_monkey(monkey.failure_scenario, observer=self.observer, clock=self.clock, tool_monkey=monkey,
+                           response_cache=self.response_cache)(func)
@@ -0,0 +1,45 @@
+"""Call counters that decide which call a failure schedule is on."""
+
+import threading
+from typing import Protocol
+
+
+class Counter(Protocol):
+    @property
+    def value(self) -> int:
+        ...
+
+    def increment(self, n: int = 1) -> int:
+        """Add `n` and return the new value."""
+        ...
+
+    def reset(self) -> None:
+        ...
+
+
+class LocalCounter:
+    """
+    In-process call counter that is safe to share between threads.
+
+    increment() is a single read-modify-write under a lock, so concurrent
+    callers always get distinct, gap-free call numbers. The lock is only held
+    for an integer add, which keeps it uncontended in practice.
+    """
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def increment(self, n: int = 1) -> int:
+        """Add `n` and return the new value."""
+        with self._lock:
+            self._value += n
+            return self._value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._value = 0
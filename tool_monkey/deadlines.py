@@ -0,0 +1,65 @@
+"""Run real tool calls under a deadline and abandon them when it passes."""
+
+import threading
+from typing import Any, Callable, Optional
+
+from tool_monkey.config.logger import logger
+
+# Called with the worker thread left running (sync tools) or None (cancelled async tools)
+AbandonCallback = Callable[[Optional[threading.Thread]], None]
+
+
+def call_with_deadline(func: Callable, args: tuple, kwargs: dict, seconds: float,
+                       timeout_error: Exception, on_abandon: AbandonCallback) -> Any:
+    """
+    Run a sync tool in a worker thread and wait at most `seconds` for it.
+
+    Python threads can't be killed, so a tool that misses the deadline keeps
+    running in the background; its eventual result is discarded. The thread is
+    daemonic so it never blocks interpreter shutdown.
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = func(*args, **kwargs)
+        except BaseException as e:
+            outcome["error"] = e
+        if worker.abandoned:
+            logger.debug("Abandoned call to %s finished after its deadline", func.__name__)
+
+    worker = threading.Thread(
+        target=target, name=f"tool-monkey-{func.__name__}", daemon=True)
+    worker.abandoned = False
+    worker.start()
+    worker.join(seconds)
+    if worker.is_alive():
+        worker.abandoned = True
+        on_abandon(worker)
+        raise timeout_error
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+async def call_with_deadline_async(func: Callable, args: tuple, kwargs: dict, seconds: float,
+                                   timeout_error: Exception, on_abandon: AbandonCallback) -> Any:
+    """
+    Await an async tool for at most `seconds`, cancelling it when the deadline passes.
+
+    The deadline is judged by whether the task finished, not by catching
+    TimeoutError, so a TimeoutError the tool raises itself reaches the caller
+    unchanged (since Python 3.11 asyncio.TimeoutError is the builtin).
+    """
+    import asyncio
+    task = asyncio.ensure_future(func(*args, **kwargs))
+    try:
+        done, _ = await asyncio.wait({task}, timeout=seconds)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    if not done:
+        on_abandon(None)
+        task.cancel()
+        raise timeout_error
+    return task.result()
@@ -1,51 +1,229 @@
-import time
+import inspect
+import itertools
 from functools import wraps
-from typing import Optional
+from typing import TYPE_CHECKING, Literal, Optional, Union
 from tool_monkey.models import FailureScenario
 from tool_monkey.monkey import ToolMonkey
+from tool_monkey.schedule import CompiledSchedule
+from tool_monkey.registry import get_default_registry
 from tool_monkey.observer import MonkeyObserver
 from tool_monkey.config.logger import logger
+from tool_monkey.clock import Clock
+from tool_monkey.counters import Counter, LocalCounter
+from tool_monkey.sessions import SessionCounter
+from tool_monkey.rate_limiter import SessionRateLimiter
+from tool_monkey.deadlines import call_with_deadline, call_with_deadline_async
+import tool_monkey.switch as switch
 
+if TYPE_CHECKING:
+    from tool_monkey.response_cache import ResponseCache
 
-def with_monkey(failure_scenario: FailureScenario, observer: Optional[MonkeyObserver] = None):
+
+def with_monkey(failure_scenario: Union[FailureScenario, str], observer: Optional[MonkeyObserver] = None, clock: Optional[Clock] = None,
+                per_session: bool = False, max_sessions: int = 1024,
+                record_passthrough: Literal["full", "sampled", "off"] = "full", sample_every: int = 100,
+                schedule: Optional[CompiledSchedule] = None, counter: Optional[Counter] = None,
+                tool_monkey: Optional[ToolMonkey] = None, response_cache: Optional["ResponseCache"] = None):
+    """
+    Wrap a tool so it fails according to `failure_scenario`.
+
+    Args:
+        failure_scenario: Which calls fail and how, or the name of a scenario in the default
+            registry (see tool_monkey.registry)
+        observer: Optional MonkeyObserver for tracking metrics
+        clock: Clock used for simulated delays (defaults to the observer's, then the global default)
+        per_session: Keep call counts per chaos session (see tool_monkey.sessions.chaos_session)
+            instead of one count shared by every caller in the process
+        max_sessions: With per_session, how many sessions to remember before evicting the least recently used
+        record_passthrough: How the observer records calls made after a finite scenario has run out
+            (they skip the schedule entirely): "full" records every call, "sampled" one call in
+            `sample_every`, "off" none
+        sample_every: Sampling interval for record_passthrough="sampled"
+        schedule: Already compiled schedule for failure_scenario, to skip compiling it again
+        counter: Call counter driving the schedule, e.g. a FileCounter shared by several worker
+            processes (see tool_monkey.shared_counter). Can't be combined with per_session
+        tool_monkey: Use this ToolMonkey instead of building one, e.g. one handed out by a
+            ChaosCoordinator; schedule and counter then come from it
+        response_cache: Record the tool's real responses into, or replay them from, this
+            ResponseCache (see tool_monkey.response_cache). Injected failures still happen first
+
+    With chaos turned off process-wide (see tool_monkey.switch), the wrapped
+    tool is called directly, bypassing response_cache, and nothing is recorded.
+
+    The wrapped tool exposes its ToolMonkey as `.monkey` and the scenario's
+    time-based rate limiter (or None) as `.rate_limiter`, e.g. to read
+    `.rate_limiter.stats()` after a load test. With per_session, each session
+    gets its own quota and stats() reports the current session's.
+    """
+    if isinstance(failure_scenario, str):
+        registry = get_default_registry()
+        schedule = registry.schedule(failure_scenario)
+        failure_scenario = registry.get(failure_scenario)
+    if tool_monkey is not None and per_session:
+        raise ValueError("Pass either tool_monkey or per_session=True, not both")
+    if counter is not None and per_session:
+        raise ValueError("Pass either counter or per_session=True, not both")
+    if record_passthrough not in ("full", "sampled", "off"):
+        raise ValueError(f"record_passthrough must be 'full', 'sampled' or 'off', got {record_passthrough!r}")
+    if sample_every < 1:
+        raise ValueError(f"sample_every must be >= 1, got {sample_every}")
 
     def decorator(func):
-        tool_name = func.__name__
-        monkey = ToolMonkey(failure_scenario, tool_name)
-        call_count = {"count": 0}
+        tool_name = tool_monkey.tool_name if tool_monkey is not None else func.__name__
+        # what a call that gets through runs: the real tool, or its recorded responses
+        call = response_cache.wrap(func, tool_name) if response_cache is not None else func
+        new_counter = (lambda: SessionCounter(max_sessions)) if per_session else LocalCounter
+        # per-session quotas too, or one session's calls would rate-limit the others
+        rate_limiter = None
+        if per_session and failure_scenario.rate_limiter is not None:
+            rate_limiter = SessionRateLimiter(failure_scenario.rate_limiter, max_sessions)
+        # share the observer's clock so simulated delays show up in its latencies
+        monkey = tool_monkey if tool_monkey is not None else ToolMonkey(
+            failure_scenario, tool_name,
+            clock=clock or (observer._clock if observer else None),
+            counter=counter if counter is not None else new_counter(),
+            schedule=schedule, rate_limiter=rate_limiter)
+        # consecutive calls since the last success, reported as retry_attempt
+        attempts = new_counter()
+        call_ids = itertools.count()
+        # a finite scenario that has run out switches the wrapper to passthrough; per-session
+        # counts never run out for sessions that haven't started yet
+        exhausted = False
+        can_exhaust = not per_session
+        passthrough_calls = itertools.count()
 
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            tool_call_id = f"{tool_name}_{time.time()}"
+        def check_exhausted():
+            nonlocal exhausted
+            if can_exhaust and monkey.exhausted:
+                logger.info("Scenario %s exhausted for %s; passing calls through", failure_scenario.name, tool_name)
+                exhausted = True
+
+        def records_passthrough():
+            if observer is None or record_passthrough == "off":
+                return False
+            return record_passthrough == "full" or not next(passthrough_calls) % sample_every
+
+        def begin_call(args, kwargs):
+            # the sequence number keeps ids unique when calls overlap (threads / event loop)
+            tool_call_id = f"{tool_name}_{monkey.clock.now()}_{next(call_ids)}"
             # retry_attempt = kwargs.pop("_retry_attempt", 0)
-            retry_attempt = call_count["count"]
-            logger.debug(
-                f"Tool {tool_name} called with args: {args}, kwargs: {kwargs}, attempt: {retry_attempt}")
-            call_count["count"] += 1
+            retry_attempt = attempts.increment() - 1
+            logger.debug("Tool %s called with args: %s, kwargs: %s, attempt: %s",
+                         tool_name, args, kwargs, retry_attempt)
             if observer:
-                observer.start_call(tool_call_id)
-            try:
-                error = monkey.should_fail()
-                if error:
-                    raise error  # Just raise, let except handle logging
+                # time calls on the monkey's clock, which may not be the observer's
+                observer.start_call(tool_call_id, now=monkey.clock.now())
+            return tool_call_id, retry_attempt
 
-                result = func(*args, **kwargs)
+        def on_abandon(thread):
+            logger.warning("Abandoned call to %s at its deadline", tool_name)
+            if observer:
+                observer.record_abandoned(tool_name, thread)
 
-                if observer:
-                    logger.info(f"Ending call for {tool_name} on success")
-                    observer.end_call(
-                        tool_name, tool_call_id, success=True, retry_attempt=retry_attempt)
-                call_count["count"] = 0
+        def end_success(tool_call_id, retry_attempt, latency):
+            if observer:
+                logger.info("Ending call for %s on success", tool_name)
+                observer.end_call(
+                    tool_name, tool_call_id, success=True, retry_attempt=retry_attempt, scenario=failure_scenario.name,
+                    injected_latency_ms=latency * 1000, now=monkey.clock.now())
+            attempts.reset()
+
+        def end_failure(tool_call_id, retry_attempt, e, injected):
+            # Log ALL failures (chaos + real) here
+            if observer:
+                logger.error("Ending call for %s after exception: %s (%s)",
+                             tool_name, e, type(e).__name__)
+                observer.end_call(
+                    tool_name, tool_call_id, success=False, error=e, retry_attempt=retry_attempt, injected=injected,
+                    scenario=failure_scenario.name, now=monkey.clock.now())
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not switch._enabled:
+                    return await func(*args, **kwargs)
+                if exhausted and not records_passthrough():
+                    return await call(*args, **kwargs)
+                if exhausted:
+                    tool_call_id, retry_attempt = begin_call(args, kwargs)
+                    try:
+                        result = await call(*args, **kwargs)
+                    except Exception as e:
+                        end_failure(tool_call_id, retry_attempt, e, injected=False)
+                        raise
+                    end_success(tool_call_id, retry_attempt, 0)
+                    return result
+                tool_call_id, retry_attempt = begin_call(args, kwargs)
+                error = None
+                try:
+                    fail = monkey.next_failure()
+                    latency = monkey.latency_for(fail)
+                    if latency:
+                        await monkey.clock.sleep_async(latency)
+                    deadline = monkey.deadline_for(fail)
+                    if deadline is not None:
+                        error = monkey.build_error(fail)
+                        result = await call_with_deadline_async(
+                            call, args, kwargs, deadline, error, on_abandon)
+                    else:
+                        error = await monkey.unleash_async(fail)
+                        if error:
+                            raise error
+                        result = await call(*args, **kwargs)
+                    end_success(tool_call_id, retry_attempt, latency)
+                    return result
+
+                except Exception as e:
+                    end_failure(tool_call_id, retry_attempt, e, injected=e is error)
+                    raise
+                finally:
+                    check_exhausted()
+            async_wrapper.monkey = monkey
+            async_wrapper.rate_limiter = monkey.rate_limiter
+            return async_wrapper
 
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # read the flag directly: this check is the whole cost of a disabled wrapper
+            if not switch._enabled:
+                return func(*args, **kwargs)
+            if exhausted and not records_passthrough():
+                return call(*args, **kwargs)
+            if exhausted:
+                tool_call_id, retry_attempt = begin_call(args, kwargs)
+                try:
+                    result = call(*args, **kwargs)
+                except Exception as e:
+                    end_failure(tool_call_id, retry_attempt, e, injected=False)
+                    raise
+                end_success(tool_call_id, retry_attempt, 0)
+                return result
+            tool_call_id, retry_attempt = begin_call(args, kwargs)
+            error = None
+            try:
+                fail = monkey.next_failure()
+                latency = monkey.latency_for(fail)
+                if latency:
+                    monkey.clock.sleep(latency)
+                deadline = monkey.deadline_for(fail)
+                if deadline is not None:
+                    error = monkey.build_error(fail)
+                    result = call_with_deadline(
+                        call, args, kwargs, deadline, error, on_abandon)
+                else:
+                    error = monkey.unleash(fail)
+                    if error:
+                        raise error  # Just raise, let except handle logging
+                    result = call(*args, **kwargs)
+                end_success(tool_call_id, retry_attempt, latency)
                 return result
 
             except Exception as e:
-                # Log ALL failures (chaos + real) here
-                if observer:
-                    logger.error("Ending call for %s after exception: %s (%s)",
-                                 tool_name, e, type(e).__name__)
-                    observer.end_call(
-                        tool_name, tool_call_id, success=False, error=e, retry_attempt=retry_attempt)
+                end_failure(tool_call_id, retry_attempt, e, injected=e is error)
                 raise
+            finally:
+                check_exhausted()
+        wrapper.monkey = monkey
+        wrapper.rate_limiter = monkey.rate_limiter
         return wrapper
     return decorator
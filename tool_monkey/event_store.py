@@ -0,0 +1,212 @@
+"""
+Storage backends for the events a MonkeyObserver keeps.
+
+ListEventStore keeps one ToolCallEvent per call and is what
+`MonkeyObserver(keep_events=True)` uses. ColumnarEventStore keeps the same
+fields in typed arrays instead, which is far smaller and cheaper per call for
+long soak runs; ToolCallEvent objects are only built when you index into it.
+"""
+
+import threading
+from array import array
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Protocol
+
+from tool_monkey.models import ToolCallEvent
+
+
+class EventStore(Protocol):
+    def record(self, tool_name: str, timestamp: float, success: bool, latency_ms: float,
+               retry_attempt: int = 0, error: Optional[Exception] = None) -> None:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+    def __getitem__(self, index):
+        ...
+
+    def __iter__(self) -> Iterator[ToolCallEvent]:
+        ...
+
+
+class ListEventStore(list):
+    """Plain list of ToolCallEvent objects."""
+
+    def record(self, tool_name: str, timestamp: float, success: bool, latency_ms: float,
+               retry_attempt: int = 0, error: Optional[Exception] = None) -> None:
+        self.append(
+            ToolCallEvent(
+                tool_name=tool_name,
+                timestamp=datetime.fromtimestamp(timestamp),
+                success=success,
+                latency_ms=latency_ms,
+                error=str(error) if error else None,
+                retry_attempt=retry_attempt
+            )
+        )
+
+
+class _Chunk:
+    """Fixed-size block of preallocated columns; never resized, so buffer views stay valid."""
+
+    __slots__ = ("size", "tool_ids", "timestamps_ns", "success", "latency_ms", "retry_attempts", "error_codes",
+                 "message_ids")
+
+    def __init__(self, capacity: int):
+        self.size = 0
+        self.tool_ids = array("I", bytes(4 * capacity))
+        self.timestamps_ns = array("q", bytes(8 * capacity))
+        self.success = array("B", bytes(capacity))
+        self.latency_ms = array("d", bytes(8 * capacity))
+        self.retry_attempts = array("I", bytes(4 * capacity))
+        self.error_codes = array("I", bytes(4 * capacity))
+        self.message_ids = array("I", bytes(4 * capacity))
+
+
+class ColumnarEventStore:
+    """
+    Events stored column by column in typed arrays.
+
+    Tool names and error types are interned: the columns hold small integer
+    ids into `tool_names` and `error_types` (error code 0 means no error).
+    Error messages go in a separate table, `messages`, that keeps only the
+    first `max_messages` distinct ones. Messages often embed per-call values
+    (a rate limit's retry_after, say), and interning every variant would
+    grow the store with nearly every event. Later messages share the
+    overflow id 0, and their events report just the error type. Storage
+    grows one preallocated chunk of `chunk_size` events at a time.
+
+    Args:
+        chunk_size: Number of events per preallocated chunk
+        max_messages: Distinct error messages to keep
+    """
+
+    COLUMNS = ("tool_ids", "timestamps_ns", "success", "latency_ms", "retry_attempts", "error_codes", "message_ids")
+    _NUMPY_DTYPES = {"tool_ids": "uint32", "timestamps_ns": "int64", "success": "bool",
+                     "latency_ms": "float64", "retry_attempts": "uint32", "error_codes": "uint32",
+                     "message_ids": "uint32"}
+
+    def __init__(self, chunk_size: int = 65536, max_messages: int = 1024):
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+        if max_messages < 0:
+            raise ValueError(f"max_messages must be >= 0, got {max_messages}")
+        self.chunk_size = chunk_size
+        self.max_messages = max_messages
+        self.tool_names: List[str] = []
+        self._tool_ids: Dict[str, int] = {}
+        # error_types[code] is the error's type name; code 0 is "no error"
+        self.error_types: List[Optional[str]] = [None]
+        self._error_codes: Dict[str, int] = {}
+        # messages[id] is an error message; id 0 is "not kept" (or no error)
+        self.messages: List[Optional[str]] = [None]
+        self._message_ids: Dict[str, int] = {}
+        self._chunks: List[_Chunk] = []
+        self._len = 0
+        self._lock = threading.Lock()
+
+    def _intern_tool(self, tool_name: str) -> int:
+        tool_id = self._tool_ids.get(tool_name)
+        if tool_id is None:
+            tool_id = self._tool_ids[tool_name] = len(self.tool_names)
+            self.tool_names.append(tool_name)
+        return tool_id
+
+    def _intern_error(self, error: Optional[Exception]) -> int:
+        if error is None:
+            return 0
+        name = type(error).__name__
+        code = self._error_codes.get(name)
+        if code is None:
+            code = self._error_codes[name] = len(self.error_types)
+            self.error_types.append(name)
+        return code
+
+    def _intern_message(self, error: Optional[Exception]) -> int:
+        if error is None:
+            return 0
+        message = str(error)
+        message_id = self._message_ids.get(message)
+        if message_id is None:
+            if len(self.messages) > self.max_messages:
+                return 0
+            message_id = self._message_ids[message] = len(self.messages)
+            self.messages.append(message)
+        return message_id
+
+    def record(self, tool_name: str, timestamp: float, success: bool, latency_ms: float,
+               retry_attempt: int = 0, error: Optional[Exception] = None) -> None:
+        with self._lock:
+            if not self._chunks or self._chunks[-1].size == self.chunk_size:
+                self._chunks.append(_Chunk(self.chunk_size))
+            chunk = self._chunks[-1]
+            i = chunk.size
+            chunk.tool_ids[i] = self._intern_tool(tool_name)
+            chunk.timestamps_ns[i] = int(timestamp * 1_000_000_000)
+            chunk.success[i] = success
+            chunk.latency_ms[i] = latency_ms
+            chunk.retry_attempts[i] = retry_attempt
+            chunk.error_codes[i] = self._intern_error(error)
+            chunk.message_ids[i] = self._intern_message(error)
+            chunk.size += 1
+            self._len += 1
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _event(self, index: int) -> ToolCallEvent:
+        chunk = self._chunks[index // self.chunk_size]
+        i = index % self.chunk_size
+        error = None
+        error_code = chunk.error_codes[i]
+        if error_code:
+            # events past the message table's limit fall back to the error type
+            error = self.messages[chunk.message_ids[i]] or self.error_types[error_code]
+        return ToolCallEvent(
+            tool_name=self.tool_names[chunk.tool_ids[i]],
+            timestamp=datetime.fromtimestamp(chunk.timestamps_ns[i] / 1_000_000_000),
+            success=bool(chunk.success[i]),
+            latency_ms=chunk.latency_ms[i],
+            error=error,
+            retry_attempt=chunk.retry_attempts[i]
+        )
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._event(i) for i in range(*index.indices(self._len))]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("event index out of range")
+        return self._event(index)
+
+    def __iter__(self) -> Iterator[ToolCallEvent]:
+        for i in range(self._len):
+            yield self._event(i)
+
+    def nbytes(self) -> int:
+        """Bytes allocated for the columns (interned strings not included)."""
+        return sum(getattr(chunk, column).itemsize * self.chunk_size
+                   for chunk in self._chunks for column in self.COLUMNS)
+
+    def as_numpy(self) -> Dict[str, "numpy.ndarray"]:
+        """
+        Columns as NumPy arrays, keyed by column name.
+
+        With a single chunk these are zero-copy views of the live storage;
+        with several chunks they are concatenated copies. Requires numpy.
+        """
+        import numpy as np
+
+        columns = {}
+        for column in self.COLUMNS:
+            parts = [np.frombuffer(getattr(chunk, column), dtype=self._NUMPY_DTYPES[column])[:chunk.size]
+                     for chunk in self._chunks]
+            if not parts:
+                columns[column] = np.empty(0, dtype=self._NUMPY_DTYPES[column])
+            elif len(parts) == 1:
+                columns[column] = parts[0]
+            else:
+                columns[column] = np.concatenate(parts)
+        return columns
@@ -0,0 +1,221 @@
+"""
+Stream observer events to disk while a chaos run is in progress.
+
+    observer = MonkeyObserver(exporter=JSONLExporter("runs/chaos.jsonl", max_file_bytes=100_000_000))
+    ...
+    observer.exporter.close()
+
+Events are buffered in memory and written in batches by a background thread,
+so the tool hot path only appends to a list. Each line / row has the fields of
+ToolCallEvent (plus `error_type`), so files can be read back with
+`ToolCallEvent.model_validate_json` or loaded into pandas / DuckDB directly.
+"""
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from tool_monkey.config.logger import logger
+
+
+class EventExporter(ABC):
+    """
+    Base class for batching, file-rotating exporters.
+
+    Output from earlier runs is never overwritten, so a run restarted after
+    a crash keeps what it had already exported. Without rotation,
+    JSONLExporter appends to an existing file. With rotation, numbering
+    continues after the highest existing segment. `files` lists only the
+    files written by this exporter.
+
+    Once closed, an exporter drops further events (counted in `dropped`, with
+    one warning) rather than raising into the tool calls that produce them.
+
+    Args:
+        path: Output file. With rotation, files are named <stem>-00001<suffix>, <stem>-00002<suffix>, ...
+        batch_size: Flush as soon as this many events are buffered
+        flush_interval: Also flush whatever is buffered at least this often (seconds)
+        max_file_bytes: Start a new file once the current one reaches this size (None = never rotate)
+    """
+
+    def __init__(self, path: Union[str, Path], batch_size: int = 1000, flush_interval: float = 1.0,
+                 max_file_bytes: Optional[int] = None):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        self.files: List[Path] = []
+        self.exported = 0
+        self.dropped = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._segment = self._last_segment() if max_file_bytes is not None else 0
+        self._open_next_file()
+        self._thread = threading.Thread(
+            target=self._run, name=f"tool-monkey-{type(self).__name__}", daemon=True)
+        self._thread.start()
+
+    def record(self, tool_name: str, timestamp: float, success: bool, latency_ms: float,
+               retry_attempt: int = 0, error: Optional[Exception] = None) -> None:
+        if self._closed:
+            # an observer may outlive its exporter; losing the event beats failing the tool call
+            if not self.dropped:
+                logger.warning("%s for %s is closed; dropping tool call events", type(self).__name__, self.path)
+            self.dropped += 1
+            return
+        row = {
+            "tool_name": tool_name,
+            "timestamp": timestamp,
+            "success": success,
+            "error": str(error) if error else None,
+            "error_type": type(error).__name__ if error else None,
+            "latency_ms": latency_ms,
+            "retry_attempt": retry_attempt,
+        }
+        with self._buffer_lock:
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def flush(self) -> None:
+        """Write everything buffered so far."""
+        # hold the write lock across the swap so concurrent flushes keep batches in order
+        with self._write_lock:
+            with self._buffer_lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return
+            self._write_batch(batch)
+            self.exported += len(batch)
+            if self.max_file_bytes is not None and self._file_size() >= self.max_file_bytes:
+                self._close_file()
+                self._open_next_file()
+
+    def close(self) -> None:
+        """Stop the background thread, flush remaining events and close the file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        with self._write_lock:
+            self._close_file()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Failed to export tool call events to %s", self.files[-1])
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.path.with_name(f"{self.path.stem}-{segment:05d}{self.path.suffix}")
+
+    def _last_segment(self) -> int:
+        """Highest segment number already on disk, 0 if none."""
+        prefix, suffix = f"{self.path.stem}-", self.path.suffix
+        numbers = [0]
+        for existing in self.path.parent.glob(f"{prefix}*{suffix}"):
+            number = existing.name[len(prefix):len(existing.name) - len(suffix)]
+            if number.isdigit():
+                numbers.append(int(number))
+        return max(numbers)
+
+    def _open_next_file(self):
+        if self.max_file_bytes is None:
+            path = self.path
+        else:
+            self._segment += 1
+            path = self._segment_path(self._segment)
+        self.files.append(path)
+        self._open_file(path)
+
+    @abstractmethod
+    def _open_file(self, path: Path) -> None:
+        """Open `path` for writing; called for the first file and on every rotation. Must not truncate it."""
+
+    @abstractmethod
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Write `batch` to the current file."""
+
+    def _file_size(self) -> int:
+        return os.path.getsize(self.files[-1])
+
+    @abstractmethod
+    def _close_file(self) -> None:
+        """Close the current file."""
+
+
+class JSONLExporter(EventExporter):
+    """Writes one JSON object per event per line, flushed to the OS after every batch."""
+
+    def _open_file(self, path: Path) -> None:
+        # append: an existing file holds an earlier (possibly crashed) run's events
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        lines = []
+        for row in batch:
+            row["timestamp"] = datetime.fromtimestamp(row["timestamp"]).isoformat()
+            lines.append(json.dumps(row))
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+
+    def _close_file(self) -> None:
+        self._file.close()
+
+
+class ParquetExporter(EventExporter):
+    """
+    Writes each batch as a Parquet row group. Requires pyarrow.
+
+    Parquet files can't be appended to, so without rotation an existing
+    file at `path` raises FileExistsError rather than being overwritten.
+    """
+
+    def __init__(self, *args, **kwargs):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa, self._pq = pa, pq
+        self._schema = pa.schema([
+            ("tool_name", pa.string()),
+            ("timestamp", pa.timestamp("us")),
+            ("success", pa.bool_()),
+            ("error", pa.string()),
+            ("error_type", pa.string()),
+            ("latency_ms", pa.float64()),
+            ("retry_attempt", pa.int32()),
+        ])
+        super().__init__(*args, **kwargs)
+
+    def _open_file(self, path: Path) -> None:
+        if path.exists():
+            raise FileExistsError(f"{path} exists; remove it or set max_file_bytes to write new segments")
+        self._writer = self._pq.ParquetWriter(str(path), self._schema)
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        for row in batch:
+            row["timestamp"] = datetime.fromtimestamp(row["timestamp"])
+        self._writer.write_table(self._pa.Table.from_pylist(batch, schema=self._schema))
+
+    def _close_file(self) -> None:
+        self._writer.close()
@@ -0,0 +1,135 @@
+"""Log-bucketed latency histogram with bounded memory and mergeable state."""
+
+import math
+from typing import Dict, Optional
+
+PERCENTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99, "p99.9": 0.999}
+
+
+class LatencyHistogram:
+    """
+    Histogram whose bucket boundaries grow geometrically.
+
+    Every recorded value lands in a bucket whose bounds are within
+    `relative_accuracy` of it, so reported percentiles are accurate to that
+    relative error. Bucket count grows with the log of the value range, not
+    with the number of values: 1% accuracy from 1µs to one day needs about
+    1,300 buckets at most. Values at or below `min_value` (including zero)
+    share a single bucket.
+
+    Histograms with the same relative_accuracy and min_value can be combined
+    with merge(), so per-tool or per-process histograms add up exactly.
+    """
+
+    __slots__ = ("relative_accuracy", "min_value", "_gamma", "_log_gamma",
+                 "buckets", "zero_count", "count", "total", "min", "max")
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-3):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= self.min_value:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def _bucket_value(self, index: int) -> float:
+        # midpoint (in relative terms) of (gamma^(i-1), gamma^i]
+        return 2 * self._gamma ** index / (self._gamma + 1)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile q (0..1), or None if nothing was recorded."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0 if self.min <= 0 else self.min
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return min(self._bucket_value(index), self.max)
+        return self.max
+
+    def count_at_or_below(self, value: float) -> int:
+        """Number of recorded values <= value, to within relative_accuracy."""
+        if value < 0:
+            return 0
+        if value >= self.max:
+            return self.count
+        count = self.zero_count
+        if value <= self.min_value:
+            return count
+        limit = math.floor(math.log(value) / self._log_gamma)
+        for index, bucket_count in list(self.buckets.items()):
+            if index <= limit:
+                count += bucket_count
+        return count
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add `other`'s counts into this histogram and return it."""
+        if (other.relative_accuracy, other.min_value) != (self.relative_accuracy, self.min_value):
+            raise ValueError("Can only merge histograms with the same relative_accuracy and min_value")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def copy(self) -> "LatencyHistogram":
+        return LatencyHistogram(self.relative_accuracy, self.min_value).merge(self)
+
+    def to_dict(self) -> dict:
+        """JSON-compatible state; from_dict() rebuilds an identical histogram."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "min_value": self.min_value,
+            "buckets": {str(index): count for index, count in self.buckets.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "LatencyHistogram":
+        histogram = cls(state["relative_accuracy"], state["min_value"])
+        histogram.buckets = {int(index): count for index, count in state["buckets"].items()}
+        histogram.zero_count = state["zero_count"]
+        histogram.count = state["count"]
+        histogram.total = state["total"]
+        histogram.min = state["min"] if state["min"] is not None else math.inf
+        histogram.max = state["max"]
+        return histogram
+
+    def stats(self) -> Dict[str, float]:
+        """Count, mean, p50/p90/p99/p99.9 and max."""
+        if not self.count:
+            return {"count": 0}
+        stats = {"count": self.count, "mean": self.total / self.count}
+        for name, q in PERCENTILES.items():
+            stats[name] = self.quantile(q)
+        stats["max"] = self.max
+        return stats
@@ -1,17 +1,36 @@
-from typing import Optional, Callable
-from tool_monkey import FailureScenario, MonkeyObserver, with_monkey
+import inspect
+from typing import Dict, Iterable, Optional, Callable
+from tool_monkey.models import FailureScenario
+from tool_monkey.observer import MonkeyObserver
+from tool_monkey.decorators import with_monkey
+from tool_monkey.coordinator import ChaosCoordinator
 
 
-def create_tool_with_monkey(base_tool: Callable, scenario: FailureScenario, observer: Optional[MonkeyObserver] = None, tool_name: Optional[str] = None, tool_desc: Optional[str] = None, **tool_decorator_kwargs):
+def create_tool_with_monkey(base_tool: Callable, scenario: Optional[FailureScenario], observer: Optional[MonkeyObserver] = None, tool_name: Optional[str] = None, tool_desc: Optional[str] = None, coordinator: Optional[ChaosCoordinator] = None, **tool_decorator_kwargs):
+    """
+    Wrap a base tool function with chaos injection and turn it into a LangChain tool.
+
+    With a coordinator, the tool joins its shared call sequence (scenario and observer
+    come from the coordinator and may be None).
+    """
     from langchain_core.tools import tool
-    wrapped_tool = with_monkey(scenario, observer)(base_tool)
     tool_name = tool_name or tool_decorator_kwargs.pop(
         "name", None) or base_tool.__name__.replace("base_", "")
+    if coordinator is not None:
+        wrapped_tool = coordinator.wrap(base_tool, tool_name)
+    else:
+        wrapped_tool = with_monkey(scenario, observer)(base_tool)
     if tool_desc:
         tool_decorator_kwargs["description"] = tool_desc
     elif "description" not in tool_decorator_kwargs:
         tool_decorator_kwargs["description"] = base_tool.__doc__ or f"Tool: {tool_name}"
 
+    if inspect.iscoroutinefunction(base_tool):
+        @tool(tool_name, **tool_decorator_kwargs)
+        async def async_chaos_tool(*args, **kwargs):
+            return await wrapped_tool(*args, **kwargs)
+        return async_chaos_tool
+
     @tool(tool_name, **tool_decorator_kwargs)  # Unpack all kwargs
     def chaos_tool(*args, **kwargs):
         return wrapped_tool(*args, **kwargs)
@@ -24,6 +43,8 @@ def create_agent_with_monkey(
     base_tools: list,
     scenario: FailureScenario,
     observer: Optional[MonkeyObserver] = None,
+    tool_filter: Optional[Iterable[str]] = None,
+    tool_overrides: Optional[Dict[str, FailureScenario]] = None,
     **agent_kwargs
 ):
     """
@@ -33,8 +54,11 @@ def create_agent_with_monkey(
         agent_factory: LangChain agent creation function (e.g., create_react_agent)
         llm: The language model to use
         base_tools: List of base tool functions to wrap with chaos
-        scenario: Failure scenario to apply to all tools
+        scenario: Failure scenario for the agent as a whole. Call numbers count tool calls
+            across all tools, so on_call_count=5 is the agent's 5th tool call
         observer: Optional MonkeyObserver for tracking metrics
+        tool_filter: Names of the tools the scenario applies to (default: all)
+        tool_overrides: Tool name -> scenario that tool follows instead, on its own call count
         **agent_kwargs: Additional kwargs passed to the agent_factory
 
     Returns:
@@ -52,8 +76,9 @@ def create_agent_with_monkey(
             prompt=custom_prompt
         )
     """
+    coordinator = ChaosCoordinator(scenario, observer=observer, tools=tool_filter, overrides=tool_overrides)
     chaos_tools = [
-        create_tool_with_monkey(tool, scenario, observer)
+        create_tool_with_monkey(tool, scenario, observer, coordinator=coordinator)
         for tool in base_tools
     ]
     return agent_factory(llm, chaos_tools, **agent_kwargs)
@@ -0,0 +1,41 @@
+"""Sampling injected latency from the distributions in LatencyConfig."""
+
+import math
+import random
+from typing import Optional
+
+from tool_monkey.models import LatencyConfig
+
+
+class LatencySampler:
+    """
+    Draws delays (in seconds) for one tool from a LatencyConfig.
+
+    With a seed, each tool gets its own generator seeded from (seed, tool
+    name), so delays are reproducible per tool and don't depend on how calls
+    to different tools interleave.
+    """
+
+    def __init__(self, config: LatencyConfig, tool_name: str = ""):
+        self.config = config
+        self._rng = random.Random(f"{config.seed}:{tool_name}") if config.seed is not None else random.Random()
+        self._draw = getattr(self, f"_{config.distribution}")
+
+    def _constant(self) -> float:
+        return self.config.seconds
+
+    def _uniform(self) -> float:
+        return self._rng.uniform(self.config.low, self.config.high)
+
+    def _lognormal(self) -> float:
+        if not self.config.median:
+            return 0.0
+        return self._rng.lognormvariate(math.log(self.config.median), self.config.sigma)
+
+    def _pareto(self) -> float:
+        return self.config.seconds * self._rng.paretovariate(self.config.alpha)
+
+    def sample(self) -> float:
+        delay = self._draw()
+        max_seconds: Optional[float] = self.config.max_seconds
+        return min(delay, max_seconds) if max_seconds is not None else delay
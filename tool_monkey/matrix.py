@@ -0,0 +1,172 @@
+"""
+Run an agent against a grid of scenarios and seeds, in parallel.
+
+    def harness(tools, seed):
+        agent = build_agent(tools, temperature=0, seed=seed)
+        return agent.invoke({"input": "What's the weather in Paris?"})
+
+    result = run_matrix(harness, [search, weather],
+                        scenarios=[single_timeout(), burst_rate_limit(), expired_token(on_call=2)],
+                        seeds=[1, 2, 3], executor="process")
+    print(result.format_table())
+
+Every (scenario, seed) cell gets fresh tools wrapped by its own
+ChaosCoordinator and MonkeyObserver, so cells never share call counts or
+metrics and can run side by side. The seed is passed to the harness and
+replaces the scenario's probabilistic and latency seeds, so the same cell
+fails the same way on every run.
+
+With executor="process" the harness and tools must be picklable (defined at
+module level); each cell sends back a compact ObserverSnapshot rather than
+raw events. "thread" suits harnesses that mostly wait on network calls.
+
+Simulated timeouts and injected latency sleep for real by default. Pass
+virtual_time=True to give each cell its own VirtualClock instead, so a sweep
+is bounded by the harness's own work rather than by the scenarios' delays;
+the latency columns then report simulated time.
+"""
+
+import csv
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Sequence
+
+from tool_monkey.clock import VirtualClock
+from tool_monkey.coordinator import ChaosCoordinator
+from tool_monkey.models import FailureScenario
+from tool_monkey.observer import MonkeyObserver
+from tool_monkey.response_cache import ResponseCache
+from tool_monkey.snapshot import ObserverSnapshot
+
+# columns of MatrixResult.rows, in order
+COLUMNS = ("scenario", "seed", "total_calls", "success_rate", "failures", "retries",
+           "p50_ms", "p90_ms", "p99_ms", "wall_time_s", "error")
+
+
+def seeded(scenario: FailureScenario, seed: Optional[int]) -> FailureScenario:
+    """Copy of `scenario` with its probabilistic and latency seeds set to `seed`."""
+    if seed is None:
+        return scenario
+    update: Dict[str, Any] = {}
+    if scenario.probabilistic is not None:
+        update["probabilistic"] = scenario.probabilistic.model_copy(update={"seed": seed})
+    if scenario.latency is not None:
+        update["latency"] = scenario.latency.model_copy(update={"seed": seed})
+    return scenario.model_copy(update=update) if update else scenario
+
+
+class CellResult:
+    """Outcome of one (scenario, seed) run: the observer's snapshot, the harness's return value or error, and timing."""
+
+    __slots__ = ("scenario", "seed", "snapshot", "output", "error", "wall_time")
+
+    def __init__(self, scenario: str, seed: Optional[int], snapshot: ObserverSnapshot, output: Any,
+                 error: Optional[str], wall_time: float):
+        self.scenario = scenario
+        self.seed = seed
+        self.snapshot = snapshot
+        self.output = output
+        self.error = error
+        self.wall_time = wall_time
+
+    def row(self) -> Dict[str, Any]:
+        metrics = self.snapshot.get_metrics()
+        latency = metrics.get("latency_ms", {})
+        return {
+            "scenario": self.scenario,
+            "seed": self.seed,
+            "total_calls": metrics.get("total_calls", 0),
+            "success_rate": metrics.get("success_rate"),
+            "failures": metrics.get("failures", 0),
+            "retries": metrics.get("total_retries", 0),
+            "p50_ms": latency.get("p50"),
+            "p90_ms": latency.get("p90"),
+            "p99_ms": latency.get("p99"),
+            "wall_time_s": self.wall_time,
+            "error": self.error,
+        }
+
+
+def _run_cell(harness: Callable, tools: Sequence[Callable], scenario: FailureScenario,
+              seed: Optional[int], keep_output: bool, virtual_time: bool,
+              response_cache: Optional[ResponseCache]) -> CellResult:
+    observer = MonkeyObserver(clock=VirtualClock() if virtual_time else None)
+    coordinator = ChaosCoordinator(seeded(scenario, seed), observer=observer, response_cache=response_cache)
+    wrapped = [coordinator.wrap(tool) for tool in tools]
+    output, error = None, None
+    start = time.perf_counter()
+    try:
+        output = harness(wrapped, seed)
+    except Exception:
+        # the harness giving up is a result too: the agent didn't survive the scenario
+        error = traceback.format_exc(limit=3)
+    wall_time = time.perf_counter() - start
+    return CellResult(scenario.name, seed, observer.snapshot(), output if keep_output else None, error, wall_time)
+
+
+class MatrixResult(list):
+    """CellResults in grid order (scenarios outer, seeds inner)."""
+
+    @property
+    def rows(self) -> List[Dict[str, Any]]:
+        return [cell.row() for cell in self]
+
+    def by_scenario(self) -> Dict[str, ObserverSnapshot]:
+        """Each scenario's snapshots merged across seeds."""
+        merged: Dict[str, ObserverSnapshot] = {}
+        for cell in self:
+            merged.setdefault(cell.scenario, ObserverSnapshot()).merge(cell.snapshot)
+        return merged
+
+    def format_table(self) -> str:
+        """Plain-text table, one line per cell."""
+        def cell_text(value):
+            if value is None:
+                return "-"
+            if isinstance(value, float):
+                return f"{value:.3f}"
+            if isinstance(value, str) and "\n" in value:
+                # just the exception line of a traceback
+                return value.strip().splitlines()[-1]
+            return str(value)
+
+        table = [list(COLUMNS)] + [[cell_text(row[column]) for column in COLUMNS] for row in self.rows]
+        widths = [max(len(line[i]) for line in table) for i in range(len(COLUMNS))]
+        return "\n".join("  ".join(text.ljust(width) for text, width in zip(line, widths)).rstrip()
+                         for line in table)
+
+    def to_csv(self, path: str) -> None:
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+
+def run_matrix(harness: Callable[[List[Callable], Optional[int]], Any], tools: Sequence[Callable],
+               scenarios: Iterable[FailureScenario], seeds: Iterable[Optional[int]] = (None,),
+               executor: Literal["thread", "process"] = "thread", max_workers: Optional[int] = None,
+               keep_output: bool = False, virtual_time: bool = False,
+               response_cache: Optional[ResponseCache] = None) -> MatrixResult:
+    """
+    Run `harness(tools, seed)` once per (scenario, seed) with chaos-wrapped tools.
+
+    Args:
+        harness: Drives the agent; gets the wrapped tools (in the order given) and the seed
+        tools: Tool functions to wrap; each cell wraps them afresh
+        scenarios: Scenarios to sweep; each applies agent-wide (see ChaosCoordinator)
+        seeds: Seeds to sweep for every scenario
+        executor: "thread" or "process" pool
+        max_workers: Pool size (the executor's default if None)
+        keep_output: Keep each harness's return value on its CellResult (must be picklable for processes)
+        virtual_time: Give each cell its own VirtualClock, so simulated delays don't block
+        response_cache: ResponseCache the tools record into or replay from, shared by every cell
+    """
+    seeds = list(seeds)
+    cells = [(scenario, seed) for scenario in scenarios for seed in seeds]
+    pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    with pool_class(max_workers=max_workers) as pool:
+        futures = [pool.submit(_run_cell, harness, list(tools), scenario, seed, keep_output,
+                               virtual_time, response_cache)
+                   for scenario, seed in cells]
+        return MatrixResult(future.result() for future in futures)
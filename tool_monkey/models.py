@@ -1,6 +1,6 @@
 
 from typing import Optional, Dict, Any, List, Literal
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
 
 
@@ -12,12 +12,21 @@ class AuthFailureConfig(BaseModel):
 
 class TimeoutConfig(BaseModel):
     n_seconds: float
+    # "simulate": sleep n_seconds then raise, the tool never runs
+    # "deadline": run the tool and cut it off after n_seconds
+    mode: Literal["simulate", "deadline"] = "simulate"
 
 
 class RateLimitConfig(BaseModel):
-    retry_after_seconds: float
+    retry_after_seconds: float = 0  # computed by the limiter when `limit` is set
     limit_type: Literal["per_minute", "per_hour", "burst"]
-    remaining: int = 0  # 0 =exhausted
+    # quota left at the start: for FailureScenario.rate_limiter, the first window / bucket starts
+    # with this many calls (0 = exhausted, None = the full `limit`)
+    remaining: Optional[int] = Field(default=None, ge=0)
+    # for FailureScenario.rate_limiter: allow `limit` calls per window
+    limit: Optional[int] = Field(default=None, ge=1)
+    # defaults to 60s for per_minute, 3600s for per_hour and 1s for burst
+    window_seconds: Optional[float] = Field(default=None, gt=0)
 
 
 class ContentModerationConfig(BaseModel):
@@ -26,8 +35,30 @@ class ContentModerationConfig(BaseModel):
     reason: Optional[str] = None  # e.g., "Content violates policy"
 
 
+class LatencyConfig(BaseModel):
+    """
+    Extra latency added to calls that succeed, sampled from a distribution (all in seconds).
+
+    constant: `seconds`
+    uniform: between `low` and `high`
+    lognormal: median `median`, shape `sigma`
+    pareto: minimum `seconds`, shape `alpha` (smaller alpha = heavier tail)
+    """
+    distribution: Literal["constant", "uniform", "lognormal", "pareto"] = "constant"
+    seconds: float = Field(default=0, ge=0)
+    low: float = Field(default=0, ge=0)
+    high: float = Field(default=0, ge=0)
+    median: float = Field(default=0, ge=0)
+    sigma: float = Field(default=1, gt=0)
+    alpha: float = Field(default=2, gt=0)
+    # cap for heavy-tailed distributions
+    max_seconds: Optional[float] = Field(default=None, ge=0)
+    seed: Optional[int] = None
+
+
 class ToolFailureConfigDict(BaseModel):
     timeout: Optional[TimeoutConfig] = None
+    latency: Optional[LatencyConfig] = None
     rate_limit: Optional[RateLimitConfig] = None
     auth_failure: Optional[AuthFailureConfig] = None
     content_moderation: Optional[ContentModerationConfig] = None
@@ -41,9 +72,70 @@ class ToolFailure(BaseModel):
     config: Optional[ToolFailureConfigDict] = None
 
 
+class FailureRule(BaseModel):
+    """
+    Fail every call that matches all of the given conditions.
+
+    Rules are evaluated arithmetically, so "every 10th call forever" costs
+    the same as a single ToolFailure. Examples:
+
+        FailureRule(error_type="timeout", every=10)                  # calls 10, 20, 30, ...
+        FailureRule(error_type="timeout", start=5, stop=8)           # calls 5, 6, 7
+        FailureRule(error_type="rate_limit", after=100)              # call 101 onwards
+        FailureRule(error_type="timeout", modulo=4, residues=[1, 2]) # calls 1, 2, 5, 6, 9, 10, ...
+    """
+    error_type: str
+    config: Optional[ToolFailureConfigDict] = None
+    every: Optional[int] = Field(default=None, ge=1)
+    start: Optional[int] = Field(default=None, ge=1)  # first matching call, inclusive
+    stop: Optional[int] = Field(default=None, ge=1)  # exclusive
+    after: Optional[int] = Field(default=None, ge=0)  # calls strictly after this one
+    modulo: Optional[int] = Field(default=None, ge=1)
+    residues: List[int] = []
+
+    @model_validator(mode="after")
+    def _check_modulo(self):
+        if bool(self.modulo) != bool(self.residues):
+            raise ValueError("modulo and residues must be given together")
+        return self
+
+
+class ProbabilisticFailures(BaseModel):
+    """Fail each call at random with per-error-type rates, reproducibly from `seed`."""
+    seed: int
+    # error_type -> probability per call, e.g. {"rate_limit": 0.02, "timeout": 0.005}
+    rates: Dict[str, float]
+    # optional config per error_type
+    configs: Dict[str, ToolFailureConfigDict] = {}
+    # decisions are pre-generated this many calls at a time
+    block_size: int = Field(default=4096, ge=1)
+
+    @model_validator(mode="after")
+    def _check_rates(self):
+        if any(rate < 0 for rate in self.rates.values()):
+            raise ValueError("Failure rates must be >= 0")
+        if sum(self.rates.values()) > 1:
+            raise ValueError("Failure rates must add up to at most 1")
+        return self
+
+
 class FailureScenario(BaseModel):
     name: str
-    failures: List[ToolFailure]
+    failures: List[ToolFailure] = []
+    # periodic / range failures for calls not covered by `failures`
+    rules: List[FailureRule] = []
+    # random failures for calls not covered by `failures` or `rules`
+    probabilistic: Optional[ProbabilisticFailures] = None
+    # time-based quota checked on calls that no other failure applies to
+    rate_limiter: Optional[RateLimitConfig] = None
+    # latency added to every call that isn't failed
+    latency: Optional[LatencyConfig] = None
+
+    @model_validator(mode="after")
+    def _check_rate_limiter(self):
+        if self.rate_limiter is not None and self.rate_limiter.limit is None:
+            raise ValueError("rate_limiter needs a limit")
+        return self
 
 # for observer
 
@@ -1,80 +1,144 @@
-import time
-from typing import Optional, Dict
-from tool_monkey.models import FailureScenario, TimeoutConfig, ToolFailureConfigDict, ToolFailure, RateLimitConfig, ContentModerationConfig
-from tool_monkey.exceptions import RateLimitError, AuthenticationError, ContentModerationError
+import functools
+from typing import Dict, List, Optional, Tuple
+from tool_monkey.models import FailureScenario
 from tool_monkey.config.logger import logger
+from tool_monkey.clock import Clock, get_default_clock
+from tool_monkey.counters import Counter, LocalCounter
+from tool_monkey.schedule import PREAMBLE, CompiledFailure, CompiledSchedule
+from tool_monkey.rate_limiter import RateLimiter, make_rate_limiter
+from tool_monkey.exceptions import RateLimitError
+from tool_monkey.latency import LatencySampler
 
 
 class ToolMonkey:
 
-    def __init__(self, failure_scenario: FailureScenario, tool_name: str):
+    def __init__(self, failure_scenario: FailureScenario, tool_name: str, clock: Optional[Clock] = None,
+                 counter: Optional[Counter] = None, schedule: Optional[CompiledSchedule] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
+        self._clock = clock
         self.failure_scenario = failure_scenario
-        self.preamble = "ʕ•͡-•ʔ Tool Monkey unleashed! ʕ•͡-•ʔ"
+        self.preamble = PREAMBLE
         self.tool_name = tool_name
-        self.call_count = 0
-        self._failure_index: Dict[int, ToolFailure] = {}
-        for idx, fail in enumerate(failure_scenario.failures, start=1):
-            call_num = fail.on_call_count if fail.on_call_count is not None else idx
-            if call_num in self._failure_index:
-                raise ValueError(f"Duplicate failure for call {call_num}")
-            self._failure_index[call_num] = fail
+        self._counter = counter if counter is not None else LocalCounter()
+        # compiled once here (or passed in, to share one compilation between tools)
+        self.schedule = schedule if schedule is not None else CompiledSchedule(failure_scenario, self.preamble)
+        self._failure_index = self.schedule.index
+        # plain dict lookup when the schedule allows it, the full evaluation otherwise
+        self._failure_for = self._failure_index.get if self.schedule.is_static else self.schedule.failure_for
+        # rate limiter state is per ToolMonkey unless one is passed in to share
+        self.rate_limiter: Optional[RateLimiter] = rate_limiter
+        if rate_limiter is None and failure_scenario.rate_limiter is not None:
+            self.rate_limiter = make_rate_limiter(failure_scenario.rate_limiter)
+        # last call the scenario can affect; None if it can keep firing forever
+        self._last_call = self.schedule.last_call
+        if self.rate_limiter is not None or failure_scenario.latency is not None:
+            self._last_call = None
+        # one sampler per LatencyConfig, keyed by id: configs live as long as the scenario / schedule
+        self._samplers: Dict[int, LatencySampler] = {}
 
-    def should_fail(self) -> Optional[Exception]:
-        self.call_count += 1
-        fail = self._failure_index.get(self.call_count)
+    @property
+    def clock(self) -> Clock:
+        return self._clock or get_default_clock()
+
+    @property
+    def call_count(self) -> int:
+        return self._counter.value
+
+    @property
+    def exhausted(self) -> bool:
+        """True once every call the scenario can fail or delay is behind us."""
+        return self._last_call is not None and self._counter.value >= self._last_call
+
+    def next_failure(self) -> Optional[CompiledFailure]:
+        """Advance the call counter and return the failure scheduled for this call, if any."""
+        # use the number the counter hands back, not self.call_count, which other threads may have moved on
+        fail = self._failure_for(self._counter.increment())
+        if fail is None and self.rate_limiter is not None:
+            retry_after = self.rate_limiter.acquire(self.clock.now())
+            if retry_after:
+                return self._rate_limited(retry_after)
+        return fail
+
+    def next_failures(self, count: int) -> Tuple[int, List[Optional[CompiledFailure]]]:
+        """
+        Advance the call counter by `count` at once, one call per batch item.
+
+        Returns the first call number and the failure (or None) for each of
+        the `count` calls; the rate limiter, if any, sees each passing item.
+        """
+        first = self._counter.increment(count) - count + 1
+        failures = self.schedule.failures_for(first, count)
+        if self.rate_limiter is not None:
+            now = self.clock.now()
+            for offset, fail in enumerate(failures):
+                if fail is None:
+                    retry_after = self.rate_limiter.acquire(now)
+                    if retry_after:
+                        failures[offset] = self._rate_limited(retry_after)
+        return first, failures
+
+    def _rate_limited(self, retry_after: float) -> CompiledFailure:
+        limiter = self.rate_limiter
+        return CompiledFailure.from_factory("rate_limit", functools.partial(
+            RateLimitError,
+            f"{self.preamble}: Rate limit exceeded ({limiter.limit} calls per {limiter.window:g}s). "
+            f"Retry after {retry_after:.3f} seconds.",
+            retry_after=retry_after,
+            limit_type=limiter.config.limit_type
+        ))
+
+    def latency_for(self, fail: Optional[CompiledFailure]) -> float:
+        """
+        Seconds of latency to inject before running the tool for this call.
+
+        Latency entries in the schedule use their own config; otherwise the
+        scenario-wide latency applies to every call that isn't failing.
+        """
+        if fail is not None:
+            config = fail.latency
+        else:
+            config = self.failure_scenario.latency
+        if config is None:
+            return 0.0
+        sampler = self._samplers.get(id(config))
+        if sampler is None:
+            sampler = self._samplers.setdefault(id(config), LatencySampler(config, self.tool_name))
+        return sampler.sample()
+
+    def deadline_for(self, fail: Optional[CompiledFailure]) -> Optional[float]:
+        """Seconds the real tool may run before being cut off, for deadline-mode timeouts."""
+        return fail.deadline if fail else None
+
+    def build_error(self, fail: CompiledFailure) -> Exception:
+        """Build the exception for `fail` without waiting out any delay."""
+        return fail.make_error()
+
+    def unleash(self, fail: Optional[CompiledFailure]) -> Optional[Exception]:
+        """Wait out any simulated delay for `fail` and return the exception to raise."""
+        if fail:
+            if fail.delay:
+                logger.info("Simulating timeout for %s seconds", fail.delay)
+                self.clock.sleep(fail.delay)
+            return fail.make_error()
+
+    async def unleash_async(self, fail: Optional[CompiledFailure]) -> Optional[Exception]:
+        """Async twin of unleash: simulated delays yield to the event loop."""
         if fail:
-            return self._unleash_monkey(fail.error_type, fail.config)
-
-    def _unleash_rate_limit(self, config: Optional[ToolFailureConfigDict] = None):
-        if not config or not config.rate_limit:
-            return RateLimitError(f"{self.preamble}: Rate limit exceeded")
-
-        rate_limit_config = config.rate_limit
-        return RateLimitError(
-            f"{self.preamble}: Rate limit exceeded ({rate_limit_config.limit_type}). "
-            f"Retry after {rate_limit_config.retry_after_seconds} seconds.",
-            retry_after=rate_limit_config.retry_after_seconds,
-            limit_type=rate_limit_config.limit_type
-        )
-
-    def _unleash_timeout(self, config: Optional[ToolFailureConfigDict] = None):
-        if not config or not config.timeout:
-            return TimeoutError(f"{self.preamble}: Request timed out")
-        timeout_config: TimeoutConfig = config.timeout
-        logger.info(
-            "Simulating timeout for %s seconds", timeout_config.n_seconds)
-        time.sleep(timeout_config.n_seconds)
-        return TimeoutError(f"{self.preamble}: Request timed out after {timeout_config.n_seconds} seconds")
-
-    def _unleash_auth_failure(self, config: Optional[ToolFailureConfigDict] = None):
-        if not config or not config.auth_failure:
-            return AuthenticationError(f"{self.preamble}: Authentication failed")
-        auth_config = config.auth_failure
-        message = auth_config.error_message or f"Authentication failed: {auth_config.failure_type}"
-        return AuthenticationError(
-            f"{self.preamble}: {message}",
-            failure_type=auth_config.failure_type,
-            status_code=auth_config.status_code
-        )
-
-    def _unleash_content_moderation(self, config: Optional[ToolFailureConfigDict] = None):
-        if not config or not config.content_moderation:
-            return ContentModerationError(f"{self.preamble}: Content moderation filter triggered")
-        content_moderation_config = config.content_moderation
-        triggered_categories = content_moderation_config.content_categories or {}
-        reason = content_moderation_config.reason or "Content violates policy"
-        return ContentModerationError(
-            f"{self.preamble}: {reason}",
-            content_categories=triggered_categories,
-            reason=reason
-        )
-
-    def _unleash_monkey(self, error_type: str, config: Optional[ToolFailureConfigDict] = None):
-        if error_type == "rate_limit":
-            return self._unleash_rate_limit(config)
-        elif error_type == "timeout":
-            return self._unleash_timeout(config)
-        elif error_type == "auth_failure":
-            return self._unleash_auth_failure(config)
-        elif error_type == "content_moderation":
-            return self._unleash_content_moderation(config)
+            if fail.delay:
+                logger.info("Simulating timeout for %s seconds", fail.delay)
+                await self.clock.sleep_async(fail.delay)
+            return fail.make_error()
+
+    def should_fail(self) -> Optional[Exception]:
+        fail = self.next_failure()
+        latency = self.latency_for(fail)
+        if latency:
+            self.clock.sleep(latency)
+        return self.unleash(fail)
+
+    async def should_fail_async(self) -> Optional[Exception]:
+        fail = self.next_failure()
+        latency = self.latency_for(fail)
+        if latency:
+            await self.clock.sleep_async(latency)
+        return await self.unleash_async(fail)
@@ -1,69 +1,149 @@
-import time
-from datetime import datetime
+import threading
 from collections import defaultdict
-from typing import List, Dict, Optional, Any
-from tool_monkey.models import ToolCallEvent
+from typing import List, Dict, Optional, Any, Tuple
+from tool_monkey.event_store import EventStore, ListEventStore
+from tool_monkey.exporters import EventExporter
+from tool_monkey.clock import Clock, get_default_clock
+from tool_monkey.histogram import LatencyHistogram
+from tool_monkey.snapshot import ObserverSnapshot, _new_tool_stats
 
 
 class MonkeyObserver:
     """
     Tracks tool execution metrics during tool monkey chaos tests
+
+    Metrics are kept as running totals updated in end_call, so get_metrics and
+    summary cost the same however many calls have been recorded. Pass
+    keep_events=True to also keep every ToolCallEvent in tool_call_events, or
+    an event_store (e.g. ColumnarEventStore) to choose how they are stored.
+    Pass an exporter (e.g. JSONLExporter) to stream every event to disk
+    instead of, or as well as, keeping it in memory.
     """
 
-    def __init__(self):
-        self.tool_call_events: List[ToolCallEvent] = []
+    def __init__(self, clock: Optional[Clock] = None, keep_events: bool = False,
+                 event_store: Optional[EventStore] = None, exporter: Optional[EventExporter] = None):
+        self._clock = clock
+        self.exporter = exporter
+        self.keep_events = keep_events or event_store is not None
+        self.tool_call_events: EventStore = event_store if event_store is not None else ListEventStore()
         self._start_times: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._total_calls = 0
+        self._successes = 0
+        self._total_retries = 0
+        self._latency_sum_ms = 0.0
+        self._abandoned = 0
+        self._breakdown: Dict[str, Dict[str, int]] = defaultdict(_new_tool_stats)
+        self._latency = LatencyHistogram()
+        # tool name -> outcome ("success" / "chaos_failure" / "real_failure") -> histogram
+        self._latency_by_tool: Dict[str, Dict[str, LatencyHistogram]] = defaultdict(dict)
+        # latency added by Tool Monkey to calls that went ahead, by tool
+        self._injected_latency = LatencyHistogram()
+        self._injected_latency_by_tool: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        # (tool name, scenario name, outcome, error type) -> calls
+        self._call_counts: Dict[Tuple[str, str, str, str], int] = defaultdict(int)
+        # sync calls cut off by a deadline leave their worker thread running
+        self._abandoned_threads: List[threading.Thread] = []
+
+    @property
+    def clock(self) -> Clock:
+        return self._clock or get_default_clock()
+
+    def start_call(self, tool_call_id: str, now: Optional[float] = None):
+        """Record the start of a call, at `now` on the caller's clock if given, else on ours."""
+        self._start_times[tool_call_id] = now if now is not None else self.clock.now()
+
+    def end_call(self, tool_name: str, tool_call_id: str, success: bool, error: Optional[Exception] = None, retry_attempt: int = 0,
+                 injected: bool = False, scenario: Optional[str] = None, injected_latency_ms: float = 0,
+                 now: Optional[float] = None):
+        """
+        Record the end of a call.
+
+        `injected` marks failures raised by Tool Monkey rather than the tool;
+        `scenario` is the name of the FailureScenario the call ran under;
+        `injected_latency_ms` is delay Tool Monkey added before running the
+        tool (already included in the call's measured latency); `now` is the
+        end time on the same clock as start_call's `now`.
+        """
+        if now is None:
+            now = self.clock.now()
+        latency_ms = (now - self._start_times.pop(tool_call_id, now)) * 1000
+        outcome = "success" if success else "chaos_failure" if injected else "real_failure"
+        error_type = type(error).__name__ if error else ""
+        with self._lock:
+            self._call_counts[(tool_name, scenario or "", outcome, error_type)] += 1
+            if injected_latency_ms:
+                self._injected_latency.record(injected_latency_ms)
+                self._injected_latency_by_tool[tool_name].record(injected_latency_ms)
+            self._latency.record(latency_ms)
+            histograms = self._latency_by_tool[tool_name]
+            histogram = histograms.get(outcome)
+            if histogram is None:
+                histogram = histograms[outcome] = LatencyHistogram()
+            histogram.record(latency_ms)
+            self._total_calls += 1
+            self._latency_sum_ms += latency_ms
+            self._total_retries += retry_attempt
+            stats = self._breakdown[tool_name]
+            stats["call_count"] += 1
+            if success:
+                self._successes += 1
+            else:
+                stats["failures"] += 1
+            if retry_attempt > 0:
+                stats["retries"] += 1
+            if self.keep_events:
+                self.tool_call_events.record(
+                    tool_name, now, success, latency_ms, retry_attempt, error)
+        if self.exporter is not None:
+            self.exporter.record(tool_name, now, success, latency_ms, retry_attempt, error)
+
+    def record_abandoned(self, tool_name: str, thread: Optional[threading.Thread] = None):
+        """Record a call abandoned at its deadline, and the worker thread still running it (if any)."""
+        with self._lock:
+            self._abandoned += 1
+            self._breakdown[tool_name]["abandoned"] += 1
+            if thread is not None:
+                self._abandoned_threads.append(thread)
+
+    def leaked_threads(self) -> int:
+        """Number of abandoned worker threads that are still running."""
+        with self._lock:
+            self._abandoned_threads = [
+                t for t in self._abandoned_threads if t.is_alive()]
+            return len(self._abandoned_threads)
 
-    def start_call(self, tool_call_id: str):
-        self._start_times[tool_call_id] = time.time()
+    def snapshot(self) -> ObserverSnapshot:
+        """
+        Copy of the aggregated metrics, safe to pickle and merge with other observers' snapshots.
 
-    def end_call(self, tool_name: str, tool_call_id: str, success: bool, error: Optional[Exception] = None, retry_attempt: int = 0):
-        latency_ms = (
-            time.time() - self._start_times.pop(tool_call_id, time.time())) * 1000
-        self.tool_call_events.append(
-            ToolCallEvent(
-                tool_name=tool_name,
-                timestamp=datetime.now(),
-                success=success,
-                latency_ms=latency_ms,
-                error=str(error) if error else None,
-                retry_attempt=retry_attempt
-            )
-        )
+        Individual events (tool_call_events) are not included.
+        """
+        snapshot = ObserverSnapshot()
+        leaked = self.leaked_threads()
+        with self._lock:
+            snapshot.total_calls = self._total_calls
+            snapshot.successes = self._successes
+            snapshot.total_retries = self._total_retries
+            snapshot.latency_sum_ms = self._latency_sum_ms
+            snapshot.abandoned = self._abandoned
+            snapshot.leaked_threads = leaked
+            for name, stats in self._breakdown.items():
+                snapshot.breakdown[name] = dict(stats)
+            snapshot.latency = self._latency.copy()
+            for name, histograms in self._latency_by_tool.items():
+                snapshot.latency_by_tool[name] = {
+                    outcome: histogram.copy() for outcome, histogram in histograms.items()}
+            snapshot.injected_latency = self._injected_latency.copy()
+            for name, histogram in self._injected_latency_by_tool.items():
+                snapshot.injected_latency_by_tool[name] = histogram.copy()
+            snapshot.call_counts.update(self._call_counts)
+        return snapshot
 
     def get_metrics(self) -> Dict[str, Any]:
-        if not self.tool_call_events:
-            return {}
-        total = len(self.tool_call_events)
-        successes = sum(1 for event in self.tool_call_events if event.success)
-        failures = total - successes
-        breakdown = defaultdict(
-            lambda: {"call_count": 0, "failures": 0, "retries": 0})
-        for event in self.tool_call_events:
-            breakdown[event.tool_name]["call_count"] += 1
-            if not event.success:
-                breakdown[event.tool_name]["failures"] += 1
-            if event.retry_attempt > 0:
-                breakdown[event.tool_name]["retries"] += 1
-        return {
-            "total_calls": total,
-            "successes": successes,
-            "failures": failures,
-            "success_rate": successes / total if total > 0 else 0,
-            "avg_latency_ms": sum(e.latency_ms for e in self.tool_call_events) / total,
-            "total_retries": sum(e.retry_attempt for e in self.tool_call_events),
-            "breakdown": dict(breakdown)
-        }
+        # percentiles are computed from the snapshot, outside the lock
+        return self.snapshot().get_metrics()
 
     def summary(self) -> str:
         """Human-readable summary."""
-        metrics = self.get_metrics()
-        return f"""
-  Tool Monkey Execution Summary
-  ==============================
-  Total Calls: {metrics.get('total_calls', 0)}
-  Success Rate: {metrics.get('success_rate', 0):.1%}
-  Failures: {metrics.get('failures', 0)}
-  Total Retries: {metrics.get('total_retries', 0)}
-  Avg Latency: {metrics.get('avg_latency_ms', 0):.1f}ms
-          """.strip()
+        return self.snapshot().summary()
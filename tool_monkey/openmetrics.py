@@ -0,0 +1,107 @@
+"""
+OpenMetrics / Prometheus exposition of MonkeyObserver state.
+
+    server = serve_metrics(observer, port=9464)   # scrape http://127.0.0.1:9464/metrics
+    ...
+    server.shutdown()
+
+Rendering copies the observer's pre-aggregated counters and histograms
+without taking its lock, so scraping never blocks tool calls. A scrape may
+see a call counted in one metric but not yet in another; every counter is
+still monotonic, which is all Prometheus needs.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, List, Tuple
+
+from tool_monkey.observer import MonkeyObserver
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Latency bucket bounds in seconds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+def render_openmetrics(observer: MonkeyObserver, prefix: str = "tool_monkey") -> str:
+    """Render the observer's counters and latency histograms in OpenMetrics text format."""
+    call_counts = list(observer._call_counts.items())
+    breakdown = [(name, dict(stats)) for name, stats in list(observer._breakdown.items())]
+    latency = [(name, list(histograms.items())) for name, histograms in list(observer._latency_by_tool.items())]
+
+    lines: List[str] = []
+    lines.append(f"# TYPE {prefix}_calls counter")
+    lines.append(f"# HELP {prefix}_calls Tool calls by tool, scenario, outcome and error type.")
+    for (tool, scenario, outcome, error_type), count in call_counts:
+        labels = _labels([("tool", tool), ("scenario", scenario), ("outcome", outcome), ("error_type", error_type)])
+        lines.append(f"{prefix}_calls_total{labels} {count}")
+
+    lines.append(f"# TYPE {prefix}_retried_calls counter")
+    lines.append(f"# HELP {prefix}_retried_calls Calls made after one or more failed attempts.")
+    for tool, stats in breakdown:
+        lines.append(f"{prefix}_retried_calls_total{_labels([('tool', tool)])} {stats['retries']}")
+
+    lines.append(f"# TYPE {prefix}_abandoned_calls counter")
+    lines.append(f"# HELP {prefix}_abandoned_calls Calls cut off at a deadline.")
+    for tool, stats in breakdown:
+        lines.append(f"{prefix}_abandoned_calls_total{_labels([('tool', tool)])} {stats['abandoned']}")
+
+    lines.append(f"# TYPE {prefix}_leaked_threads gauge")
+    lines.append(f"# HELP {prefix}_leaked_threads Abandoned worker threads still running.")
+    lines.append(f"{prefix}_leaked_threads {sum(t.is_alive() for t in list(observer._abandoned_threads))}")
+
+    lines.append(f"# TYPE {prefix}_call_latency_seconds histogram")
+    lines.append(f"# UNIT {prefix}_call_latency_seconds seconds")
+    lines.append(f"# HELP {prefix}_call_latency_seconds Tool call latency by tool and outcome.")
+    for tool, histograms in latency:
+        for outcome, histogram in histograms:
+            base = [("tool", tool), ("outcome", outcome)]
+            # read count first: buckets recorded afterwards can only make cumulative counts larger
+            count, total = histogram.count, histogram.total
+            for bound in LATENCY_BUCKETS:
+                cumulative = min(histogram.count_at_or_below(bound * 1000), count)
+                lines.append(f"{prefix}_call_latency_seconds_bucket{_labels(base + [('le', repr(bound))])} {cumulative}")
+            lines.append(f"{prefix}_call_latency_seconds_bucket{_labels(base + [('le', '+Inf')])} {count}")
+            lines.append(f"{prefix}_call_latency_seconds_count{_labels(base)} {count}")
+            lines.append(f"{prefix}_call_latency_seconds_sum{_labels(base)} {total / 1000}")
+
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def serve_metrics(observer: MonkeyObserver, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serve render_openmetrics(observer) at http://host:port/metrics from a daemon thread.
+
+    Returns the server; call server.shutdown() to stop it. Pass port=0 to pick
+    a free port (see server.server_address).
+    """
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_openmetrics(observer).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="tool-monkey-metrics", daemon=True).start()
+    return server
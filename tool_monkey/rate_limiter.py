@@ -0,0 +1,166 @@
+"""
+Time-based rate limiters for simulating a real API quota.
+
+Unlike scheduled rate_limit failures, which fire on fixed call numbers,
+these look at when calls actually happen (through the ToolMonkey's clock).
+An agent that backs off for the reported retry_after gets back under quota,
+and one that hammers the tool keeps getting rejected.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Hashable, Optional
+
+from tool_monkey.models import RateLimitConfig
+from tool_monkey.sessions import current_session
+
+# default window for each limit_type, in seconds
+WINDOWS = {"per_minute": 60.0, "per_hour": 3600.0, "burst": 1.0}
+
+
+class RateLimiter(ABC):
+    """Shared bookkeeping: counts allowed / rejected calls for throughput reporting."""
+
+    def __init__(self, config: RateLimitConfig):
+        self.config = config
+        self.limit = config.limit
+        self.window = config.window_seconds or WINDOWS[config.limit_type]
+        # quota available at the first call
+        self.initial = self.limit if config.remaining is None else min(config.remaining, self.limit)
+        self.allowed = 0
+        self.rejected = 0
+        self._first_call = None
+        self._last_call = None
+        self._lock = threading.Lock()
+
+    def acquire(self, now: float) -> float:
+        """Try to take one call's worth of quota at time `now`. Returns 0 if allowed, else seconds until retry."""
+        with self._lock:
+            if self._first_call is None:
+                self._first_call = now
+            self._last_call = now
+            retry_after = self._acquire(now)
+            if retry_after:
+                self.rejected += 1
+            else:
+                self.allowed += 1
+            return retry_after
+
+    @abstractmethod
+    def _acquire(self, now: float) -> float:
+        """Quota decision at `now`, with the lock held: 0 if allowed, else seconds until retry."""
+
+    def stats(self) -> Dict[str, float]:
+        """Allowed / rejected calls and achieved throughput against the configured limit."""
+        elapsed = (self._last_call - self._first_call) if self._first_call is not None else 0.0
+        return {
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "elapsed_seconds": elapsed,
+            "throughput_per_second": self.allowed / elapsed if elapsed > 0 else 0.0,
+            "limit_per_second": self.limit / self.window,
+        }
+
+
+class SlidingWindowLimiter(RateLimiter):
+    """
+    At most `limit` calls in any `window` seconds. Keeps at most `limit` timestamps.
+
+    Quota already used up (limit - remaining) counts as calls made at the
+    first call's time, so it frees up one window later.
+    """
+
+    def __init__(self, config: RateLimitConfig):
+        super().__init__(config)
+        self._calls = deque()
+        self._started = False
+
+    def _acquire(self, now: float) -> float:
+        calls = self._calls
+        if not self._started:
+            self._started = True
+            calls.extend([now] * (self.limit - self.initial))
+        while calls and calls[0] <= now - self.window:
+            calls.popleft()
+        if len(calls) < self.limit:
+            calls.append(now)
+            return 0.0
+        return calls[0] + self.window - now
+
+
+class TokenBucketLimiter(RateLimiter):
+    """Bursts of up to `limit` calls, refilled at `limit` calls per `window` seconds. Starts with `remaining` tokens."""
+
+    def __init__(self, config: RateLimitConfig):
+        super().__init__(config)
+        self._rate = self.limit / self.window
+        self._tokens = float(self.initial)
+        self._updated = None
+
+    def _acquire(self, now: float) -> float:
+        if self._updated is not None:
+            self._tokens = min(self.limit, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self._rate
+
+
+class SessionRateLimiter:
+    """
+    Rate limiter kept separately for each chaos session, like SessionCounter.
+
+    Each session gets its own quota, so one busy session can't rate-limit
+    the others. stats() reports the current session's limiter. Only the
+    `max_sessions` most recently used sessions are kept; an evicted session
+    that comes back starts with a fresh quota.
+
+    Args:
+        config: Rate limit every session gets
+        max_sessions: How many idle sessions to keep before evicting the oldest
+        session_key: Resolves the current session; defaults to current_session()
+    """
+
+    def __init__(self, config: RateLimitConfig, max_sessions: int = 1024,
+                 session_key: Optional[Callable[[], Hashable]] = None):
+        if max_sessions < 1:
+            raise ValueError(f"max_sessions must be >= 1, got {max_sessions}")
+        self.config = config
+        self.limit = config.limit
+        self.window = config.window_seconds or WINDOWS[config.limit_type]
+        self.max_sessions = max_sessions
+        self._session_key = session_key or current_session
+        self._limiters: "OrderedDict[Hashable, RateLimiter]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _limiter(self) -> RateLimiter:
+        key = self._session_key()
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = self._limiters[key] = make_rate_limiter(self.config)
+                if len(self._limiters) > self.max_sessions:
+                    self._limiters.popitem(last=False)
+            else:
+                self._limiters.move_to_end(key)
+            return limiter
+
+    def acquire(self, now: float) -> float:
+        return self._limiter().acquire(now)
+
+    def stats(self) -> Dict[str, float]:
+        return self._limiter().stats()
+
+    def __len__(self) -> int:
+        return len(self._limiters)
+
+
+def make_rate_limiter(config: RateLimitConfig) -> RateLimiter:
+    """Token bucket for "burst" limits, sliding window for "per_minute" / "per_hour"."""
+    if config.limit is None:
+        raise ValueError("RateLimitConfig.limit is required to simulate a rate limiter")
+    if config.limit_type == "burst":
+        return TokenBucketLimiter(config)
+    return SlidingWindowLimiter(config)
@@ -0,0 +1,229 @@
+"""
+Scenarios defined in files, looked up by name.
+
+A scenario file is JSON, TOML or YAML (YAML needs PyYAML) holding either one
+FailureScenario or several under a "scenarios" key:
+
+    # chaos/search.yaml
+    scenarios:
+      - name: flaky_search
+        probabilistic: {seed: 1, rates: {rate_limit: 0.05}}
+      - name: slow_search
+        latency: {distribution: lognormal, median: 0.5, sigma: 1}
+
+    registry = ScenarioRegistry(cache_dir="/var/cache/tool-monkey")
+    registry.load_dir("chaos/")
+    search = with_monkey(registry.get("flaky_search"), schedule=registry.schedule("flaky_search"))(search)
+
+or simply `with_monkey("flaky_search")`, which looks the name up in the
+default registry. The default registry loads the files and directories
+listed in TOOL_MONKEY_SCENARIOS (os.pathsep-separated) on first lookup, so
+chaos plans can change with the environment rather than with the code.
+
+Each file is validated and compiled once per distinct content: results are
+cached in memory by content hash and, with a cache_dir, pickled to disk
+so other worker processes skip validation and compilation entirely. Only
+point cache_dir at a directory you trust, since cache entries are unpickled.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from tool_monkey.config.logger import logger
+from tool_monkey.models import FailureScenario
+from tool_monkey.schedule import PREAMBLE, CompiledSchedule
+
+SUFFIXES = (".json", ".toml", ".yaml", ".yml")
+
+# bump when the pickled layout of FailureScenario / CompiledSchedule changes
+CACHE_VERSION = 2
+
+PathLike = Union[str, os.PathLike]
+Compiled = Tuple[FailureScenario, CompiledSchedule]
+
+
+def _parse(data: bytes, suffix: str) -> dict:
+    if suffix == ".json":
+        return json.loads(data)
+    if suffix == ".toml":
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            import tomli as tomllib
+        return tomllib.loads(data.decode("utf-8"))
+    if suffix in (".yaml", ".yml"):
+        import yaml
+        return yaml.safe_load(data)
+    raise ValueError(f"Unsupported scenario file type {suffix!r}; expected one of {SUFFIXES}")
+
+
+def parse_scenarios(data: bytes, suffix: str) -> List[FailureScenario]:
+    """Validate the scenarios in a file's contents. `suffix` picks the format (".json", ".toml", ".yaml")."""
+    document = _parse(data, suffix.lower())
+    if not isinstance(document, dict):
+        raise ValueError("A scenario file must hold a mapping")
+    entries = document["scenarios"] if "scenarios" in document else [document]
+    return [FailureScenario.model_validate(entry) for entry in entries]
+
+
+def load_scenarios(path: PathLike) -> List[FailureScenario]:
+    """Read and validate every scenario in a file, without caching or registering them."""
+    path = Path(path)
+    return parse_scenarios(path.read_bytes(), path.suffix)
+
+
+class ScenarioRegistry:
+    """
+    Named FailureScenarios with their compiled schedules.
+
+    Scenarios come from register() or from files via load() / load_dir().
+    Loading a file whose contents were seen before, by this registry or
+    (with cache_dir) by any process sharing the directory, reuses the
+    earlier validation and compilation.
+    """
+
+    def __init__(self, cache_dir: Optional[PathLike] = None, preamble: str = PREAMBLE):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.preamble = preamble
+        self._scenarios: Dict[str, Compiled] = {}
+        # content hash -> compiled scenarios from that content
+        self._by_hash: Dict[str, List[Compiled]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, scenario: FailureScenario, schedule: Optional[CompiledSchedule] = None) -> FailureScenario:
+        """Add (or replace) a scenario under its name."""
+        if schedule is None:
+            schedule = CompiledSchedule(scenario, self.preamble)
+        with self._lock:
+            self._scenarios[scenario.name] = (scenario, schedule)
+        return scenario
+
+    def get(self, name: str) -> FailureScenario:
+        return self._entry(name)[0]
+
+    def schedule(self, name: str) -> CompiledSchedule:
+        """The compiled schedule for `name`, ready to pass to ToolMonkey / with_monkey."""
+        return self._entry(name)[1]
+
+    def _entry(self, name: str) -> Compiled:
+        try:
+            return self._scenarios[name]
+        except KeyError:
+            raise KeyError(f"No scenario named {name!r}; registered: {self.names()}") from None
+
+    def names(self) -> List[str]:
+        return sorted(self._scenarios)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._scenarios
+
+    def __len__(self) -> int:
+        return len(self._scenarios)
+
+    def load(self, path: PathLike) -> List[FailureScenario]:
+        """Load, compile and register every scenario in a file. Returns them in file order."""
+        path = Path(path)
+        data = path.read_bytes()
+        key = self._key(data, path.suffix)
+        compiled = self._by_hash.get(key)
+        if compiled is None:
+            compiled = self._read_cache(key)
+            if compiled is None:
+                compiled = [(scenario, CompiledSchedule(scenario, self.preamble))
+                            for scenario in parse_scenarios(data, path.suffix)]
+                self._write_cache(key, compiled)
+            self._by_hash[key] = compiled
+        for scenario, schedule in compiled:
+            self.register(scenario, schedule)
+        return [scenario for scenario, _ in compiled]
+
+    def load_dir(self, directory: PathLike) -> List[FailureScenario]:
+        """Load every scenario file directly inside `directory`, in name order."""
+        scenarios = []
+        for path in sorted(Path(directory).iterdir()):
+            if path.suffix.lower() in SUFFIXES and path.is_file():
+                scenarios.extend(self.load(path))
+        return scenarios
+
+    def load_path(self, path: PathLike) -> List[FailureScenario]:
+        """load_dir for directories, load for files."""
+        return self.load_dir(path) if Path(path).is_dir() else self.load(path)
+
+    def _key(self, data: bytes, suffix: str) -> str:
+        digest = hashlib.sha256(data)
+        digest.update(f"\0{suffix.lower()}\0{self.preamble}\0{CACHE_VERSION}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _read_cache(self, key: str) -> Optional[List[Compiled]]:
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self.cache_dir / f"{key}.pickle", "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable scenario cache entry %s: %s", key, e)
+            return None
+
+    def _write_cache(self, key: str, compiled: List[Compiled]) -> None:
+        if self.cache_dir is None:
+            return
+        try:
+            data = pickle.dumps(compiled, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            # e.g. a custom error type whose factory is a lambda
+            logger.debug("Not caching scenarios on disk: %s", e)
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # write then rename, so concurrent workers never read a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self.cache_dir / f"{key}.pickle")
+
+
+_default_registry: Optional[ScenarioRegistry] = None
+
+
+def get_default_registry() -> ScenarioRegistry:
+    """
+    The process-wide registry used by get_scenario / with_monkey("name").
+
+    Created on first use, loading the files and directories in
+    TOOL_MONKEY_SCENARIOS and caching to TOOL_MONKEY_CACHE_DIR, if set.
+    """
+    global _default_registry
+    if _default_registry is None:
+        registry = ScenarioRegistry(cache_dir=os.environ.get("TOOL_MONKEY_CACHE_DIR") or None)
+        for path in os.environ.get("TOOL_MONKEY_SCENARIOS", "").split(os.pathsep):
+            if path:
+                registry.load_path(path)
+        _default_registry = registry
+    return _default_registry
+
+
+def set_default_registry(registry: Optional[ScenarioRegistry]) -> Optional[ScenarioRegistry]:
+    """
+    Replace the default registry; None rebuilds it from the environment on next use.
+    Returns the previous one (None if it was never created).
+    """
+    global _default_registry
+    previous, _default_registry = _default_registry, registry
+    return previous
+
+
+def register_scenario(scenario: FailureScenario) -> FailureScenario:
+    """Register a scenario in the default registry."""
+    return get_default_registry().register(scenario)
+
+
+def get_scenario(name: str) -> FailureScenario:
+    """Look a scenario up by name in the default registry."""
+    return get_default_registry().get(name)
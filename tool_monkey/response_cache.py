@@ -0,0 +1,262 @@
+"""
+Record real tool responses once, then replay them in every chaos run.
+
+Without it, every call Tool Monkey lets through still hits the real API.
+Record a run, then replay it, and only the injected failures differ
+between runs:
+
+    cache = ResponseCache("chaos-responses.sqlite", mode="record")
+    search = with_monkey(scenario, response_cache=cache)(search)
+    run_suite()                       # real calls, responses saved
+
+    cache = ResponseCache("chaos-responses.sqlite", mode="replay")
+    search = with_monkey(scenario, response_cache=cache)(search)
+    run_suite()                       # no network; failures still injected
+
+Modes: "record" always calls the tool and stores what it returns, "replay"
+never calls it and raises ResponseNotRecordedError for calls it has no
+response for, and "auto" replays what it has and records the rest.
+
+Responses are keyed by tool name and a SHA-256 of the call's arguments,
+serialized as canonical JSON (keyword order doesn't matter). Pydantic
+models, dataclasses, enums, sets, bytes, dates, paths, decimals and UUIDs
+are encoded by value, tagged with their type; any other argument raises TypeError, since a
+fallback such as repr() can embed a memory address and give a key that
+never matches again. Pass key= to hash such calls yourself. Responses
+are pickled into a SQLite file, with the most recently used kept in an
+in-memory LRU; each hit is unpickled afresh, so callers can't corrupt the
+cache by mutating what they get back. Exceptions raised by the tool are
+not recorded. As with the registry's disk cache, only open stores you
+trust, since entries are unpickled.
+"""
+
+import dataclasses
+import datetime
+import decimal
+import enum
+import hashlib
+import inspect
+import json
+import os
+import pathlib
+import pickle
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Literal, Optional, Union
+
+MODES = ("record", "replay", "auto")
+
+
+class ResponseNotRecordedError(LookupError):
+    """Raised in replay mode for a call with no recorded response."""
+
+
+def _not_recorded(tool_name: str, args: tuple, kwargs: dict) -> ResponseNotRecordedError:
+    return ResponseNotRecordedError(f"No recorded response for {tool_name} with args {args!r}, kwargs {kwargs!r}")
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=_json_default, separators=(",", ":"))
+
+
+def _json_default(value: Any):
+    # every encoding is tagged with its type, so b"\xab" and "ab", or Path("a") and "a", never share a key
+    if hasattr(value, "model_dump"):
+        return {"__model__": [type(value).__qualname__, value.model_dump(mode="json")]}
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        fields = {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+        return {"__dataclass__": [type(value).__qualname__, fields]}
+    if isinstance(value, enum.Enum):
+        return {"__enum__": [type(value).__qualname__, value.value]}
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": sorted(value, key=_canonical)}
+    if isinstance(value, bytes):
+        return {"__bytes__": value.hex()}
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {"__time__": value.isoformat()}
+    if isinstance(value, pathlib.PurePath):
+        return {"__path__": str(value)}
+    if isinstance(value, decimal.Decimal):
+        return {"__decimal__": str(value)}
+    if isinstance(value, uuid.UUID):
+        return {"__uuid__": str(value)}
+    raise TypeError(f"Can't derive a stable response cache key from {type(value).__name__!r} arguments; "
+                    f"pass ResponseCache(key=...) to key these calls yourself")
+
+
+def call_key(args: tuple, kwargs: dict) -> str:
+    """
+    Stable hash of a call's arguments, the same in every process and run.
+
+    Raises TypeError for arguments with no deterministic encoding.
+    """
+    return hashlib.sha256(_canonical([args, kwargs]).encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    Recorded tool responses: an in-memory LRU in front of an optional SQLite file.
+
+    Args:
+        path: SQLite file to persist responses in; None keeps them in memory only
+        mode: "record", "replay" or "auto" (see module docstring)
+        max_entries: Responses kept in memory
+        key: Computes a call's key from (args, kwargs) instead of call_key; it must return the
+            same string for the same call in every process and run
+
+    One cache can serve many tools. It is safe to share between threads and
+    can be pickled, e.g. to send to a process pool: the copy opens the same
+    file. Several processes may record into one file at once.
+    """
+
+    def __init__(self, path: Optional[Union[str, os.PathLike]] = None,
+                 mode: Literal["record", "replay", "auto"] = "replay", max_entries: int = 4096,
+                 key: Optional[Callable[[tuple, dict], str]] = None):
+        if mode not in MODES:
+            raise ValueError(f"mode must be 'record', 'replay' or 'auto', got {mode!r}")
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+        self.path = os.fspath(path) if path is not None else None
+        self.mode = mode
+        self.max_entries = max_entries
+        self.key = key or call_key
+        self.hits = 0
+        self.misses = 0
+        # (tool name, call key) -> pickled response, least recently used first
+        self._memory: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid = None
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        # called with the lock held; a forked child must not reuse its parent's connection
+        if self.path is None:
+            return None
+        if self._db is None or self._pid != os.getpid():
+            db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("CREATE TABLE IF NOT EXISTS responses ("
+                       "tool TEXT NOT NULL, key TEXT NOT NULL, response BLOB NOT NULL, PRIMARY KEY (tool, key))")
+            db.commit()
+            self._db, self._pid = db, os.getpid()
+        return self._db
+
+    def _remember(self, entry: tuple, data: bytes) -> None:
+        self._memory[entry] = data
+        self._memory.move_to_end(entry)
+        if len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, entry: tuple) -> Optional[bytes]:
+        with self._lock:
+            data = self._memory.get(entry)
+            if data is not None:
+                self._memory.move_to_end(entry)
+            else:
+                db = self._connection()
+                if db is not None:
+                    row = db.execute("SELECT response FROM responses WHERE tool = ? AND key = ?", entry).fetchone()
+                    if row is not None:
+                        data = row[0]
+                        self._remember(entry, data)
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return data
+
+    def get(self, tool_name: str, args: tuple = (), kwargs: Optional[dict] = None) -> Any:
+        """The recorded response for this call; raises ResponseNotRecordedError if there is none."""
+        kwargs = kwargs or {}
+        data = self._lookup((tool_name, self.key(args, kwargs)))
+        if data is None:
+            raise _not_recorded(tool_name, args, kwargs)
+        return pickle.loads(data)
+
+    def put(self, tool_name: str, args: tuple, kwargs: dict, response: Any) -> None:
+        """Record `response` for this call, replacing any earlier one."""
+        entry = (tool_name, self.key(args, kwargs))
+        data = pickle.dumps(response, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(entry, data)
+            db = self._connection()
+            if db is not None:
+                db.execute("INSERT OR REPLACE INTO responses (tool, key, response) VALUES (?, ?, ?)", (*entry, data))
+                db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            db = self._connection()
+            if db is None:
+                return len(self._memory)
+            return db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            db = self._connection()
+            if db is not None:
+                db.execute("DELETE FROM responses")
+                db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def wrap(self, func: Callable, tool_name: Optional[str] = None) -> Callable:
+        """`func` recording into or replaying from this cache, according to its mode."""
+        tool_name = tool_name or func.__name__
+        mode = self.mode
+
+        def replay(args, kwargs):
+            data = self._lookup((tool_name, self.key(args, kwargs)))
+            if data is None and mode == "replay":
+                raise _not_recorded(tool_name, args, kwargs)
+            return data
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_cached(*args, **kwargs):
+                if mode != "record":
+                    data = replay(args, kwargs)
+                    if data is not None:
+                        return pickle.loads(data)
+                response = await func(*args, **kwargs)
+                self.put(tool_name, args, kwargs, response)
+                return response
+            return async_cached
+
+        @wraps(func)
+        def cached(*args, **kwargs):
+            if mode != "record":
+                data = replay(args, kwargs)
+                if data is not None:
+                    return pickle.loads(data)
+            response = func(*args, **kwargs)
+            self.put(tool_name, args, kwargs, response)
+            return response
+        return cached
+
+    def __getstate__(self):
+        # a custom key function must be picklable too (defined at module level)
+        return {"path": self.path, "mode": self.mode, "max_entries": self.max_entries,
+                "key": None if self.key is call_key else self.key}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], state["mode"], state["max_entries"], state["key"])
@@ -1,4 +1,4 @@
-from tool_monkey import ToolFailure, FailureScenario
+from tool_monkey.models import ToolFailure, FailureScenario
 
 
 def expired_token(on_call: int = 3) -> FailureScenario:
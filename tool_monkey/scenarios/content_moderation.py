@@ -1,4 +1,4 @@
-from tool_monkey import ToolFailure, FailureScenario
+from tool_monkey.models import ToolFailure, FailureScenario
 
 
 def content_policy_violation(reason: str = "nsfw_content") -> FailureScenario:
@@ -1,4 +1,4 @@
-from tool_monkey import ToolFailure, FailureScenario
+from tool_monkey.models import ToolFailure, FailureScenario, FailureRule
 
 
 def burst_rate_limit(on_call: int = 3, retry_after: float = 5.0) -> FailureScenario:
@@ -45,16 +45,18 @@ def progressive_rate_limit(quota: int = 5, retry_after: float = 60.0) -> Failure
     """
     return FailureScenario(
         name="progressive_rate_limit",
-        failures=[
-            ToolFailure(
-                on_call_count=i,
+        failures=[],
+        rules=[
+            FailureRule(
+                after=quota,
                 error_type="rate_limit",
                 config={
-                    "retry_after_seconds": retry_after,
-                    "limit_type": "per_minute",
-                    "remaining": 0
+                    "rate_limit": {
+                        "retry_after_seconds": retry_after,
+                        "limit_type": "per_minute",
+                        "remaining": 0
+                    }
                 }
             )
-            for i in range(quota + 1, quota + 20)
         ]
     )
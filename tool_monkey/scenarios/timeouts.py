@@ -1,4 +1,4 @@
-from tool_monkey import ToolFailure, FailureScenario
+from tool_monkey.models import ToolFailure, FailureScenario, FailureRule
 
 
 def single_timeout(seconds: float = 3.0) -> FailureScenario:
@@ -55,17 +55,23 @@ def intermittent_timeout(num_cycles: int = 3, seconds: float = 2.0) -> FailureSc
     :return: FailureScenario with alternating timeouts
     :rtype: FailureScenario
     """
-    failures = []
-    for i in range(num_cycles):
-        # Timeout on odd calls (1, 3, 5...)
-        failures.append(
-            ToolFailure(
-                on_call_count=i * 2 + 1,
+    rules = []
+    if num_cycles > 0:
+        rules.append(
+            # Timeout on odd calls (1, 3, 5...) for num_cycles cycles
+            FailureRule(
+                modulo=2,
+                residues=[1],
+                stop=num_cycles * 2,
                 error_type="timeout",
                 config={"timeout": {"n_seconds": seconds}}
             )
         )
-    return FailureScenario(name="intermittent_timeout", failures=failures)
+    return FailureScenario(
+        name="intermittent_timeout",
+        failures=[],
+        rules=rules
+    )
 
 
 def progressive_timeout(delays: list[float] = [1.0, 2.0, 5.0, 10.0]) -> FailureScenario:
@@ -0,0 +1,347 @@
+"""
+Compiling a FailureScenario into something cheap to evaluate on every call.
+
+Each ToolFailure is turned into a CompiledFailure once, up front: its error
+type is looked up in the error-type registry, the exception message and
+arguments are formatted, and what remains per failing call is a single
+factory call. Unknown error types are rejected at compile time instead of
+silently never failing.
+
+Register extra error types with `register_error_type`:
+
+    @register_error_type("quota_exceeded")
+    def quota_exceeded(preamble, config):
+        return functools.partial(QuotaError, f"{preamble}: Quota exceeded")
+"""
+
+import bisect
+import functools
+import random
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+from tool_monkey.models import FailureScenario, ToolFailure, ToolFailureConfigDict, ProbabilisticFailures, FailureRule
+from tool_monkey.exceptions import RateLimitError, AuthenticationError, ContentModerationError
+
+PREAMBLE = "ʕ•͡-•ʔ Tool Monkey unleashed! ʕ•͡-•ʔ"
+
+# (preamble, config) -> zero-argument callable building a fresh exception for each failing call
+ErrorFactoryBuilder = Callable[[str, Optional[ToolFailureConfigDict]], Callable[[], Exception]]
+
+_ERROR_TYPES: Dict[str, ErrorFactoryBuilder] = {}
+
+
+def register_error_type(error_type: str):
+    """Decorator registering an error factory builder under `error_type`."""
+    def decorator(builder: ErrorFactoryBuilder) -> ErrorFactoryBuilder:
+        _ERROR_TYPES[error_type] = builder
+        return builder
+    return decorator
+
+
+def error_types() -> list:
+    """Names of all registered error types."""
+    return sorted(_ERROR_TYPES)
+
+
+@register_error_type("rate_limit")
+def _rate_limit(preamble: str, config: Optional[ToolFailureConfigDict]):
+    if not config or not config.rate_limit:
+        return functools.partial(RateLimitError, f"{preamble}: Rate limit exceeded")
+    rate_limit_config = config.rate_limit
+    return functools.partial(
+        RateLimitError,
+        f"{preamble}: Rate limit exceeded ({rate_limit_config.limit_type}). "
+        f"Retry after {rate_limit_config.retry_after_seconds} seconds.",
+        retry_after=rate_limit_config.retry_after_seconds,
+        limit_type=rate_limit_config.limit_type
+    )
+
+
+@register_error_type("timeout")
+def _timeout(preamble: str, config: Optional[ToolFailureConfigDict]):
+    if not config or not config.timeout:
+        return functools.partial(TimeoutError, f"{preamble}: Request timed out")
+    return functools.partial(TimeoutError, f"{preamble}: Request timed out after {config.timeout.n_seconds} seconds")
+
+
+@register_error_type("auth_failure")
+def _auth_failure(preamble: str, config: Optional[ToolFailureConfigDict]):
+    if not config or not config.auth_failure:
+        return functools.partial(AuthenticationError, f"{preamble}: Authentication failed")
+    auth_config = config.auth_failure
+    message = auth_config.error_message or f"Authentication failed: {auth_config.failure_type}"
+    return functools.partial(
+        AuthenticationError,
+        f"{preamble}: {message}",
+        failure_type=auth_config.failure_type,
+        status_code=auth_config.status_code
+    )
+
+
+@register_error_type("content_moderation")
+def _content_moderation(preamble: str, config: Optional[ToolFailureConfigDict]):
+    if not config or not config.content_moderation:
+        return functools.partial(ContentModerationError, f"{preamble}: Content moderation filter triggered")
+    content_moderation_config = config.content_moderation
+    reason = content_moderation_config.reason or "Content violates policy"
+    return functools.partial(
+        ContentModerationError,
+        f"{preamble}: {reason}",
+        content_categories=content_moderation_config.content_categories or {},
+        reason=reason
+    )
+
+
+def _no_error() -> None:
+    return None
+
+
+@register_error_type("latency")
+def _latency(preamble: str, config: Optional[ToolFailureConfigDict]):
+    # not a failure: the call goes ahead after an injected delay
+    if not config or not config.latency:
+        raise ValueError("latency entries need config.latency")
+    return _no_error
+
+
+class CompiledFailure:
+    """
+    A ToolFailure with its exception factory and timing resolved up front.
+
+    `failure` is the ToolFailure it was compiled from; in a CompiledSchedule
+    that is the first of any identical failures sharing it.
+    """
+
+    __slots__ = ("failure", "error_type", "make_error", "delay", "deadline", "latency")
+
+    def __init__(self, failure: ToolFailure, preamble: str = PREAMBLE):
+        builder = _ERROR_TYPES.get(failure.error_type)
+        if builder is None:
+            raise ValueError(
+                f"Unknown error_type {failure.error_type!r}; expected one of {error_types()}")
+        self.failure = failure
+        self.error_type = failure.error_type
+        self.make_error: Callable[[], Exception] = builder(preamble, failure.config)
+        timeout = failure.config.timeout if failure.error_type == "timeout" and failure.config else None
+        # "simulate" timeouts sleep before raising; "deadline" timeouts cut the real tool off
+        self.delay = timeout.n_seconds if timeout and timeout.mode == "simulate" else 0
+        self.deadline = timeout.n_seconds if timeout and timeout.mode == "deadline" else None
+        # sampled per call by the ToolMonkey, which owns the random state
+        self.latency = failure.config.latency if failure.error_type == "latency" else None
+
+    @classmethod
+    def from_factory(cls, error_type: str, make_error: Callable[[], Exception]) -> "CompiledFailure":
+        """A failure decided at call time (e.g. by a rate limiter) rather than compiled from a ToolFailure."""
+        fail = cls.__new__(cls)
+        fail.failure = None
+        fail.error_type = error_type
+        fail.make_error = make_error
+        fail.delay = 0
+        fail.deadline = None
+        fail.latency = None
+        return fail
+
+
+class CompiledRule:
+    """A FailureRule reduced to integer bounds and a residue set."""
+
+    __slots__ = ("failure", "first", "stop", "every", "modulo", "residues")
+
+    def __init__(self, rule: FailureRule, preamble: str = PREAMBLE):
+        self.failure = CompiledFailure(ToolFailure(error_type=rule.error_type, config=rule.config), preamble)
+        # start and after both just raise the lower bound
+        self.first = max(rule.start or 1, (rule.after or 0) + 1)
+        self.stop = rule.stop
+        self.every = rule.every
+        self.modulo = rule.modulo
+        self.residues = frozenset(r % rule.modulo for r in rule.residues) if rule.modulo else None
+
+    def matching(self, first: int, last: int) -> Iterable[int]:
+        """Call numbers in first..last (inclusive) this rule fires on, without testing each one."""
+        start = max(first, self.first)
+        stop = last + 1 if self.stop is None else min(last + 1, self.stop)
+        if start >= stop:
+            return ()
+        if self.modulo is None:
+            every = self.every or 1
+            return range(start + (-start) % every, stop, every)
+        every = self.every
+        return sorted(
+            call_num
+            for residue in self.residues
+            for call_num in range(start + (residue - start) % self.modulo, stop, self.modulo)
+            if every is None or not call_num % every
+        )
+
+    def matches(self, call_num: int) -> bool:
+        if call_num < self.first or (self.stop is not None and call_num >= self.stop):
+            return False
+        if self.every is not None and call_num % self.every:
+            return False
+        if self.modulo is not None and call_num % self.modulo not in self.residues:
+            return False
+        return True
+
+
+class CompiledRandomFailures:
+    """
+    Seeded random failures, decided a block of calls at a time.
+
+    Block k holds one byte per call: 0 for "pass", otherwise the 1-based
+    index of the error type that fires. Each block is generated from its own
+    generator seeded with (seed, k), so any call's outcome depends only on the
+    seed and the call number, never on the order calls arrive in. Only the
+    few most recently generated blocks are kept, so memory stays constant however
+    long the run.
+    """
+
+    _CACHED_BLOCKS = 4
+
+    def __init__(self, config: ProbabilisticFailures, preamble: str = PREAMBLE):
+        self.seed = config.seed
+        self.block_size = config.block_size
+        error_types = [error_type for error_type, rate in config.rates.items() if rate > 0]
+        if len(error_types) > 255:
+            raise ValueError("At most 255 error types can be used in one probabilistic scenario")
+        # failures[code - 1] is the failure for error code `code`
+        self.failures: List[CompiledFailure] = [
+            CompiledFailure(ToolFailure(error_type=error_type, config=config.configs.get(error_type)), preamble)
+            for error_type in error_types
+        ]
+        self._cumulative: List[float] = []
+        total = 0.0
+        for error_type in error_types:
+            total += config.rates[error_type]
+            self._cumulative.append(total)
+        # bisect gives 0..n-1 for an error and n for "pass"; remap to 1..n and 0
+        self._codes = bytes(range(1, len(error_types) + 1)) + b"\0" + bytes(255 - len(error_types))
+        self._blocks: Dict[int, bytes] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # blocks are cheap to regenerate and the lock can't be pickled
+        state = self.__dict__.copy()
+        state["_blocks"] = {}
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def block(self, k: int) -> bytes:
+        """Error codes for calls k * block_size + 1 ... (k + 1) * block_size."""
+        block = self._blocks.get(k)
+        if block is None:
+            rng = random.Random(f"{self.seed}:{k}")
+            draw, cumulative = rng.random, self._cumulative
+            block = bytes(bisect.bisect_right(cumulative, draw())
+                          for _ in range(self.block_size)).translate(self._codes)
+            with self._lock:
+                self._blocks[k] = block
+                while len(self._blocks) > self._CACHED_BLOCKS:
+                    del self._blocks[next(iter(self._blocks))]
+        return block
+
+    def codes(self, first: int, count: int) -> bytes:
+        """Error codes for calls first ... first + count - 1, sliced from whole blocks."""
+        parts = []
+        while count > 0:
+            k, offset = divmod(first - 1, self.block_size)
+            part = self.block(k)[offset:offset + count]
+            parts.append(part)
+            first += len(part)
+            count -= len(part)
+        return b"".join(parts)
+
+    def failure_for(self, call_num: int) -> Optional[CompiledFailure]:
+        k, offset = divmod(call_num - 1, self.block_size)
+        code = self.block(k)[offset]
+        return self.failures[code - 1] if code else None
+
+
+class CompiledSchedule:
+    """
+    Flat call-number -> CompiledFailure table for a FailureScenario.
+
+    Explicit failures are looked up first; calls they don't cover fall
+    through to the scenario's rules (first match wins) and then to its
+    probabilistic failures, if any. Compiled
+    schedules hold no per-call state, so one can be shared by any number of
+    ToolMonkey instances.
+
+    Failures with the same error type and config compile to one shared
+    CompiledFailure, which keeps long schedules small in memory and on disk.
+    """
+
+    def __init__(self, failure_scenario: FailureScenario, preamble: str = PREAMBLE):
+        self.name = failure_scenario.name
+        self.index: Dict[int, CompiledFailure] = {}
+        compiled: Dict[tuple, CompiledFailure] = {}
+        for idx, fail in enumerate(failure_scenario.failures, start=1):
+            call_num = fail.on_call_count if fail.on_call_count is not None else idx
+            if call_num in self.index:
+                raise ValueError(f"Duplicate failure for call {call_num}")
+            key = (fail.error_type, repr(fail.config))
+            compiled_failure = compiled.get(key)
+            if compiled_failure is None:
+                compiled_failure = compiled[key] = CompiledFailure(fail, preamble)
+            self.index[call_num] = compiled_failure
+        self.rules: List[CompiledRule] = [CompiledRule(rule, preamble) for rule in failure_scenario.rules]
+        self.random: Optional[CompiledRandomFailures] = None
+        if failure_scenario.probabilistic is not None:
+            self.random = CompiledRandomFailures(failure_scenario.probabilistic, preamble)
+
+    @property
+    def is_static(self) -> bool:
+        """True when every failure is in `index`, so a dict lookup is the whole schedule."""
+        return not self.rules and self.random is None
+
+    @property
+    def last_call(self) -> Optional[int]:
+        """Number of the last call that can fail, or None if the schedule never runs out."""
+        if self.random is not None or any(rule.stop is None for rule in self.rules):
+            return None
+        return max([*self.index, *(rule.stop - 1 for rule in self.rules)], default=0)
+
+    def failures_for(self, first: int, count: int) -> List[Optional[CompiledFailure]]:
+        """
+        failure_for() for `count` consecutive calls starting at `first`, evaluated a batch at a time.
+
+        Each source fills the whole range at once, in reverse priority order
+        (random, then rules last to first, then explicit failures), so the
+        result matches calling failure_for() on each call number.
+        """
+        failures: List[Optional[CompiledFailure]] = [None] * count
+        if self.random is not None:
+            random_failures = self.random.failures
+            for offset, code in enumerate(self.random.codes(first, count)):
+                if code:
+                    failures[offset] = random_failures[code - 1]
+        last = first + count - 1
+        for rule in reversed(self.rules):
+            for call_num in rule.matching(first, last):
+                failures[call_num - first] = rule.failure
+        if len(self.index) < count:
+            for call_num, fail in self.index.items():
+                if first <= call_num <= last:
+                    failures[call_num - first] = fail
+        else:
+            get = self.index.get
+            for offset in range(count):
+                fail = get(first + offset)
+                if fail is not None:
+                    failures[offset] = fail
+        return failures
+
+    def failure_for(self, call_num: int) -> Optional[CompiledFailure]:
+        fail = self.index.get(call_num)
+        if fail is not None:
+            return fail
+        for rule in self.rules:
+            if rule.matches(call_num):
+                return rule.failure
+        if self.random is not None:
+            return self.random.failure_for(call_num)
+        return None
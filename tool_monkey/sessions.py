@@ -0,0 +1,86 @@
+"""
+Per-session chaos state for servers that run many agent sessions at once.
+
+A tool wrapped once with `with_monkey(..., per_session=True)` keeps a separate
+call counter for every session, so each session walks the failure schedule
+from call 1 independently of the others:
+
+    with chaos_session(request.session_id):
+        agent.invoke(...)
+
+The session is stored in a ContextVar, so it follows asyncio tasks and
+`contextvars.copy_context()` into worker threads.
+"""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Hashable, Optional
+
+from tool_monkey.counters import LocalCounter
+
+_current_session: ContextVar[Optional[Hashable]] = ContextVar(
+    "tool_monkey_session", default=None)
+
+
+def current_session() -> Optional[Hashable]:
+    """Key of the active chaos session, or None outside any session."""
+    return _current_session.get()
+
+
+@contextmanager
+def chaos_session(key: Hashable):
+    """Run the enclosed tool calls in the chaos session identified by `key`."""
+    token = _current_session.set(key)
+    try:
+        yield key
+    finally:
+        _current_session.reset(token)
+
+
+class SessionCounter:
+    """
+    Call counter kept separately for each chaos session.
+
+    Only the `max_sessions` most recently used sessions are kept; an evicted
+    session that comes back starts counting from zero again. Calls made
+    outside any session share the `None` session.
+
+    Args:
+        max_sessions: How many idle sessions to keep before evicting the oldest
+        session_key: Resolves the current session; defaults to current_session()
+    """
+
+    def __init__(self, max_sessions: int = 1024, session_key: Optional[Callable[[], Hashable]] = None):
+        if max_sessions < 1:
+            raise ValueError(f"max_sessions must be >= 1, got {max_sessions}")
+        self.max_sessions = max_sessions
+        self._session_key = session_key or current_session
+        self._counters: "OrderedDict[Hashable, LocalCounter]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _counter(self) -> LocalCounter:
+        key = self._session_key()
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = LocalCounter()
+                if len(self._counters) > self.max_sessions:
+                    self._counters.popitem(last=False)
+            else:
+                self._counters.move_to_end(key)
+            return counter
+
+    @property
+    def value(self) -> int:
+        return self._counter().value
+
+    def increment(self, n: int = 1) -> int:
+        return self._counter().increment(n)
+
+    def reset(self) -> None:
+        self._counter().reset()
+
+    def __len__(self) -> int:
+        return len(self._counters)
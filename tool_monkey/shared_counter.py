@@ -0,0 +1,96 @@
+"""
+A call counter shared by every process on one machine (POSIX only).
+
+Give each worker a FileCounter on the same path and a scenario's call
+numbers count calls across all of them, so "fail the 3rd call" fires once
+for the fleet instead of once per process:
+
+    counter = FileCounter("/tmp/search-tool.counter")
+    search = with_monkey(scenario, counter=counter)(search)
+
+The count lives in an 8-byte memory-mapped file. increment() takes an
+exclusive flock() for its read-modify-write, so concurrent processes always
+get distinct, gap-free numbers; reads of `value` are lock-free. No server
+or network round trip is involved: an increment is two syscalls.
+"""
+
+import fcntl
+import mmap
+import os
+import struct
+import threading
+from typing import Union
+
+_FORMAT = struct.Struct("<q")
+
+
+class FileCounter:
+    """
+    Counter backed by a memory-mapped file, shared between processes and threads.
+
+    The file is created (at zero) if missing and is never deleted by the
+    counter. A FileCounter can be pickled, e.g. to send to a process pool:
+    the copy reopens the same file. After a fork, the child reopens the file
+    on first use, since flock() would not separate it from its parent while
+    they share a file descriptor.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+        # flock() doesn't exclude threads that share our file descriptor
+        self._lock = threading.Lock()
+        self._open()
+
+    def _open(self) -> None:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size < _FORMAT.size:
+                os.ftruncate(fd, _FORMAT.size)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        self._fd = fd
+        self._map = mmap.mmap(fd, _FORMAT.size)
+        self._pid = os.getpid()
+
+    @property
+    def value(self) -> int:
+        return _FORMAT.unpack_from(self._map)[0]
+
+    def _update(self, n: int, absolute: bool) -> int:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                value = n if absolute else _FORMAT.unpack_from(self._map)[0] + n
+                _FORMAT.pack_into(self._map, 0, value)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            return value
+
+    def increment(self, n: int = 1) -> int:
+        """Add `n` and return the new value."""
+        return self._update(n, absolute=False)
+
+    def reset(self) -> None:
+        self._update(0, absolute=True)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                os.close(self._fd)
+                self._map = None
+
+    def __enter__(self) -> "FileCounter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __getstate__(self):
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
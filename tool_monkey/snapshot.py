@@ -0,0 +1,188 @@
+"""
+Point-in-time, mergeable copies of MonkeyObserver state.
+
+A chaos run spread over a process pool gets one observer per worker. Have
+each worker send back observer.snapshot() (it pickles in a few KB whatever
+the number of calls) and combine them in the parent:
+
+    total = ObserverSnapshot.combine(pool.map(run_worker, shards))
+    print(total.summary())
+
+merge() is associative and commutative, and an empty ObserverSnapshot() is
+its identity, so snapshots can be combined in any order or tree shape.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Tuple
+
+from tool_monkey.histogram import LatencyHistogram
+
+STAT_KEYS = ("call_count", "failures", "retries", "abandoned")
+
+
+def _new_tool_stats() -> Dict[str, int]:
+    return dict.fromkeys(STAT_KEYS, 0)
+
+
+def _merge_histograms(into: Dict[str, LatencyHistogram], other: Dict[str, LatencyHistogram]) -> None:
+    for key, histogram in other.items():
+        if key in into:
+            into[key].merge(histogram)
+        else:
+            into[key] = histogram.copy()
+
+
+class ObserverSnapshot:
+    """
+    Counters, per-tool breakdown, latency histograms and error-type counts.
+
+    Everything get_metrics() and summary() report is derived from these
+    aggregates, so a merged snapshot reports exactly what one observer
+    would have seen for all the calls together. Percentiles come from the
+    merged histograms, not from averaging per-worker percentiles.
+    """
+
+    def __init__(self):
+        self.total_calls = 0
+        self.successes = 0
+        self.total_retries = 0
+        self.latency_sum_ms = 0.0
+        self.abandoned = 0
+        self.leaked_threads = 0
+        self.breakdown: Dict[str, Dict[str, int]] = defaultdict(_new_tool_stats)
+        self.latency = LatencyHistogram()
+        self.latency_by_tool: Dict[str, Dict[str, LatencyHistogram]] = defaultdict(dict)
+        self.injected_latency = LatencyHistogram()
+        self.injected_latency_by_tool: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        # (tool name, scenario name, outcome, error type) -> calls
+        self.call_counts: Dict[Tuple[str, str, str, str], int] = defaultdict(int)
+
+    def merge(self, other: "ObserverSnapshot") -> "ObserverSnapshot":
+        """Add `other`'s counts into this snapshot and return it."""
+        self.total_calls += other.total_calls
+        self.successes += other.successes
+        self.total_retries += other.total_retries
+        self.latency_sum_ms += other.latency_sum_ms
+        self.abandoned += other.abandoned
+        self.leaked_threads += other.leaked_threads
+        for name, stats in other.breakdown.items():
+            mine = self.breakdown[name]
+            for key, value in stats.items():
+                mine[key] += value
+        self.latency.merge(other.latency)
+        for name, histograms in other.latency_by_tool.items():
+            _merge_histograms(self.latency_by_tool[name], histograms)
+        self.injected_latency.merge(other.injected_latency)
+        _merge_histograms(self.injected_latency_by_tool, other.injected_latency_by_tool)
+        for key, count in other.call_counts.items():
+            self.call_counts[key] += count
+        return self
+
+    @classmethod
+    def combine(cls, snapshots: Iterable["ObserverSnapshot"]) -> "ObserverSnapshot":
+        """Merge any number of snapshots into a new one, leaving them untouched."""
+        total = cls()
+        for snapshot in snapshots:
+            total.merge(snapshot)
+        return total
+
+    def error_type_counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = defaultdict(int)
+        for (_, _, _, error_type), count in self.call_counts.items():
+            if error_type:
+                counts[error_type] += count
+        return dict(counts)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Same shape as MonkeyObserver.get_metrics()."""
+        total = self.total_calls
+        if not total:
+            return {}
+        return {
+            "total_calls": total,
+            "successes": self.successes,
+            "failures": total - self.successes,
+            "success_rate": self.successes / total,
+            "avg_latency_ms": self.latency_sum_ms / total,
+            "total_retries": self.total_retries,
+            "abandoned_calls": self.abandoned,
+            "error_types": self.error_type_counts(),
+            "latency_ms": self.latency.stats(),
+            "breakdown": {name: dict(stats) for name, stats in self.breakdown.items()},
+            "latency_by_tool": {
+                name: {outcome: histogram.stats() for outcome, histogram in histograms.items()}
+                for name, histograms in self.latency_by_tool.items()
+            },
+            "injected_latency_ms": self.injected_latency.stats(),
+            "injected_latency_by_tool": {
+                name: histogram.stats() for name, histogram in self.injected_latency_by_tool.items()
+            },
+            "leaked_threads": self.leaked_threads,
+        }
+
+    @staticmethod
+    def _format_percentiles(stats: Dict[str, float]) -> str:
+        if not stats.get("count"):
+            return "n/a"
+        return " / ".join(f"{stats[key]:.1f}" for key in ("p50", "p90", "p99", "p99.9", "max")) + "ms"
+
+    def summary(self) -> str:
+        """Human-readable summary."""
+        metrics = self.get_metrics()
+        return f"""
+  Tool Monkey Execution Summary
+  ==============================
+  Total Calls: {metrics.get('total_calls', 0)}
+  Success Rate: {metrics.get('success_rate', 0):.1%}
+  Failures: {metrics.get('failures', 0)}
+  Total Retries: {metrics.get('total_retries', 0)}
+  Avg Latency: {metrics.get('avg_latency_ms', 0):.1f}ms
+  Latency p50/p90/p99/p99.9/max: {self._format_percentiles(metrics.get('latency_ms', {}))}
+  Abandoned Calls: {metrics.get('abandoned_calls', 0)} (leaked threads: {metrics.get('leaked_threads', 0)})
+          """.strip()
+
+    def to_dict(self) -> dict:
+        """JSON-compatible state, for shipping snapshots somewhere pickle can't go."""
+        return {
+            "total_calls": self.total_calls,
+            "successes": self.successes,
+            "total_retries": self.total_retries,
+            "latency_sum_ms": self.latency_sum_ms,
+            "abandoned": self.abandoned,
+            "leaked_threads": self.leaked_threads,
+            "breakdown": {name: dict(stats) for name, stats in self.breakdown.items()},
+            "latency": self.latency.to_dict(),
+            "latency_by_tool": {
+                name: {outcome: histogram.to_dict() for outcome, histogram in histograms.items()}
+                for name, histograms in self.latency_by_tool.items()
+            },
+            "injected_latency": self.injected_latency.to_dict(),
+            "injected_latency_by_tool": {
+                name: histogram.to_dict() for name, histogram in self.injected_latency_by_tool.items()
+            },
+            "call_counts": [[*key, count] for key, count in self.call_counts.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "ObserverSnapshot":
+        snapshot = cls()
+        for key in ("total_calls", "successes", "total_retries", "latency_sum_ms", "abandoned", "leaked_threads"):
+            setattr(snapshot, key, state[key])
+        for name, stats in state["breakdown"].items():
+            snapshot.breakdown[name].update(stats)
+        snapshot.latency = LatencyHistogram.from_dict(state["latency"])
+        for name, histograms in state["latency_by_tool"].items():
+            snapshot.latency_by_tool[name] = {
+                outcome: LatencyHistogram.from_dict(histogram) for outcome, histogram in histograms.items()}
+        snapshot.injected_latency = LatencyHistogram.from_dict(state["injected_latency"])
+        for name, histogram in state["injected_latency_by_tool"].items():
+            snapshot.injected_latency_by_tool[name] = LatencyHistogram.from_dict(histogram)
+        for *key, count in state["call_counts"]:
+            snapshot.call_counts[tuple(key)] = count
+        return snapshot
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__dict__.update(self.from_dict(state).__dict__)
@@ -0,0 +1,37 @@
+"""
+Process-wide switch for chaos injection.
+
+With chaos disabled, every with_monkey wrapper calls straight through to the
+tool: no schedule lookup, no observer, no logging. Tools can stay wrapped in
+production builds and cost one global check per call.
+
+The initial state comes from the TOOL_MONKEY_ENABLED environment variable
+("0", "false", "no" or "off" disable chaos; anything else, or unset, leaves
+it on).
+"""
+
+import os
+from contextlib import contextmanager
+
+_enabled = os.environ.get("TOOL_MONKEY_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def chaos_enabled() -> bool:
+    return _enabled
+
+
+def set_chaos_enabled(enabled: bool) -> bool:
+    """Turn chaos injection on or off for the whole process. Returns the previous setting."""
+    global _enabled
+    previous, _enabled = _enabled, bool(enabled)
+    return previous
+
+
+@contextmanager
+def chaos_disabled():
+    """Run the block with chaos injection turned off."""
+    previous = set_chaos_enabled(False)
+    try:
+        yield
+    finally:
+        set_chaos_enabled(previous)